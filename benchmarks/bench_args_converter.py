@@ -0,0 +1,59 @@
+"""time the conversion of the path arguments per request, the previous per
+request loop against the compiled per route converter, the metrics of the
+`harness` `args_converter.` prefix.
+
+usage: python benchmarks/bench_args_converter.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from harness import cli, metric  # noqa: E402
+from qor.router import Router, compile_args_converter  # noqa: E402
+
+
+def loop_convert(parts, *args):
+    """the conversion before compiling converters per route"""
+    rv = []
+    if len(args) == len(parts):
+        for index, arg in enumerate(args):
+            part = parts[index]
+            rv.append(part.get("to_python", lambda v: v)(arg))
+        return rv
+    return args
+
+
+def variable_parts(path):
+    router = Router()
+    router.add_route(path, None)
+    router.build_routes()
+    return [part for part in router.routes[0].parts if part.get("isreg")]
+
+
+def add_metrics(label, path, args):
+    @metric(f"args_converter.{label}_loop")
+    def loop():
+        parts = variable_parts(path)
+        return lambda: loop_convert(parts, *args)
+
+    @metric(f"args_converter.{label}_compiled")
+    def compiled():
+        converter = compile_args_converter(variable_parts(path))
+        if converter is None:
+            # the static routes have no converter
+            return lambda: None
+        return lambda: converter(args)
+
+
+for label, path, args in (
+    ("static", "/about", ()),
+    ("one_int", "/user/<id:int>", ("5",)),
+    ("int_string_float", "/a/<x:int>/<name>/<y:float>", ("1", "a", "2.5")),
+):
+    add_metrics(label, path, args)
+
+
+if __name__ == "__main__":
+    cli(["run", "-k", "args_converter."])
@@ -0,0 +1,92 @@
+"""measure the throughput of concurrent lookup requests to a backend that has
+one connection & 2ms round trips, served by an async handler per request and
+by `batch_route`, on the `asyncio` stand-in of the `kore` event loop.
+
+usage: python benchmarks/bench_batch_route.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from qor.testing import FakeKoreRequest, make_app  # noqa: E402
+
+ROUND_TRIP_MS = 2
+
+
+class Backend:
+    """key -> row lookups over one connection, one round trip at a time"""
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.round_trips = 0
+
+    async def fetch(self, keys):
+        async with self.lock:
+            self.round_trips += 1
+            await asyncio.sleep(ROUND_TRIP_MS / 1000)
+            return [{"key": key, "value": key * 2} for key in keys]
+
+
+def make_handler(batched, backend, max_batch, max_wait_ms):
+    app, domain = make_app(fake_kore=True)
+
+    if batched:
+
+        @app.batch_route(
+            "/rows/<key:int>",
+            max_batch=max_batch,
+            max_wait_ms=max_wait_ms,
+            input=lambda request, key: key,
+        )
+        async def rows(keys):
+            return await backend.fetch(keys)
+
+    else:
+
+        @app.get("/rows/<key:int>")
+        async def row(request, key):
+            return (await backend.fetch([key]))[0]
+
+    app.start()
+    return domain.routes[0]["callback"]
+
+
+def measure(batched, requests, concurrency, max_batch=32, max_wait_ms=1):
+    async def serve():
+        backend = Backend()
+        handler = make_handler(batched, backend, max_batch, max_wait_ms)
+        queue = list(range(requests))
+
+        async def client():
+            while queue:
+                key = queue.pop()
+                await handler(FakeKoreRequest(f"/rows/{key}"), str(key))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        return time.perf_counter() - start, backend.round_trips
+
+    elapsed, round_trips = asyncio.run(serve())
+    return {
+        "requests_per_s": requests / elapsed,
+        "round_trips": round_trips,
+    }
+
+
+def run(requests=2000, concurrency=64):
+    return {
+        "unbatched": measure(False, requests, concurrency),
+        "batched": measure(True, requests, concurrency),
+    }
+
+
+if __name__ == "__main__":
+    for label, result in run().items():
+        print(
+            f"{label:10} {result['requests_per_s']:8.1f} requests/s,"
+            f" {result['round_trips']} backend round trips"
+        )
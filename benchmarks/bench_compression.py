@@ -0,0 +1,83 @@
+"""report the CPU cost of the response compression against the bytes it saves,
+per body & compression level, and the cost of serving the cached compressed
+variants, using fake kore requests. The metrics of the `harness`
+`compression.` prefix.
+
+usage: python benchmarks/bench_compression.py
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from harness import cli, metric  # noqa: E402
+from qor.compression import Compressor  # noqa: E402
+from qor.testing import FakeKoreRequest, make_app  # noqa: E402
+
+BODIES = {
+    "json_64k": (
+        json.dumps(
+            [
+                {"id": i, "name": f"item {i}", "tags": ["a", "b"]}
+                for i in range(1200)
+            ]
+        ).encode()
+    ),
+    "html_16k": b"<li class='item'><a href='/items/1'>item</a></li>\n" * 320,
+    "random_16k": os.urandom(16 * 1024),
+}
+
+
+def add_level_metric(name, body, level):
+    @metric(f"compression.{name}_level{level}")
+    def compress():
+        compressor = Compressor(level=level)
+        size = len(compressor.compress(body, "gzip"))
+        extra = {"bytes": len(body), "saved_bytes": len(body) - size}
+        return lambda: compressor.compress(body, "gzip"), extra
+
+
+for name, body in BODIES.items():
+    for level in (1, 6, 9):
+        add_level_metric(name, body, level)
+
+
+def make_handler(config, cache=None):
+    app, domain = make_app(config)
+    body = BODIES["json_64k"]
+
+    @app.get("/items", cache=cache)
+    def items(request, **kwargs):
+        request.response_header("Content-Type", "application/json")
+        return body
+
+    app.start()
+    return domain.routes[0]["callback"]
+
+
+def add_pipeline_metric(label, config, cache=None):
+    @metric(f"compression.pipeline_{label}")
+    def pipeline():
+        handler = make_handler(config, cache)
+        headers = {"Accept-Encoding": "gzip"}
+
+        def request():
+            kore_request = FakeKoreRequest("/items", headers=headers)
+            handler(kore_request)
+            return kore_request
+
+        return request, {"sent_bytes": len(request().response_body)}
+
+
+add_pipeline_metric("plain", {})
+add_pipeline_metric("compressed", {"compression": True})
+add_pipeline_metric(
+    "compressed_etag_cached", {"compression": True, "etag": True}
+)
+add_pipeline_metric("compressed_response_cache", {"compression": True}, 60)
+
+
+if __name__ == "__main__":
+    cli(["run", "-k", "compression."])
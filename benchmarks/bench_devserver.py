@@ -0,0 +1,74 @@
+"""measure the requests/s of the `qor.devserver` over keep-alive connections,
+for a sync & an async handler. The clients run on the same event loop as the
+server, one request in flight per connection.
+
+usage: python benchmarks/bench_devserver.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from qor import Qor  # noqa: E402
+from qor.devserver import DevKore  # noqa: E402
+
+
+def make_app():
+    app = Qor(config={"default_server_port": "0"})
+
+    @app.get("/sync")
+    def sync(request, **kwargs):
+        return {"hello": "world"}
+
+    @app.get("/async")
+    async def async_(request, **kwargs):
+        return {"hello": "world"}
+
+    return app
+
+
+async def client(host, port, path, requests):
+    reader, writer = await asyncio.open_connection(host, port)
+    request = b"GET %s HTTP/1.1\r\nHost: localhost\r\n\r\n" % path.encode()
+    for _ in range(requests):
+        writer.write(request)
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int(head.split(b"content-length: ")[1].split(b"\r\n")[0])
+        await reader.readexactly(length)
+    writer.close()
+
+
+def measure(path, requests=20000, connections=8):
+    kore = DevKore()
+    kore.configure(make_app())
+
+    async def main():
+        host, port = (await kore.start_serving())[0]
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                client(host, port, path, requests // connections)
+                for _ in range(connections)
+            )
+        )
+        elapsed = time.perf_counter() - start
+        await kore.stop_serving()
+        return elapsed
+
+    elapsed = asyncio.run(main())
+    return {"requests_per_s": requests / elapsed, "ms": elapsed * 1000}
+
+
+def run():
+    return {path: measure(path) for path in ("/sync", "/async")}
+
+
+if __name__ == "__main__":
+    for path, result in run().items():
+        print(
+            f"{path:8} {result['requests_per_s']:8.1f} requests/s,"
+            f" {result['ms']:.1f} ms"
+        )
@@ -0,0 +1,96 @@
+"""time dispatching an error to the app error handlers, the previous linear
+scan of every handler against the compiled `ErrorHandlersIndex`, the metrics
+of the `harness` `error_handlers.` prefix.
+
+usage: python benchmarks/bench_error_handlers.py
+"""
+
+import os
+import sys
+from inspect import isclass
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from harness import cli, metric  # noqa: E402
+from qor.wrappers import ErrorHandlersIndex  # noqa: E402
+
+
+class ServiceError(Exception):
+    pass
+
+
+class UpstreamError(ServiceError):
+    pass
+
+
+def callback(request, *args, **kwargs):
+    return 503, "service unavailable"
+
+
+def make_handlers(count=20):
+    handlers = []
+    for i in range(count):
+        handlers.append({"func": callback, "kwargs": {"error": 400 + i}})
+        error = type(f"Error{i}", (Exception,), {})
+        handlers.append({"func": callback, "kwargs": {"error": error}})
+    handlers.append({"func": callback, "kwargs": {"error": 503}})
+    handlers.append({"func": callback, "kwargs": {"error": ServiceError}})
+    return handlers
+
+
+def linear_dispatch(handlers, status_or_exc):
+    """the dispatch before indexing the error handlers"""
+    is_int = isinstance(status_or_exc, int)
+    for error_handler in handlers:
+        error = error_handler.get("kwargs", {}).get("error")
+        cb = error_handler.get("func", None)
+        if is_int:
+            if isinstance(error, int) and error == status_or_exc:
+                rv = cb(None)
+                if rv is not None:
+                    return rv
+        elif isclass(error) and issubclass(status_or_exc.__class__, error):
+            rv = cb(None)
+            if rv is not None:
+                return rv
+
+
+def indexed_dispatch(index, status_or_exc):
+    if isinstance(status_or_exc, int):
+        callbacks = index.for_status(status_or_exc)
+    else:
+        callbacks = index.for_exception(status_or_exc)
+    for cb in callbacks:
+        rv = cb(None)
+        if rv is not None:
+            return rv
+
+
+@metric("error_handlers.status_linear")
+def status_linear():
+    handlers = make_handlers()
+    return lambda: linear_dispatch(handlers, 503)
+
+
+@metric("error_handlers.status_indexed")
+def status_indexed():
+    index = ErrorHandlersIndex(make_handlers())
+    return lambda: indexed_dispatch(index, 503)
+
+
+@metric("error_handlers.exception_linear")
+def exception_linear():
+    handlers = make_handlers()
+    error = UpstreamError()
+    return lambda: linear_dispatch(handlers, error)
+
+
+@metric("error_handlers.exception_indexed")
+def exception_indexed():
+    index = ErrorHandlersIndex(make_handlers())
+    error = UpstreamError()
+    return lambda: indexed_dispatch(index, error)
+
+
+if __name__ == "__main__":
+    cli(["run", "-k", "error_handlers."])
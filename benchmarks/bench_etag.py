@@ -0,0 +1,67 @@
+"""time the ETag hashing per body size, and the handler pipeline that renders
+the body & sends it, against the precondition hook that answers 304 without
+rendering, using fake kore requests. The metrics of the `harness` `etag.`
+prefix.
+
+usage: python benchmarks/bench_etag.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from harness import cli, metric  # noqa: E402
+from qor.conditional import make_etag  # noqa: E402
+from qor.testing import FakeKoreRequest, make_app  # noqa: E402
+
+
+def add_hash_metric(size):
+    @metric(f"etag.hash_{size}")
+    def hashing():
+        body = b"x" * size
+        return lambda: make_etag(body)
+
+
+for size in (1024, 64 * 1024, 1024 * 1024):
+    add_hash_metric(size)
+
+
+def make_handler(precondition):
+    app, domain = make_app({"etag": not precondition})
+
+    @app.get("/posts")
+    def posts(request, **kwargs):
+        if precondition and request.is_not_modified(etag="v1"):
+            return 304, b""
+        return [{"id": i, "title": f"post {i}"} for i in range(200)]
+
+    app.start()
+    return domain.routes[0]["callback"]
+
+
+def add_pipeline_metric(label, precondition):
+    @metric(f"etag.{label}")
+    def pipeline():
+        handler = make_handler(precondition)
+        first = FakeKoreRequest("/posts")
+        handler(first)
+        headers = {"If-None-Match": first.response_headers["ETag"]}
+
+        def request():
+            kore_request = FakeKoreRequest("/posts", headers=headers)
+            handler(kore_request)
+            return kore_request
+
+        return request, {
+            "full_body_bytes": len(first.response_body),
+            "sent_bytes": len(request().response_body),
+        }
+
+
+add_pipeline_metric("body_hash", False)
+add_pipeline_metric("precondition", True)
+
+
+if __name__ == "__main__":
+    cli(["run", "-k", "etag."])
@@ -0,0 +1,83 @@
+"""time encoding & decoding small, medium & 1MB JSON payloads by the stdlib
+`json` (the previous encoding) & the `qor.codecs` codecs, the metrics of the
+`harness` `json_codecs.` prefix.
+
+usage: python benchmarks/bench_json_codecs.py
+"""
+
+import datetime
+import functools
+import json
+import os
+import sys
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from harness import cli, metric  # noqa: E402
+from qor.codecs import JSONCodec, OrjsonCodec, orjson  # noqa: E402
+
+
+def item(i):
+    return {
+        "id": i,
+        "name": f"item {i}",
+        "price": 10.5 + i,
+        "tags": ["a", "b", "c"],
+        "active": i % 2 == 0,
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def payloads():
+    small = {"id": 1, "ok": True, "name": "qor"}
+    medium = [item(i) for i in range(100)]
+    large = []
+    while len(json.dumps(large)) < 2**20:
+        large.extend(item(i) for i in range(len(large), len(large) + 1000))
+    # the values that the stdlib json can't encode, the handlers had to
+    # convert them before
+    rich = [
+        dict(
+            item(i),
+            created=datetime.datetime(2023, 1, 1, 12, 0, i % 60),
+            total=Decimal("10.50"),
+        )
+        for i in range(100)
+    ]
+    return {"small": small, "medium": medium, "1mb": large, "rich": rich}
+
+
+def stdlib_dumps(value):
+    return json.dumps(value).encode()
+
+
+def encoded(label):
+    return JSONCodec().dumps_bytes(payloads()[label])
+
+
+def add_metrics(label, name, dumps, loads):
+    @metric(f"json_codecs.{label}_dumps_{name}")
+    def dumps_metric():
+        value = payloads()[label]
+        return lambda: dumps(value)
+
+    @metric(f"json_codecs.{label}_loads_{name}")
+    def loads_metric():
+        value = encoded(label)
+        return lambda: loads(value)
+
+
+CODECS = {"json_codec": JSONCodec()}
+if orjson is not None:
+    CODECS["orjson_codec"] = OrjsonCodec()
+
+for label in ("small", "medium", "1mb", "rich"):
+    if label != "rich":
+        add_metrics(label, "stdlib", stdlib_dumps, json.loads)
+    for name, codec in CODECS.items():
+        add_metrics(label, name, codec.dumps_bytes, codec.loads)
+
+
+if __name__ == "__main__":
+    cli(["run", "-k", "json_codecs."])
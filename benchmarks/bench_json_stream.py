@@ -0,0 +1,64 @@
+"""measure the peak memory & the time of encoding a large export, building
+the list then `json.dumps` & `str.encode` (the previous encoding) against
+`JSONStream.encode` into one buffer & the bounded `JSONStream` chunks.
+
+usage: python benchmarks/bench_json_stream.py
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from qor.codecs import JSONStream, get_json_codec  # noqa: E402
+
+
+def records(count):
+    for i in range(count):
+        yield {"id": i, "name": f"record {i}", "tags": ["a", "b"], "x": 1.5}
+
+
+def list_dumps(count):
+    return json.dumps(list(records(count))).encode()
+
+
+def stream_encode(count):
+    return JSONStream(records(count)).encode(get_json_codec("json"))
+
+
+def stream_chunks(count):
+    size = 0
+    for chunk in JSONStream(records(count)).chunks(get_json_codec("json")):
+        # the chunks are sent & dropped, like the WSGI servers do
+        size += len(chunk)
+    return size
+
+
+def measure(func, count):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rv = func(count)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = rv if isinstance(rv, int) else len(rv)
+    return {"seconds": elapsed, "peak_bytes": peak, "payload_bytes": size}
+
+
+def run(count=100000):
+    return {
+        func.__name__: measure(func, count)
+        for func in (list_dumps, stream_encode, stream_chunks)
+    }
+
+
+if __name__ == "__main__":
+    for label, result in run().items():
+        print(
+            f"{label:14} payload {result['payload_bytes'] / 2**20:.1f} MiB,"
+            f" peak {result['peak_bytes'] / 2**20:.1f} MiB,"
+            f" {result['seconds'] * 1000:.0f} ms"
+        )
@@ -0,0 +1,113 @@
+"""time concurrent requests to a handler that blocks for 20ms, called inline
+& offloaded to the `io` thread pool, and to a CPU bound handler offloaded to
+the `cpu` process pool. The requests run on the `asyncio` stand-in of the
+`kore` event loop.
+
+usage: python benchmarks/bench_offload.py
+"""
+
+import asyncio
+import inspect
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from qor import Qor  # noqa: E402
+from qor.testing import (  # noqa: E402
+    FakeKoreRequest,
+    attach_fake_kore,
+    make_app,
+)
+
+app = Qor(config={"offload_io_workers": 16, "offload_cpu_workers": 2})
+attach_fake_kore(app)
+
+
+def block(request=None, **kwargs):
+    time.sleep(0.02)
+    return "done"
+
+
+def count(limit):
+    total = 0
+    for i in range(limit):
+        total += i * i
+    return total
+
+
+offloaded_count = app.offload(pool="cpu")(count)
+
+
+def make_handler(offload):
+    local_app, domain = make_app({"offload_io_workers": 16}, fake_kore=True)
+    handler = local_app.offload(pool="io")(block) if offload else block
+    local_app.get("/")(handler)
+    local_app.start()
+    return local_app, domain.routes[0]["callback"]
+
+
+async def serve(handler, requests):
+    async def one():
+        rv = handler(FakeKoreRequest("/"))
+        if inspect.iscoroutine(rv):
+            await rv
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+
+
+def measure_blocking(offload, requests):
+    local_app, handler = make_handler(offload)
+    start = time.perf_counter()
+    asyncio.run(serve(handler, requests))
+    elapsed = time.perf_counter() - start
+    stats = local_app.offload_pools.stats()
+    local_app.offload_pools.shutdown()
+    return {
+        "ms": elapsed * 1000,
+        "requests_per_s": requests / elapsed,
+        "pools": stats,
+    }
+
+
+def measure_cpu(calls, limit):
+    start = time.perf_counter()
+    for _ in range(calls):
+        count(limit)
+    inline = time.perf_counter() - start
+
+    async def offloaded():
+        await asyncio.gather(*(offloaded_count(limit) for _ in range(calls)))
+
+    app.offload_pools.start()
+    start = time.perf_counter()
+    asyncio.run(offloaded())
+    elapsed = time.perf_counter() - start
+    stats = app.offload_pools.stats()
+    app.offload_pools.shutdown()
+    return {"inline_ms": inline * 1000, "offloaded_ms": elapsed * 1000, **stats}
+
+
+def run(requests=32):
+    return {
+        "blocking_inline": measure_blocking(False, requests),
+        "blocking_offloaded": measure_blocking(True, requests),
+        "cpu": measure_cpu(8, 500000),
+    }
+
+
+if __name__ == "__main__":
+    result = run()
+    for label in ("blocking_inline", "blocking_offloaded"):
+        stats = result[label]
+        print(
+            f"{label:20} {stats['ms']:8.1f} ms,"
+            f" {stats['requests_per_s']:8.1f} requests/s"
+        )
+    cpu = result["cpu"]
+    print(
+        f"cpu inline {cpu['inline_ms']:.1f} ms, offloaded to 2 processes"
+        f" {cpu['offloaded_ms']:.1f} ms, max queue depth"
+        f" {cpu['cpu']['max_pending']}"
+    )
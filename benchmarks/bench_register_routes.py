@@ -0,0 +1,68 @@
+"""compare the number of `kore` routes & the startup time of registering a
+1k routes app, per-method registration vs merged registration.
+
+usage: python benchmarks/bench_register_routes.py [ROUTES]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from qor import Qor  # noqa: E402
+from qor.testing import attach_fake_domain  # noqa: E402
+
+
+def handler(request, *args, **kwargs):
+    return ""
+
+
+def make_app(count):
+    app = Qor()
+    for i in range(count // 4):
+        app.add_route(f"/items{i}", handler, f"items{i}", methods=["get"])
+        app.add_route(f"/items{i}", handler, f"create{i}", methods=["post"])
+        app.add_route(
+            f"/items{i}/<id:int>",
+            handler,
+            f"item{i}",
+            methods=["get", "put"],
+        )
+    return app
+
+
+def per_method_registration(app):
+    """the registration before merging, one kore route for each method"""
+    domain = attach_fake_domain(app)
+    app.router.build_routes()
+    for route in app.router.routes:
+        wrapper = app.handler_wrapper(route.handler, app, route=route)
+        domain.route(route.path, wrapper, methods=[route.method])
+    return domain
+
+
+def merged_registration(app):
+    domain = attach_fake_domain(app)
+    app._register_routes()
+    return domain
+
+
+def run(count=1000):
+    rv = {}
+    for label, register in (
+        ("per_method", per_method_registration),
+        ("merged", merged_registration),
+    ):
+        app = make_app(count)
+        start = time.perf_counter()
+        domain = register(app)
+        elapsed = time.perf_counter() - start
+        rv[label] = (len(domain.routes), elapsed)
+    return rv
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    for label, (routes, elapsed) in run(count).items():
+        print(f"{label:12} kore routes: {routes:6}  startup: {elapsed:.4f}s")
@@ -0,0 +1,73 @@
+"""time the plain handler pipeline with & without the request pool, and count
+the memory blocks allocated & the gc collections per request, using fake kore
+requests. The metrics of the `harness` `request_pool.` prefix.
+
+usage: python benchmarks/bench_request_pool.py
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from harness import cli, metric  # noqa: E402
+from qor.testing import FakeKoreRequest, make_app  # noqa: E402
+
+
+def make_handler(request_pool_size):
+    app, domain = make_app({"request_pool_size": request_pool_size})
+
+    @app.route("/")
+    def index(request, **kwargs):
+        request.g["user"] = None
+        return "hello"
+
+    app.start()
+    return domain.routes[0]["callback"]
+
+
+def collections():
+    return sum(stat["collections"] for stat in gc.get_stats())
+
+
+def allocations(handler, calls=10000):
+    """the gc collections of the calls & the memory blocks retained per
+    request"""
+    requests = [FakeKoreRequest("/") for _ in range(calls)]
+    collected = collections()
+    for request in requests:
+        handler(request)
+    collected = collections() - collected
+
+    requests = [FakeKoreRequest("/") for _ in range(1000)]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for request in requests:
+        handler(request)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(
+        stat.count_diff for stat in after.compare_to(before, "filename")
+    )
+    return {
+        f"gc_collections_per_{calls}": collected,
+        "retained_blocks_per_request": blocks / len(requests),
+    }
+
+
+def add_metric(label, request_pool_size):
+    @metric(f"request_pool.{label}")
+    def pool():
+        handler = make_handler(request_pool_size)
+        # the kore requests are created in the timed call, like `kore` does
+        return lambda: handler(FakeKoreRequest("/")), allocations(handler)
+
+
+add_metric("no_pool", 0)
+add_metric("pool", 64)
+
+
+if __name__ == "__main__":
+    cli(["run", "-k", "request_pool."])
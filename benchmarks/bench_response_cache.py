@@ -0,0 +1,46 @@
+"""time a handler that renders a JSON list without a cache, with the response
+cache & with the early response cache (before the `before_handler`
+callbacks), using fake kore requests. The metrics of the `harness`
+`response_cache.` prefix.
+
+usage: python benchmarks/bench_response_cache.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from harness import cli, metric  # noqa: E402
+from qor.testing import FakeKoreRequest, make_app  # noqa: E402
+
+
+def make_handler(cache):
+    app, domain = make_app()
+
+    @app.before_handler
+    def load_user(request, *args, **kwargs):
+        request.g["user"] = request.request_header("Authorization")
+
+    @app.get("/items", cache=cache)
+    def items(request, **kwargs):
+        return [{"id": i, "name": f"item {i}"} for i in range(100)]
+
+    app.start()
+    return domain.routes[0]["callback"]
+
+
+def add_metric(label, cache):
+    @metric(f"response_cache.{label}")
+    def cached():
+        handler = make_handler(cache)
+        return lambda: handler(FakeKoreRequest("/items"))
+
+
+add_metric("no_cache", None)
+add_metric("cache", 60)
+add_metric("early_cache", {"ttl": 60, "early": True})
+
+
+if __name__ == "__main__":
+    cli(["run", "-k", "response_cache."])
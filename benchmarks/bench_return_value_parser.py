@@ -0,0 +1,82 @@
+"""time parsing the handlers return values, the previous isinstance chain
+against the type dispatch of `ReturnValueParser`, the metrics of the `harness`
+`return_value_parser.` prefix.
+
+usage: python benchmarks/bench_return_value_parser.py
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from harness import cli, metric  # noqa: E402
+from qor.utils import ReturnValueParser  # noqa: E402
+
+
+def chain_to_bytes(value):
+    """the encoding before the type dispatch"""
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return str.encode(value)
+    elif isinstance(value, (int, float)):
+        return str.encode(str(value))
+    if isinstance(value, (dict, list, tuple)):
+        return str.encode(json.dumps(value))
+    return value
+
+
+class ChainParser:
+    """the parser before the type dispatch"""
+
+    def __call__(self, return_value, *args, **kwargs):
+        status = None
+        value_bytes = return_value
+        original = None
+        exception = None
+
+        if isinstance(return_value, tuple) and len(return_value) == 2:
+            try:
+                status = int(return_value[0])
+                value_bytes = chain_to_bytes(return_value[1])
+                original = type(return_value[1])
+            except Exception as e:
+                exception = e
+        else:
+            try:
+                status = 200
+                value_bytes = chain_to_bytes(return_value)
+                original = type(return_value)
+            except Exception as e:
+                exception = e
+        if exception is None:
+            return status, value_bytes, original
+        raise Exception("can't parse value. ") from (exception)
+
+
+def add_metrics(label, value):
+    @metric(f"return_value_parser.{label}_chain")
+    def chain():
+        parser = ChainParser()
+        return lambda: parser(value)
+
+    @metric(f"return_value_parser.{label}_dispatch")
+    def dispatch():
+        parser = ReturnValueParser(None)
+        return lambda: parser(value)
+
+
+for label, value in (
+    ("bytes", b"hello"),
+    ("str", "hello"),
+    ("status_str", (404, "not found")),
+    ("dict", {"id": 1, "name": "qor"}),
+    ("bytearray", bytearray(b"hello")),
+):
+    add_metrics(label, value)
+
+
+if __name__ == "__main__":
+    cli(["run", "-k", "return_value_parser."])
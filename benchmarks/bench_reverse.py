@@ -0,0 +1,33 @@
+"""time `Router.reverse` of a variable route with the reverse LRU cache, and
+the old per call `build_path`, the metrics of the `harness` `reverse.` prefix.
+The uncached `reverse` is timed by the `router.reverse_` ones.
+
+usage: python benchmarks/bench_reverse.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from harness import cli, make_router, metric  # noqa: E402
+from qor.router import build_path  # noqa: E402
+
+
+@metric("reverse.build_path_variable")
+def build_path_variable():
+    router = make_router()
+    router.build_routes()
+    post = router.find_route_by_name("post199")
+    return lambda: build_path(post, id=5, slug="hello")
+
+
+@metric("reverse.variable_cached")
+def variable_cached():
+    router = make_router(reverse_cache_size=1024)
+    router.build_routes()
+    return lambda: router.reverse("post199", id=5, slug="hello")
+
+
+if __name__ == "__main__":
+    cli(["run", "-k", "reverse.", "-k", "router.reverse_"])
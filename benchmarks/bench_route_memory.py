@@ -0,0 +1,108 @@
+"""measure the memory of 10k built routes per worker, the slots based `Route`
+& interned `RoutePart` against the previous dict based routes (emulated by
+copying the built routes into dicts).
+
+Each representation is measured in a fresh process, to get its own RSS.
+
+usage: python benchmarks/bench_route_memory.py
+"""
+
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from qor.router import Router  # noqa: E402
+
+
+def handler(request, *args, **kwargs):
+    return ""
+
+
+def build_router(count):
+    """mounted router tree with static & variable routes"""
+    main = Router()
+    for i in range(count // 100):
+        child = Router(name=f"section{i}")
+        for j in range(50):
+            child.add_route(f"/page{j}", handler, f"page{j}")
+            child.add_route(f"/items{j}/<id:int>/<slug>", handler, f"item{j}")
+        main.mount_router(f"/section{i}", child)
+    main.build_routes()
+    return main
+
+
+def use_dicts(router):
+    """switch the router to the previous representation, a dict per route &
+    per part, the indexes point to the dicts too."""
+    dicts = {}
+    for route in router._routes:
+        data = route.to_dict()
+        data["parts"] = [part.to_dict() for part in route.parts]
+        dicts[id(route)] = data
+    router._routes = [dicts[id(route)] for route in router._routes]
+    for index in (router._route_index, router._name_index):
+        for key, route in index.items():
+            index[key] = dicts[id(route)]
+
+
+def rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        # kilobytes on linux, the peak not the current size
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def measure(mode, count, traced=False):
+    """the memory of the built router, it is kept alive like in a worker.
+    tracemalloc inflates the RSS, So it is only used if `traced`."""
+    gc.collect()
+    rss_before = rss()
+    if traced:
+        tracemalloc.start()
+    router = build_router(count)
+    if mode == "dict":
+        use_dicts(router)
+    gc.collect()
+    if traced:
+        return {"traced_bytes": tracemalloc.get_traced_memory()[0]}
+    return {"routes": len(router.routes), "rss_bytes": rss() - rss_before}
+
+
+def run(count=10000):
+    rv = {}
+    for mode in ("dict", "slots"):
+        rv[mode] = {}
+        for metric in ("rss", "traced"):
+            output = subprocess.check_output(
+                [
+                    sys.executable,
+                    __file__,
+                    "--measure",
+                    mode,
+                    str(count),
+                    metric,
+                ]
+            )
+            rv[mode].update(json.loads(output))
+    return rv
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--measure":
+        mode, count, metric = sys.argv[2], int(sys.argv[3]), sys.argv[4]
+        print(json.dumps(measure(mode, count, traced=metric == "traced")))
+    else:
+        for mode, result in run().items():
+            print(
+                f"{mode:6} {result['routes']} routes"
+                f" traced {result['traced_bytes'] / 2**20:.2f} MiB"
+                f" rss {result['rss_bytes'] / 2**20:.2f} MiB"
+            )
@@ -0,0 +1,74 @@
+"""simulate `kore` linear route scan for skewed traffic, with the routes in
+their registration order & in the hit-frequency order.
+
+usage: python benchmarks/bench_route_ordering.py [ROUTES] [REQUESTS]
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from qor.app import route_profile_key  # noqa: E402
+from qor.router import Router, merge_routes, order_routes_by_hits  # noqa: E402
+
+
+def handler(request, *args, **kwargs):
+    return ""
+
+
+def make_routes(count):
+    router = Router()
+    for i in range(count):
+        router.add_route(f"/admin{i}/<id:int>", handler, f"admin{i}")
+    for i in range(10):
+        router.add_route(f"/api{i}/<id:int>", handler, f"api{i}")
+    router.build_routes()
+    return merge_routes(router.routes)
+
+
+def make_traffic(count, requests):
+    """90% of the requests hit the 10 api routes registered last"""
+    rv = []
+    for _ in range(requests):
+        if random.random() < 0.9:
+            rv.append(f"/api{random.randrange(10)}/5")
+        else:
+            rv.append(f"/admin{random.randrange(count)}/5")
+    return rv
+
+
+def scan(routes, traffic):
+    compiled = [re.compile(route.path) for route in routes]
+    start = time.perf_counter()
+    for path in traffic:
+        for regex in compiled:
+            if regex.match(path):
+                break
+    return (time.perf_counter() - start) / len(traffic)
+
+
+def run(count=400, requests=20000):
+    random.seed(0)
+    routes = make_routes(count)
+    traffic = make_traffic(count, requests)
+    hits = {}
+    for route in routes:
+        regex = re.compile(route.path)
+        key = route_profile_key(route)
+        hits[key] = sum(1 for path in traffic[:2000] if regex.match(path))
+    ordered = order_routes_by_hits(routes, hits, route_profile_key)
+    return {
+        "registration_order": scan(routes, traffic),
+        "hits_order": scan(ordered, traffic),
+    }
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    for label, per_request in run(count, requests).items():
+        print(f"{label:20} {per_request * 1e6:.2f} us/request")
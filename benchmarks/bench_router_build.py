@@ -0,0 +1,54 @@
+"""time adding & building a large generated route table, with nested
+routers, then the name lookup used by `reverse`.
+
+usage: python benchmarks/bench_router_build.py [ROUTES]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from qor.router import Router  # noqa: E402
+
+
+def handler(request, *args, **kwargs):
+    return ""
+
+
+def make_router(count, per_child=1000):
+    main = Router()
+    for c in range(max(count // per_child, 1)):
+        child = Router(name=f"child{c}")
+        for i in range(min(count, per_child) // 2):
+            child.add_route(f"/items{i}", handler, f"items{i}")
+            child.add_route(f"/items{i}/<id:int>", handler, f"item{i}")
+        main.mount_router(f"/child{c}", child)
+    return main
+
+
+def run(count=20000):
+    start = time.perf_counter()
+    router = make_router(count)
+    added = time.perf_counter()
+    router.build_routes()
+    built = time.perf_counter()
+    for route in router.routes:
+        router.find_route_by_name(route.name)
+    looked_up = time.perf_counter()
+    return {
+        "routes": len(router.routes),
+        "add_routes": added - start,
+        "build_routes": built - added,
+        "find_route_by_name_all": looked_up - built,
+    }
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for label, value in run(count).items():
+        if isinstance(value, float):
+            print(f"{label:24} {value * 1e3:.1f} ms")
+        else:
+            print(f"{label:24} {value}")
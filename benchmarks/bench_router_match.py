@@ -0,0 +1,57 @@
+"""time `Router.match` as the route table grows, the lookup cost should
+stay the same for 100 or 10k routes. Each call matches a static, a variable &
+a missing path, the metrics of the `harness` `router_match.` prefix.
+
+usage: python benchmarks/bench_router_match.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from harness import cli, metric  # noqa: E402
+from qor.router import Router  # noqa: E402
+
+
+def handler(request, *args, **kwargs):
+    return ""
+
+
+def make_router(count):
+    router = Router()
+    for i in range(count // 2):
+        router.add_route(f"/section{i}/items", handler, f"items{i}")
+        router.add_route(
+            f"/section{i}/items/<id:int>/<slug>", handler, f"item{i}"
+        )
+    router.build_routes()
+    # build the matcher outside the timing
+    router.match(None, "/")
+    return router
+
+
+def add_metric(count):
+    @metric(f"router_match.routes_{count}")
+    def match():
+        router = make_router(count)
+        last = count // 2 - 1
+        paths = (
+            f"/section{last}/items",
+            f"/section{last}/items/15/some-slug",
+            "/missing/path",
+        )
+
+        def call():
+            for path in paths:
+                router.match(None, path, "get")
+
+        return call
+
+
+for count in (100, 1000, 10000):
+    add_metric(count)
+
+
+if __name__ == "__main__":
+    cli(["run", "-k", "router_match."])
@@ -0,0 +1,69 @@
+"""time reading a 1 MB request body through `wsgi.input`: the 1 KB
+`body_read` loop the apps had to write, `read()`, `readlines()` &
+`readinto()` of the buffered `KoreWSGIInput`, and `read()` of an offloaded
+body (`body_path`) that is mapped by `mmap`. The metrics of the `harness`
+`wsgi_input.` prefix.
+
+usage: python benchmarks/bench_wsgi_input.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from harness import cli, metric  # noqa: E402
+from qor.testing import FakeKoreRequest  # noqa: E402
+from qor.wsgi import KoreWSGIInput  # noqa: E402
+
+BODY = b"".join(b"field-%d=%s\r\n" % (i, b"v" * 90) for i in range(10000))
+
+
+def body_read_loop(stream):
+    chunks = []
+    while True:
+        length, chunk = stream.request.body_read(1024)
+        if not length:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+def readinto(stream):
+    buffer = bytearray(len(BODY))
+    stream.readinto(buffer)
+    return buffer
+
+
+def add_metric(label, read, offloaded=False):
+    @metric(f"wsgi_input.{label}")
+    def reading():
+        body_file = None
+        if offloaded:
+            body_file = tempfile.NamedTemporaryFile()
+            body_file.write(BODY)
+            body_file.flush()
+
+        def call():
+            kore_request = FakeKoreRequest(
+                "/",
+                body=b"" if offloaded else BODY,
+                body_path=body_file.name if offloaded else None,
+            )
+            stream = KoreWSGIInput(kore_request)
+            read(stream)
+            stream.close()
+
+        return call
+
+
+add_metric("body_read_loop", body_read_loop)
+add_metric("read", lambda stream: stream.read())
+add_metric("readlines", lambda stream: stream.readlines())
+add_metric("readinto", readinto)
+add_metric("mmap_read", lambda stream: stream.read(), offloaded=True)
+add_metric("mmap_readlines", lambda stream: stream.readlines(), offloaded=True)
+
+
+if __name__ == "__main__":
+    cli(["run", "-k", "wsgi_input."])
@@ -0,0 +1,148 @@
+"""measure the peak memory & the time of sending a 50 MB WSGI response to
+`kore`, for the old `BytesIO` buffer & the current handler: 64 KB chunks, one
+chunk, the chunks spooled to a temp file & a `wsgi.file_wrapper` file.
+
+Each case runs in its own process. The fake `kore` copies the body through a
+64 KB buffer, like `kore` copies it to its send buffers, So the peaks are of
+the bridge only. The RSS counts the touched pages of the mapped files, the
+traced peak is of the python heap only.
+
+usage: python benchmarks/bench_wsgi_response.py
+"""
+
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from qor.testing import FakeKoreRequest  # noqa: E402
+from qor.wsgi import KoreServerHandler  # noqa: E402
+
+SIZE = 50 * 1024 * 1024
+CHUNK = 64 * 1024
+CASES = (
+    "bytesio",
+    "chunks",
+    "bytesio_single",
+    "single",
+    "spooled",
+    "file_wrapper",
+)
+
+
+class KoreCopyRequest(FakeKoreRequest):
+    def response(self, status, body):
+        self.status = status
+        buffer = bytearray(CHUNK)
+        with memoryview(body) as view:
+            for start in range(0, len(view), CHUNK):
+                part = view[start : start + CHUNK]
+                buffer[: len(part)] = part
+            self.response_length = len(view)
+
+
+class BytesIOHandler(KoreServerHandler):
+    """the old handler, writes the body to `stdout` & sends its value"""
+
+    def _write(self, data):
+        self.stdout.write(data)
+
+    def send_to_kore(self):
+        self.stdout.seek(0)
+        rv = self.stdout.getvalue()
+        self.kore_request.response(self.status_integer, rv)
+        self.stdout.truncate(0)
+
+
+def chunks_app(environ, start_response):
+    start_response("200 OK", [("Content-Type", "text/csv")])
+    return (bytes([48 + i % 10]) * CHUNK for i in range(SIZE // CHUNK))
+
+
+def single_app(environ, start_response):
+    start_response("200 OK", [("Content-Type", "text/csv")])
+    return [b"0" * SIZE]
+
+
+def file_app(path):
+    def wsgi_app(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/csv")])
+        return environ["wsgi.file_wrapper"](open(path, "rb"))
+
+    return wsgi_app
+
+
+def max_rss_mb():
+    # KB on linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_case(case):
+    app = chunks_app
+    handler_class = KoreServerHandler
+    spool_max_memory = SIZE * 2
+    if case.startswith("bytesio"):
+        handler_class = BytesIOHandler
+    if case.endswith("single"):
+        app = single_app
+    elif case == "spooled":
+        spool_max_memory = KoreServerHandler.spool_max_memory
+    elif case == "file_wrapper":
+        f = tempfile.NamedTemporaryFile()
+        for chunk in chunks_app({}, lambda *args: None):
+            f.write(chunk)
+        f.flush()
+        app = file_app(f.name)
+    kore_request = KoreCopyRequest("/")
+    handler = handler_class(
+        io.BytesIO(),
+        io.BytesIO(),
+        io.StringIO(),
+        environ={"REQUEST_METHOD": "GET", "PATH_INFO": "/"},
+        multithread=False,
+    )
+    handler.spool_max_memory = spool_max_memory
+    handler.set_kore_request(kore_request)
+    handler.request_handler = types.SimpleNamespace(
+        log_request=lambda *args: None
+    )
+    before = max_rss_mb()
+    tracemalloc.start()
+    start = time.perf_counter()
+    handler.run(app)
+    elapsed = time.perf_counter() - start
+    _, traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert kore_request.response_length == SIZE
+    return {
+        "peak_rss_mb": max_rss_mb() - before,
+        "traced_mb": traced / 1024 / 1024,
+        "ms": elapsed * 1000,
+    }
+
+
+def run():
+    results = {}
+    for case in CASES:
+        output = subprocess.check_output([sys.executable, __file__, case])
+        results[case] = json.loads(output)
+    return results
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        print(json.dumps(run_case(sys.argv[1])))
+    else:
+        for case, result in run().items():
+            print(
+                f"{case:14} peak RSS +{result['peak_rss_mb']:6.1f} MB,"
+                f" traced {result['traced_mb']:6.1f} MB, {result['ms']:8.1f} ms"
+            )
@@ -0,0 +1,349 @@
+"""the suite of the per request costs of `qor`, run in process by the fake
+`kore` requests of `qor.testing`. Each metric is the best time of one call in
+microseconds, lower is better.
+
+The metrics of the `bench_*.py` scripts of this directory are registered by
+`metric` too, So `run -k args_converter.` runs the ones of
+`bench_args_converter.py`.
+
+`run` writes the results as JSON, `compare` checks them against a stored
+baseline & exits with 1 if any metric regressed beyond the threshold.
+
+usage:
+    python benchmarks/harness.py run -o results.json [-k PREFIX ...]
+    python benchmarks/harness.py compare baseline.json results.json [-t 0.1]
+
+Example, gate a qor upgrade:
+>> python benchmarks/harness.py run -o baseline.json   # the current qor
+>> python benchmarks/harness.py run -o upgraded.json   # the upgraded qor
+>> python benchmarks/harness.py compare baseline.json upgraded.json
+"""
+
+import glob
+import importlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import timeit
+from typing import Callable, Dict, Tuple, Union
+
+import click
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from qor import Qor  # noqa: E402
+from qor.router import Router  # noqa: E402
+from qor.schema import Email, Int, Schema, String  # noqa: E402
+from qor.testing import FakeKoreRequest, make_app  # noqa: E402
+from qor.utils import ReturnValueParser  # noqa: E402
+from qor.wsgi import KoreWSGIRequestHandler, KoreWSGIServer  # noqa: E402
+
+# the scripts `import harness`, they get this module when it is run as
+# `__main__` instead of a second copy with its own `METRICS`
+sys.modules.setdefault("harness", sys.modules[__name__])
+
+# name -> setup function that returns the timed call, or the timed call & a
+# dict of the extra values of the results
+METRICS: Dict[str, Callable[[], object]] = {}
+
+
+def metric(name: str):
+    def decorator(setup):
+        METRICS[name] = setup
+        return setup
+
+    return decorator
+
+
+def load_scripts():
+    """import the `bench_*.py` scripts, to register their metrics"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    if here not in sys.path:
+        sys.path.insert(0, here)
+    for path in sorted(glob.glob(os.path.join(here, "bench_*.py"))):
+        importlib.import_module(os.path.basename(path)[:-3])
+
+
+def handler(request, *args, **kwargs):
+    return "hello"
+
+
+def make_router(reverse_cache_size: int = 0):
+    router = Router(reverse_cache_size=reverse_cache_size)
+    for i in range(200):
+        router.add_route(f"/page{i}", handler, f"page{i}")
+        router.add_route(f"/posts{i}/<id:int>/<slug>", handler, f"post{i}")
+    return router
+
+
+def make_nested_router(count: int, per_child: int = 1000):
+    """large route table of child routers, half of the routes have variable"""
+    router = Router()
+    for c in range(max(count // per_child, 1)):
+        child = Router(name=f"child{c}")
+        for i in range(min(count, per_child) // 2):
+            child.add_route(f"/items{i}", handler, f"items{i}")
+            child.add_route(f"/items{i}/<id:int>", handler, f"item{i}")
+        router.mount_router(f"/child{c}", child)
+    return router
+
+
+def make_handler(callbacks=False):
+    app, domain = make_app()
+    if callbacks:
+
+        @app.before_handler
+        def before(request, *args, **kwargs):
+            request.g["before"] = True
+
+        @app.after_handler()
+        def after(request, *args, **kwargs):
+            pass
+
+    app.route("/")(handler)
+    app.start()
+    return domain.routes[0]["callback"]
+
+
+@metric("router.build_400")
+def router_build():
+    def build():
+        make_router().build_routes()
+
+    return build
+
+
+@metric("router.build_20000")
+def router_build_large():
+    """`build_routes` only, the routes are added once"""
+    router = make_nested_router(20000)
+    return router.build_routes
+
+
+@metric("router.reverse_static")
+def router_reverse_static():
+    router = make_router()
+    router.build_routes()
+    return lambda: router.reverse("page199")
+
+
+@metric("router.reverse_variable")
+def router_reverse_variable():
+    router = make_router()
+    router.build_routes()
+    return lambda: router.reverse("post199", id=5, slug="hello")
+
+
+@metric("handler.raw_kore")
+def handler_raw_kore():
+    """the cost of a `kore` handler without `qor`, the floor of the others"""
+
+    def raw(request):
+        request.response_header("Content-Type", "text/html")
+        request.response(200, b"hello")
+
+    return lambda: raw(FakeKoreRequest("/"))
+
+
+@metric("handler.plain")
+def handler_plain():
+    callback = make_handler()
+    return lambda: callback(FakeKoreRequest("/"))
+
+
+@metric("handler.callbacks")
+def handler_callbacks():
+    callback = make_handler(callbacks=True)
+    return lambda: callback(FakeKoreRequest("/"))
+
+
+@metric("return_value.str")
+def return_value_str():
+    parser = ReturnValueParser(None)
+    return lambda: parser("hello")
+
+
+@metric("return_value.dict")
+def return_value_dict():
+    parser = ReturnValueParser(None)
+    value = {"id": 1, "name": "qor", "tags": ["a", "b"]}
+    return lambda: parser(value)
+
+
+@metric("return_value.status_tuple")
+def return_value_status_tuple():
+    parser = ReturnValueParser(None)
+    return lambda: parser((404, "not found"))
+
+
+@metric("schema.validate")
+def schema_validate():
+    class User(Schema):
+        name = String(required=True, min=1, max=64)
+        age = Int()
+        email = Email()
+
+    schema = User()
+    return lambda: schema.validate(
+        name="qor", age="30", email="qor@example.com"
+    )
+
+
+@metric("template.render")
+def template_render():
+    root = tempfile.mkdtemp()
+    os.mkdir(os.path.join(root, "templates"))
+    with open(os.path.join(root, "templates", "list.html"), "w") as f:
+        f.write(
+            "<ul>{% for item in items %}<li>{{ item.name }}"
+            " {{ item.id }}</li>{% endfor %}</ul>"
+        )
+    app = Qor(config={"root_path": root})
+    items = [{"id": i, "name": f"item <{i}>"} for i in range(20)]
+    return lambda: app._render_template("list.html", items=items)
+
+
+class QuietWSGIRequestHandler(KoreWSGIRequestHandler):
+    """without the access log on stderr"""
+
+    def log_request(self, code="-", size="-"):
+        pass
+
+
+@metric("wsgi.bridge")
+def wsgi_bridge():
+    def wsgi_app(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return [b"hello"]
+
+    server = KoreWSGIServer(("", 0), QuietWSGIRequestHandler)
+    server.set_app(wsgi_app)
+
+    def call():
+        server.set_kore_request(FakeKoreRequest("/"))
+        server.handle_request()
+
+    return call
+
+
+def measure(call: Callable, repeat: int = 5) -> Dict:
+    """the best time of one call of the `repeat` runs, in microseconds. The
+    calls per run are calibrated to take at least 0.2 seconds."""
+    timer = timeit.Timer(call)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return {"us": best * 1e6, "number": number}
+
+
+def run_suite(
+    prefix: Union[str, Tuple[str, ...]] = "", repeat: int = 5
+) -> Dict:
+    """run the metrics that start with the prefix, or one of the prefixes"""
+    metrics = {}
+    for name, setup in METRICS.items():
+        if not name.startswith(prefix):
+            continue
+        call, extra = setup(), {}
+        if isinstance(call, tuple):
+            call, extra = call
+        metrics[name] = dict(measure(call, repeat), **extra)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": repeat,
+        },
+        "metrics": metrics,
+    }
+
+
+def compare_results(baseline: Dict, results: Dict, threshold: float) -> Dict:
+    """the ratio of each metric to the baseline, the ones that are slower by
+    more than `threshold` (0.1 is 10%) are regressions & the ones that are
+    faster by more than it are improvements."""
+    rv = {"ratios": {}, "regressions": [], "improvements": [], "missing": []}
+    for name, base in baseline["metrics"].items():
+        result = results["metrics"].get(name)
+        if result is None:
+            rv["missing"].append(name)
+            continue
+        ratio = result["us"] / base["us"]
+        rv["ratios"][name] = ratio
+        if ratio > 1 + threshold:
+            rv["regressions"].append(name)
+        elif ratio < 1 - threshold:
+            rv["improvements"].append(name)
+    return rv
+
+
+@click.group()
+def cli():
+    """the qor benchmarks suite"""
+
+
+@cli.command(help="run the suite & write the results as JSON.")
+@click.option("-o", "--output", default=None, help="the results file.")
+@click.option(
+    "-k", "--prefix", multiple=True, help="run the metrics of the prefix."
+)
+@click.option("-r", "--repeat", default=5, help="the runs of each metric.")
+def run(output, prefix, repeat):
+    load_scripts()
+    results = run_suite(prefix or "", repeat)
+    for name, result in results["metrics"].items():
+        extra = "".join(
+            f" {key}={value}"
+            for key, value in result.items()
+            if key not in ("us", "number")
+        )
+        click.echo(f"{name:48} {result['us']:10.2f} us{extra}")
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+@cli.command(help="compare the results to the baseline, fail on regressions.")
+@click.argument("baseline", type=click.File())
+@click.argument("results", type=click.File())
+@click.option(
+    "-t",
+    "--threshold",
+    default=0.1,
+    help="the allowed slowdown, 0.1 allows the metrics to be 10% slower.",
+)
+def compare(baseline, results, threshold):
+    baseline = json.load(baseline)
+    results = json.load(results)
+    comparison = compare_results(baseline, results, threshold)
+    for name, ratio in comparison["ratios"].items():
+        base = baseline["metrics"][name]["us"]
+        result = results["metrics"][name]["us"]
+        flag = ""
+        if name in comparison["regressions"]:
+            flag = " REGRESSED"
+        elif name in comparison["improvements"]:
+            flag = " IMPROVED"
+        click.echo(
+            f"{name:48} {base:10.2f} -> {result:10.2f} us"
+            f" {ratio - 1:+7.1%}{flag}"
+        )
+    for name in comparison["missing"]:
+        click.secho(f"{name:48} missing from the results", fg="yellow")
+    if comparison["regressions"]:
+        click.secho(
+            f"{len(comparison['regressions'])} metrics regressed more than"
+            f" {threshold:.0%}",
+            fg="red",
+            err=True,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    cli()
@@ -14,11 +14,18 @@ __all__ = [
     "Request",
     "File",
     "Router",
+    "Response",
+    "JSONStream",
+    "NDJSONStream",
+    "CachePolicy",
 ]
 from qor import constants
 from qor.app import BaseApp, Qor
+from qor.cache import CachePolicy
+from qor.codecs import JSONStream, NDJSONStream
 from qor.config import BaseConfig
 from qor.router import Route, Router
+from qor.utils import Response
 from qor.watcher import Watcher
 from qor.wrappers import Connection, File, KoreDomain, Request
 from qor.wsgi import (
@@ -1,4 +1,6 @@
+import atexit
 import functools
+import json
 import os
 import socket
 import traceback
@@ -8,6 +10,7 @@ from typing import (
     Callable,
     Dict,
     Iterable,
+    List,
     Literal,
     Optional,
     Type,
@@ -17,11 +20,30 @@ from typing import (
 import click
 
 import qor.constants as constants
+from qor.batching import Batcher
+from qor.cache import CachePolicy, ResponseCache
+from qor.compression import Compressor, compressor_from_config
+from qor.codecs import JSONCodec, get_json_codec
 from qor.config import BaseConfig
-from qor.router import Route, Router
+from qor.offload import OffloadPools
+from qor.router import Route, Router, merge_routes, order_routes_by_hits
 from qor.templates import JinjaAdapter
-from qor.utils import ReturnValueParser, get_path, import_object_from_module
-from qor.wrappers import DefaultHandlerWrapper, Request, simple_wrapper
+from qor.wsgi import KoreWSGIRequestHandler, KoreWSGIServer
+from qor.utils import (
+    Response,
+    ReturnValueParser,
+    file_lock,
+    get_path,
+    import_object_from_module,
+    is_async_callable,
+)
+from qor.wrappers import (
+    DefaultHandlerWrapper,
+    ErrorHandlersIndex,
+    MethodDispatcher,
+    Request,
+    simple_wrapper,
+)
 
 if TYPE_CHECKING:
     from qor.templates import BaseTemplateAdapter, KoreDomain
@@ -31,6 +53,18 @@ def dev_tracer(etype, value, tb):
     traceback.print_exception(etype, value, tb)
 
 
+# the return values that can't reference the request after the response, the
+# requests that return anything else, a generator for example, aren't reused
+_POOLED_RETURN_TYPES = frozenset(
+    (type(None), str, bytes, bytearray, int, dict, list, tuple, Response)
+)
+
+
+def route_profile_key(route: Route) -> str:
+    """the key of the route in the route hits file"""
+    return f"{route.domain or ''} {route.path}"
+
+
 class BaseApp:
     LOG_INFO = constants.LOG_INFO  # 6
     LOG_NOTICE = constants.LOG_NOTICE  # 5
@@ -194,6 +228,11 @@ class BaseApp:
         """Suspends the current coroutine for the specified amount of milliseconds."""
         return await self.kore.suspend(milliseconds)
 
+    def queue(self):
+        """Creates a queue, `await queue.pop()` suspends the current coroutine
+        till an object is pushed by `queue.push(obj)` in another coroutine."""
+        return self.kore.queue()
+
     def websocket_broadcast(self, c, op, data):
         """Broadcasts a websocket message to all other connected websocket clients.
 
@@ -247,6 +286,8 @@ class Qor(BaseApp):
     _root_app = False
     # THe request class, It is used to wrap the kore requests.
     default_template_paths = ["templates"]
+    # the callbacks that are frozen in the handlers pipelines by `start`
+    handler_callbacks = ("before_handler", "after_handler", "error_handler")
 
     def __init__(
         self,
@@ -260,6 +301,7 @@ class Qor(BaseApp):
         request_class=None,
         handler_wrapper=None,
         return_value_parser=None,
+        json_codec: Optional[JSONCodec] = None,
         **kwargs,
     ) -> None:
         self.name = name
@@ -270,7 +312,10 @@ class Qor(BaseApp):
         self._domains: Dict[str, "KoreDomain"] = {}
         self._default_domain = None
         if not router:
-            self.router = Router(name=name)
+            self.router = Router(
+                name=name,
+                reverse_cache_size=self.config.get("reverse_cache_size", 0),
+            )
         elif isinstance(router, str):
             try:
                 router = import_object_from_module(router)
@@ -297,6 +342,21 @@ class Qor(BaseApp):
         self._app_ready_callbacks = []
         self._error_handlers = []
         self._setup_finished = False
+        self._callbacks_frozen = False
+        self._error_handlers_index: Optional[ErrorHandlersIndex] = None
+        # (profile key, handler wrapper) for each registered handler
+        self._profiled_handlers = []
+        # the freelist of the reset requests, see `release_request`
+        self._request_pool: List[Request] = []
+        self._request_pool_size = 0
+        # created from the `json_codec` config on the first use
+        self._json_codec = json_codec
+        self._response_cache: Optional[ResponseCache] = None
+        self._compressor: Optional[Compressor] = None
+        self._compressor_loaded = False
+        self._offload_pools: Optional[OffloadPools] = None
+        # route name or path: the `Batcher` of the `batch_route`
+        self.batchers: Dict[str, Batcher] = {}
         self._template_adapter: Optional[BaseTemplateAdapter] = template_adapter
         self._template_adapter_class: Optional[Type] = (
             template_adapter_class or JinjaAdapter
@@ -479,14 +539,56 @@ class Qor(BaseApp):
         return self.auth(name, "cookie", value=value, redirect_url=redirect_url)
 
     def start(self, *args):
+        # the handlers pipelines are built for the frozen callbacks
+        self._callbacks_frozen = True
         self._before_handler_callbacks = tuple(self._before_handler_callbacks)
         self._after_handler_callbacks = tuple(
             reversed(self._after_handler_callbacks)
         )
+        self._error_handlers_index = ErrorHandlersIndex(self._error_handlers)
+        # only the requests that have no `__dict__` are fully reset, So the
+        # requests of the classes that don't use `__slots__` are not pooled.
+        if self.request_class.__dictoffset__ == 0:
+            self._request_pool_size = self.config.get("request_pool_size", 0)
         self._register_routes()
 
-    def wrap_request(self, kore_request, *args, **kwargs):
-        return self.request_class(kore_request, self, *args, **kwargs)
+    @property
+    def error_handlers_index(self) -> ErrorHandlersIndex:
+        """the error handlers compiled by `start`, it is built from the current
+        error handlers if the app is not started yet."""
+        if self._error_handlers_index is None:
+            return ErrorHandlersIndex(self._error_handlers)
+        return self._error_handlers_index
+
+    def wrap_request(self, kore_request, *args, route=None, **kwargs):
+        if self._request_pool:
+            request = self._request_pool.pop()
+            request.__init__(kore_request, self, route, *args, **kwargs)
+            return request
+        return self.request_class(kore_request, self, route, *args, **kwargs)
+
+    def release_request(self, request: Request):
+        """called by the handlers after sending the response, the request is
+        reset & kept to be reused by `wrap_request` if the pool is not full.
+
+        Only the requests that the handler pipeline created are reused, if
+        they aren't retained by `Request.retain` & their return value can't
+        reference them.
+        """
+        if not request._owned:
+            return
+        request._owned = False
+        kore_request = request.request
+        if getattr(kore_request, "_request", None) is request:
+            kore_request._request = None
+        if (
+            len(self._request_pool) >= self._request_pool_size
+            or type(request) is not self.request_class
+            or type(request.return_value) not in _POOLED_RETURN_TYPES
+        ):
+            return
+        request.reset()
+        self._request_pool.append(request)
 
     def _register_routes(self):
         """
@@ -503,7 +605,12 @@ class Qor(BaseApp):
 
         _default_domain = self._default_domain
         self.router.build_routes()
-        _routes = self.router.routes
+        _routes = merge_routes(self.router.routes)
+        if self.config.get("route_profile", False):
+            _routes = order_routes_by_hits(
+                _routes, self.load_route_hits(), route_profile_key
+            )
+            atexit.register(self.dump_route_hits)
 
         for route in _routes:
             route_domain_name = route.get("domain", None)
@@ -514,7 +621,6 @@ class Qor(BaseApp):
                         f"No domain found with name {route_domain_name} for"
                         f" route {route}"
                     )
-                del route["domain"]
                 self.__register_route(route_domain, route)
             else:
                 if not _default_domain:
@@ -538,31 +644,100 @@ class Qor(BaseApp):
         for your convinence, you can use `kore_lib.router.Route`
         """
         path = route.get("path")
-        handler = self.handler_wrapper(route.get("handler"), self, route=route)
-
-        params = {}
-        if "params" in route:
-            params = route.pop("params")
-        methods = route.methods  # methods is proprty not key
-
-        auth = {}
-
+        method_routes = route.method_routes
+        auth = None
         if route.has_auth:
-            auth_name = route.get("auth_name")
-
-            auth = self._auths.get(auth_name)
-            if not auth:
-                auth = route.auth
-        for method in methods:
-            kwargs = {}
-            key = route.get("key")
-            if key:
-                kwargs["key"] = key
-            if params:
-                kwargs[method] = params
-            if auth:
-                kwargs["auth"] = auth
-            domain.route(path, handler, methods=[method], **kwargs)
+            auth = self._auths.get(route.get("auth_name")) or route.auth
+        # `kore` can't await the verifiers, the async ones are awaited by the
+        # handlers pipelines
+        async_auth = None
+        if auth:
+            # the `auth` verifiers are wrapped by `simple_wrapper`
+            verify = auth["verify"]
+            if is_async_callable(getattr(verify, "func", verify)):
+                async_auth, auth = auth, None
+        if auth or async_auth:
+            self._check_auth_cache(route, auth or async_auth)
+        handlers = {
+            (r.handler, r.name, id(r.cache)) for r in method_routes.values()
+        }
+        if len(handlers) == 1:
+            handler = self.handler_wrapper(route.handler, self, route=route)
+            wrappers = [handler]
+        else:
+            handler = MethodDispatcher(
+                {
+                    method: self.handler_wrapper(r.handler, self, route=r)
+                    for method, r in method_routes.items()
+                }
+            )
+            wrappers = handler.handlers.values()
+        profile_key = route_profile_key(route)
+        for wrapper in wrappers:
+            wrapper.async_auth = async_auth
+            wrapper.build_pipeline()
+            self._profiled_handlers.append((profile_key, wrapper))
+
+        kwargs = {}
+        key = route.get("key")
+        if key:
+            kwargs["key"] = key
+        for method, method_route in method_routes.items():
+            if method_route.params:
+                kwargs[method] = method_route.params
+
+        if auth:
+            kwargs["auth"] = auth
+        domain.route(path, handler, methods=route.methods, **kwargs)
+
+    def _check_auth_cache(self, route: Route, auth: dict):
+        """the cached responses of the routes that have `auth` must vary by
+        the auth header or the `Cookie`, else they are shared by the users."""
+        header = "Cookie" if auth["type"] == "cookie" else auth["value"]
+        for method_route in route.method_routes.values():
+            policy = CachePolicy.from_value(method_route.cache)
+            if policy is None:
+                continue
+            if header.lower() not in (name.lower() for name in policy.vary):
+                raise Exception(
+                    f"The route `{route.path}` has `auth` & `cache`, add"
+                    f" `{header}` to the cache `vary`, So the users don't"
+                    " share the cached responses."
+                )
+
+    def load_route_hits(self) -> Dict[str, int]:
+        """load the route hits stored by `dump_route_hits`"""
+        path = self.config.get("route_profile_path")
+        if not path or not os.path.exists(path):
+            return {}
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            click.secho(f"can't load route hits from {path}", fg="red")
+            return {}
+
+    def dump_route_hits(self):
+        """add the hits counted since the last dump to the route hits file,
+        the workers take turns by locking the `.lock` file next to it."""
+        path = self.config.get("route_profile_path")
+        if not path:
+            return
+        with file_lock(f"{path}.lock"):
+            hits = self.load_route_hits()
+            for profile_key, wrapper in self._profiled_handlers:
+                if wrapper.hits:
+                    hits[profile_key] = hits.get(profile_key, 0) + wrapper.hits
+                    wrapper.hits = 0
+            temp_path = f"{path}.{os.getpid()}"
+            with open(temp_path, "w") as f:
+                json.dump(hits, f)
+            os.replace(temp_path, path)
+
+    def count_route_hit(self, wrapper):
+        """called by the handler wrappers on each request in profile mode,
+        the hits are written by the `route_profile_flush` timer & on exit."""
+        wrapper.hits += 1
 
     @_setup_method
     def add_route(
@@ -712,6 +887,57 @@ class Qor(BaseApp):
             **kwargs,
         )
 
+    @_setup_method
+    def batch_route(
+        self,
+        path: str,
+        max_batch: int = 32,
+        max_wait_ms: int = 5,
+        input: Optional[Callable] = None,
+        methods: Iterable[str] = ["get"],
+        name=None,
+        **kwargs,
+    ):
+        """register handler that is called once for a batch of the concurrent
+        requests, with the list of their inputs, & returns the list of their
+        results in the same order. Each result is returned to its request as
+        the return value of normal handler.
+
+        The requests wait up to `max_wait_ms` for the batch to fill, or run
+        once it has `max_batch` inputs. The input of each request is
+        `input(request, *args, **kwargs)`, the request itself by default.
+
+        Example
+
+        >> @app.batch_route("/users/<id:int>", max_batch=64, max_wait_ms=2,
+        >>                  input=lambda request, id: id)
+        >> async def users(ids):
+        >>     rows = await db.fetch_users(ids)
+        >>     return [rows.get(id, (404, "not found")) for id in ids]
+        """
+
+        def decorator(func):
+            batcher = Batcher(
+                func,
+                self.suspend,
+                self.queue,
+                max_batch=max_batch,
+                max_wait_ms=max_wait_ms,
+            )
+            self.batchers[name or path] = batcher
+
+            @functools.wraps(func)
+            async def handler(request, *args, **kw):
+                value = (
+                    request if input is None else input(request, *args, **kw)
+                )
+                return await batcher.submit(value)
+
+            self.route(path, methods=methods, name=name, **kwargs)(handler)
+            return func
+
+        return decorator
+
     def mount_router(self, path: str, router: Router):
         return self.router.mount_router(path=path, router=router)
 
@@ -723,6 +949,11 @@ class Qor(BaseApp):
         """
 
         def wrapper(func):
+            if self._callbacks_frozen and type in self.handler_callbacks:
+                raise Exception(
+                    f"can't add `{type}` callback after starting the app, the"
+                    " handlers pipelines are already built."
+                )
             callbacks = self.callbacks_map.get(type, None)
             if callbacks is None:
                 raise Exception(
@@ -737,6 +968,70 @@ class Qor(BaseApp):
 
         return wrapper
 
+    @property
+    def offload_pools(self) -> OffloadPools:
+        """the `cpu` & `io` executors of the offloaded functions"""
+        if self._offload_pools is None:
+            self._offload_pools = OffloadPools.from_config(self.config)
+        return self._offload_pools
+
+    def offload(self, pool: Literal["cpu", "io"] = "io"):
+        """run the function in the worker `cpu` process pool or `io` thread
+        pool, the decorated function returns an awaitable that suspends the
+        request till the result arrives.
+
+        N.B:. the functions & the arguments of the `cpu` pool are pickled, So
+        they must be module level functions & the request can't be passed.
+
+        Example
+
+        >> @app.offload(pool="cpu")
+        >> def resize(image: bytes, width: int) -> bytes:
+        >>     ...
+        >>
+        >> @app.post("/thumbnails")
+        >> async def thumbnail(request):
+        >>     return await resize(request.body, 128)
+        >>
+        >> @app.get("/report")
+        >> @app.offload(pool="io")
+        >> def report(request):
+        >>     return blocking_db.query(...)
+        """
+        pools = self.offload_pools
+        pools.used.add(pool)
+
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                return await self.run_offloaded(pool, func, *args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    async def run_offloaded(self, pool: str, func: Callable, *args, **kwargs):
+        """run the function in the pool & await its result"""
+        pools = self.offload_pools
+        future = pools.submit(pool, func, *args, **kwargs)
+        return await pools.wait(future, self.suspend)
+
+    def workerstart(self):
+        """called by `kore` in each worker after forking, the executors of
+        the offload pools are created per worker."""
+        if self._offload_pools is not None:
+            self._offload_pools.start()
+        flush_interval = self.config.get("route_profile_flush", 60000)
+        if self.config.get("route_profile", False) and flush_interval:
+            # 0: run in interval
+            self.timer(lambda timer: self.dump_route_hits(), flush_interval, 0)
+
+    def workerstop(self):
+        """called by `kore` when the worker stops, the offload pools finish
+        their pending calls if `offload_shutdown_wait`."""
+        if self._offload_pools is not None:
+            self._offload_pools.shutdown()
+
     def before_handler(self, func):
         self.callback("before_handler")(func)
         return func
@@ -750,7 +1045,7 @@ class Qor(BaseApp):
 
     def error_handler(self, error):
         def wrapper(func):
-            self.callback("error_handler")(func, error=error)
+            self.callback("error_handler", error=error)(func)
             return func
 
         return wrapper
@@ -769,6 +1064,72 @@ class Qor(BaseApp):
 
         return wrapper
 
+    @property
+    def json_codec(self) -> JSONCodec:
+        """the JSON codec of the app, used to encode the returned values &
+        templates `tojson` & to decode the JSON requests."""
+        if self._json_codec is None:
+            self._json_codec = get_json_codec(
+                self.config.get("json_codec", "auto")
+            )
+        return self._json_codec
+
+    @json_codec.setter
+    def json_codec(self, codec: JSONCodec):
+        self._json_codec = codec
+
+    @property
+    def response_cache(self) -> ResponseCache:
+        """the cache of the responses of the routes that have `cache`, it is
+        created on the first request, So each worker has its own cache."""
+        if self._response_cache is None:
+            self._response_cache = ResponseCache(
+                self.config.get("response_cache_max_bytes", 64 * 1024 * 1024),
+                compressor=self.compressor,
+            )
+        return self._response_cache
+
+    @property
+    def compressor(self) -> Optional[Compressor]:
+        """the responses compressor of the `compression` configs, None if the
+        compression is disabled."""
+        if not self._compressor_loaded:
+            self._compressor = compressor_from_config(self.config)
+            self._compressor_loaded = True
+        return self._compressor
+
+    @compressor.setter
+    def compressor(self, compressor: Optional[Compressor]):
+        self._compressor = compressor
+        self._compressor_loaded = True
+
+    def wsgi_server(self, wsgi_app, server_address=("", 0)) -> KoreWSGIServer:
+        """a `KoreWSGIServer` of the wsgi app that compresses its responses
+        with the `compression` configs of the app.
+
+        >> server = app.wsgi_server(flask_app)
+        >> server.set_kore_request(request)
+        >> server.handle_request()
+        """
+        server = KoreWSGIServer(
+            server_address, KoreWSGIRequestHandler, compressor=self.compressor
+        )
+        server.set_app(wsgi_app)
+        return server
+
+    def invalidate_cache(self, name=None, tag: Optional[str] = None) -> int:
+        """remove the cached responses of the route name or the cache tag, or
+        all the cached responses. Returns the number of removed responses.
+
+        Example
+
+        >> @app.post("/posts")
+        >> def add_post(request):
+        >>     ...
+        >>     app.invalidate_cache(tag="posts")
+        """
+        return self.response_cache.invalidate(name=name, tag=tag)
+
     @property
     def template_adapter(self) -> "BaseTemplateAdapter":
         if self._template_adapter:
@@ -0,0 +1,103 @@
+from inspect import isawaitable
+from typing import Any, Awaitable, Callable, List, Optional
+
+
+class _Slot:
+    """the result of one batched input"""
+
+    __slots__ = ("done", "result", "error", "waiter")
+
+    def __init__(self) -> None:
+        self.done = False
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        # the queue the waiting request pops, pushed when the batch is done
+        self.waiter: Any = None
+
+
+class Batcher:
+    """coalesce the concurrent inputs into batches, the handler is called
+    once per batch with the list of inputs & returns the list of results.
+
+    The first input of a batch waits `max_wait_ms` for the others, the batch
+    is run earlier once it has `max_batch` inputs. The first input is
+    suspended by `suspend` & the others wait on a `queue`, the `kore` or the
+    stand-in event loop ones, they are woken once their batch is done.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[List[Any]], Any],
+        suspend: Callable[[int], Awaitable],
+        queue: Callable[[], Any],
+        max_batch: int = 32,
+        max_wait_ms: int = 5,
+    ) -> None:
+        self.func = func
+        self.suspend = suspend
+        self.queue = queue
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self._batch: list = []
+        self.batches = 0
+        self.inputs = 0
+
+    async def submit(self, value: Any) -> Any:
+        """add the input to the current batch & return its result"""
+        slot = _Slot()
+        batch = self._batch
+        batch.append((value, slot))
+        if len(batch) >= self.max_batch:
+            await self._run(batch)
+        elif len(batch) == 1:
+            # the first input waits for the batch to fill
+            await self.suspend(self.max_wait_ms)
+            if self._batch is batch:
+                await self._run(batch)
+        if not slot.done:
+            slot.waiter = self.queue()
+            await slot.waiter.pop()
+        if slot.error is not None:
+            raise slot.error
+        return slot.result
+
+    async def _run(self, batch: list):
+        self._batch = []
+        self.batches += 1
+        self.inputs += len(batch)
+        results: list = []
+        error: Optional[BaseException] = None
+        try:
+            results = self.func([value for value, _ in batch])
+            if isawaitable(results):
+                results = await results
+            results = list(results)
+            if len(results) != len(batch):
+                raise Exception(
+                    f"the batch handler {self.func} returned {len(results)}"
+                    f" results for {len(batch)} inputs"
+                )
+        except Exception as e:
+            error = e
+        except BaseException as e:
+            # e.g. the running request is cancelled, it gets the exception &
+            # the others of the batch fail
+            error = Exception(f"the batch handler {self.func} failed: {e!r}")
+            raise
+        finally:
+            # the waiting requests are always woken
+            for index, (_, slot) in enumerate(batch):
+                if error is None:
+                    slot.result = results[index]
+                else:
+                    slot.error = error
+                slot.done = True
+                if slot.waiter is not None:
+                    slot.waiter.push(None)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "inputs": self.inputs,
+            "mean_batch": self.inputs / self.batches if self.batches else 0,
+        }
@@ -0,0 +1,399 @@
+"""the load generator of `qor bench`, it drives a running server over
+keep-alive connections from one `asyncio` event loop & records the latencies
+of each route in an HDR style histogram.
+
+Example
+>> requests = [BenchRequest("/", label="index")]
+>> results = asyncio.run(run_load("127.0.0.1", 8888, requests, 16, 10))
+>> results["index"]["p99"]   # in microseconds
+"""
+
+import asyncio
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+from itertools import cycle
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram:
+    """HDR style histogram of integer values (the latencies in microseconds).
+
+    The values below `2 ** sub_bits` have their own buckets, the larger ones
+    are bucketed in `2 ** (sub_bits - 1)` linear buckets per power of two, So
+    the reported values are within `2 / 2 ** sub_bits` of the recorded ones
+    (0.8% by default) whatever their magnitude, in a few KB of counts.
+    """
+
+    def __init__(self, sub_bits: int = 8) -> None:
+        self.sub_bits = sub_bits
+        self.sub_count = 1 << sub_bits
+        self.half_count = self.sub_count >> 1
+        self.counts: List[int] = []
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_count:
+            return value
+        shift = value.bit_length() - self.sub_bits
+        return (
+            self.sub_count
+            + (shift - 1) * self.half_count
+            + (value >> shift)
+            - self.half_count
+        )
+
+    def _highest(self, index: int) -> int:
+        """the highest value of the bucket"""
+        if index < self.sub_count:
+            return index
+        index -= self.sub_count
+        shift = index // self.half_count + 1
+        top = index % self.half_count + self.half_count
+        return ((top + 1) << shift) - 1
+
+    def record(self, value: int, count: int = 1):
+        value = max(int(value), 0)
+        index = self._index(value)
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += count
+        self.count += count
+        self.total += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram"):
+        if other.sub_bits != self.sub_bits:
+            raise ValueError("can't merge histograms of different precisions")
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percentile: float) -> int:
+        if not self.count:
+            return 0
+        target = max(math.ceil(percentile / 100 * self.count), 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._highest(index), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self, percentiles: Iterable[float] = PERCENTILES) -> dict:
+        rv = {
+            "count": self.count,
+            "min": self.min or 0,
+            "mean": self.mean,
+            "max": self.max,
+        }
+        for percentile in percentiles:
+            rv[f"p{percentile:g}"] = self.percentile(percentile)
+        return rv
+
+
+class BenchRequest:
+    """one request of the load, encoded once"""
+
+    __slots__ = ("method", "path", "label", "raw", "no_body")
+
+    def __init__(
+        self,
+        path: str,
+        method: str = "GET",
+        headers: Optional[Dict[str, str]] = None,
+        body: bytes = b"",
+        label: Optional[str] = None,
+        host: str = "localhost",
+    ) -> None:
+        self.method = method.upper()
+        self.path = path
+        self.label = label or path
+        self.no_body = self.method == "HEAD"
+        headers = {"Host": host, **(headers or {})}
+        if body:
+            headers["Content-Length"] = str(len(body))
+        head = "".join(
+            f"{name}: {value}\r\n" for name, value in headers.items()
+        )
+        self.raw = (
+            f"{self.method} {path} HTTP/1.1\r\n{head}\r\n".encode("latin-1")
+            + body
+        )
+
+
+def load_request_log(path: str) -> List[dict]:
+    """read a recorded request log, one request per line, either as a JSON
+    object with `path` & the optional `method`, `headers`, `body` & `label`,
+    or as `METHOD PATH`. The blank & the `#` lines are skipped.
+    """
+    entries = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                entries.append(json.loads(line))
+            else:
+                method, _, target = line.partition(" ")
+                entries.append({"method": method, "path": target.strip()})
+    return entries
+
+
+async def _read_response(reader: asyncio.StreamReader, no_body: bool):
+    """read one response, returns the status & whether the server closes"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head[:-4].decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    closing = headers.get("connection", "").lower() == "close"
+    if no_body or status in (204, 304) or 100 <= status < 200:
+        return status, closing
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.read()
+        closing = True
+    return status, closing
+
+
+class _Results:
+    def __init__(self) -> None:
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.statuses: Dict[str, Dict[int, int]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, label: str, latency: int, status: int):
+        histogram = self.histograms.get(label)
+        if histogram is None:
+            histogram = self.histograms[label] = LatencyHistogram()
+            self.statuses[label] = {}
+        histogram.record(latency)
+        statuses = self.statuses[label]
+        statuses[status] = statuses.get(status, 0) + 1
+
+    def error(self, label: str):
+        self.errors[label] = self.errors.get(label, 0) + 1
+
+
+async def _connection(host, port, requests, results, deadline, record_after):
+    reader = writer = None
+    clock = time.perf_counter
+    try:
+        while clock() < deadline:
+            request = next(requests)
+            start = clock()
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(host, port)
+                    start = clock()
+                writer.write(request.raw)
+                status, closing = await _read_response(reader, request.no_body)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                results.error(request.label)
+                if writer is not None:
+                    writer.close()
+                    writer = None
+                # don't spin on a server that refuses the connections
+                await asyncio.sleep(0.01)
+                continue
+            end = clock()
+            if start >= record_after:
+                results.record(
+                    request.label, int((end - start) * 1_000_000), status
+                )
+            if closing:
+                writer.close()
+                writer = None
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def run_load(
+    host: str,
+    port: int,
+    requests: List[BenchRequest],
+    concurrency: int = 16,
+    duration: float = 10,
+    warmup: float = 0,
+) -> Dict[str, dict]:
+    """send the requests in turn over `concurrency` keep-alive connections,
+    one request in flight per connection, for `warmup` + `duration` seconds.
+
+    Returns the stats of each request label, the latencies in microseconds,
+    & the `total` of all of them.
+    """
+    results = _Results()
+    requests = cycle(requests)
+    start = time.perf_counter()
+    record_after = start + warmup
+    deadline = record_after + duration
+    await asyncio.gather(
+        *(
+            _connection(host, port, requests, results, deadline, record_after)
+            for _ in range(concurrency)
+        )
+    )
+    elapsed = time.perf_counter() - record_after
+    rv = {}
+    total = LatencyHistogram()
+    for label in results.errors:
+        if label not in results.histograms:
+            results.histograms[label] = LatencyHistogram()
+            results.statuses[label] = {}
+    for label, histogram in results.histograms.items():
+        total.merge(histogram)
+        rv[label] = {
+            **histogram.to_dict(),
+            "requests_per_s": histogram.count / elapsed,
+            "statuses": results.statuses[label],
+            "errors": results.errors.get(label, 0),
+        }
+    rv["total"] = {
+        **total.to_dict(),
+        "requests_per_s": total.count / elapsed,
+        "errors": sum(results.errors.values()),
+    }
+    return rv
+
+
+def free_port(host: str = "127.0.0.1") -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def start_devserver(
+    app_path: str, host: str = "127.0.0.1", port: int = None, timeout=10
+) -> Tuple[subprocess.Popen, int]:
+    """serve the app by `qor devserver` in a new process, returns the process
+    & the port once the server accepts the connections."""
+    port = port or free_port(host)
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "qor.cli",
+            "devserver",
+            os.path.abspath(app_path),
+            "--host",
+            host,
+            "--port",
+            str(port),
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise Exception(f"the devserver exited with {process.returncode}")
+        try:
+            socket.create_connection((host, port), timeout=0.1).close()
+            return process, port
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise Exception(f"the devserver didn't listen on {host}:{port}")
+
+
+def format_results(results: Dict[str, dict]) -> str:
+    lines = [
+        f"{'route':24} {'requests':>9} {'req/s':>9} {'errors':>6}"
+        + "".join(f" {f'p{p:g}':>8}" for p in PERCENTILES)
+        + f" {'max':>8}  (ms)"
+    ]
+    for label, stats in results.items():
+        lines.append(
+            f"{label[:24]:24} {stats['count']:9d}"
+            f" {stats['requests_per_s']:9.1f} {stats['errors']:6d}"
+            + "".join(f" {stats[f'p{p:g}'] / 1000:8.2f}" for p in PERCENTILES)
+            + f" {stats['max'] / 1000:8.2f}"
+        )
+    return "\n".join(lines)
+
+
+def route_label(app, path: str, method: str = "get") -> str:
+    """the name of the app route that handles the path, or the path"""
+    if app is None:
+        return path
+    matched = app.router.match(None, path.split("?", 1)[0], method.lower())
+    return (matched[0].name or path) if matched else path
+
+
+def app_requests(
+    app,
+    routes: Iterable[str] = (),
+    replay: Optional[str] = None,
+    host: str = "localhost",
+) -> List[BenchRequest]:
+    """the requests of the load, from the replayed request log, the given
+    route names or paths, or else all of the static GET routes of the app.
+    """
+    if replay:
+        return [
+            BenchRequest(
+                entry["path"],
+                method=entry.get("method", "GET"),
+                headers=entry.get("headers"),
+                body=entry.get("body", "").encode(),
+                label=entry.get("label")
+                or route_label(app, entry["path"], entry.get("method", "get")),
+                host=host,
+            )
+            for entry in load_request_log(replay)
+        ]
+    requests = []
+    for route in routes:
+        if route.startswith("/"):
+            requests.append(
+                BenchRequest(route, label=route_label(app, route), host=host)
+            )
+        elif app is None:
+            raise Exception(f"can't find the path of the route {route}")
+        else:
+            requests.append(
+                BenchRequest(app.reverse(route), label=route, host=host)
+            )
+    if not requests and app is not None:
+        requests = [
+            BenchRequest(route.path, label=route.name or route.path, host=host)
+            for route in app.router.routes
+            if route.is_static and "get" in route.methods
+        ]
+    if not requests:
+        raise Exception("no requests to send, pass `--route` or `--replay`")
+    return requests
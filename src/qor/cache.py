@@ -0,0 +1,302 @@
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple, Union
+
+import qor.constants as constants
+from qor.conditional import etag_matches
+
+if TYPE_CHECKING:
+    from qor.compression import Compressor
+    from qor.wrappers import Request
+
+# the `kore` methods of the requests that are answered from the cache
+CACHED_METHODS = frozenset(
+    (constants.HTTP_METHOD_GET, constants.HTTP_METHOD_HEAD)
+)
+
+
+def cacheable(cache_control: Optional[str]) -> bool:
+    """False if the `Cache-Control` response header forbids the shared caches
+    to store the response."""
+    if not cache_control:
+        return True
+    for directive in cache_control.split(","):
+        name = directive.split("=", 1)[0].strip().lower()
+        if name == "no-store" or name == "private":
+            return False
+    return True
+
+
+class CachePolicy:
+    """how the responses of a route are cached, it is created from the `cache`
+    argument of the route decorators.
+
+    Args:
+        ttl (float): the seconds after which the cached response expires.
+        query_args (Iterable[str]): the query arguments that are part of the
+            cache key. N.B:. `kore` only exposes the arguments that are
+            validated by the route `params`.
+        vary (Iterable[str]): the request headers that are part of the cache
+            key, like the `Vary` response header.
+        tags (Iterable[str]): tags to invalidate the cached responses by, see
+            `Qor.invalidate_cache`.
+        statuses (Iterable[int]): the response statuses that are cached.
+        early (bool): answer the cached responses before running the
+            `before_handler` callbacks.
+
+    N.B:. the responses that have `Cache-Control: no-store` or `private` aren't
+    cached. The routes that have `auth` must `vary` by the auth header, or by
+    the `Cookie` header for the cookie auth, So the users don't share their
+    cached responses.
+
+    Example
+
+    >> @app.get("/posts", params={"page": "^[0-9]+$"},
+    >>          cache={"ttl": 30, "query_args": ["page"], "tags": ["posts"]})
+    >> def posts(request):
+    >>     ...
+    >> app.invalidate_cache(tag="posts")
+    """
+
+    __slots__ = ("ttl", "query_args", "vary", "tags", "statuses", "early")
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        query_args: Iterable[str] = (),
+        vary: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        statuses: Iterable[int] = (200,),
+        early: bool = False,
+    ) -> None:
+        self.ttl = ttl
+        self.query_args = tuple(query_args)
+        self.vary = tuple(vary)
+        self.tags = tuple(tags)
+        self.statuses = frozenset(statuses)
+        self.early = early
+
+    @classmethod
+    def from_value(
+        cls, value: Union[None, float, dict, "CachePolicy"]
+    ) -> Optional["CachePolicy"]:
+        """the policy of the route `cache` argument: the ttl in seconds, dict
+        of the policy arguments or a `CachePolicy`."""
+        if value is None or value is False:
+            return None
+        if isinstance(value, CachePolicy):
+            return value
+        if isinstance(value, dict):
+            return cls(**value)
+        return cls(ttl=value)
+
+    def key(self, kore_request) -> tuple:
+        """the cache key of the request, the method, host & path, then the
+        values of the query args & the vary headers."""
+        key = (kore_request.method, kore_request.host, kore_request.path)
+        if self.query_args:
+            kore_request.populate_get()
+            key += tuple(kore_request.argument(arg) for arg in self.query_args)
+        if self.vary:
+            key += tuple(
+                kore_request.request_header(header) for header in self.vary
+            )
+        return key
+
+
+class ResponseCache:
+    """LRU cache of the (status, headers, body) of the responses, it is
+    created for each worker by `Qor.response_cache`.
+
+    The entries expire after their route `ttl` & the least recently used
+    entries are evicted when the cached bodies exceed `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        compressor: Optional["Compressor"] = None,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.compressor = compressor
+        self.size = 0
+        # key: (expires, status, headers, body, size, name, tags,
+        #       {encoding: compressed body})
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        # route name: the keys of its entries, tag: the keys of its entries
+        self._names: Dict[Any, set] = {}
+        self._tags: Dict[str, set] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # route name: [hits, misses]
+        self.route_counters: Dict[Any, list] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _count(self, name, index: int):
+        counters = self.route_counters.get(name)
+        if counters is None:
+            counters = self.route_counters[name] = [0, 0]
+        counters[index] += 1
+
+    def _lookup(self, key: tuple, name=None) -> Optional[tuple]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] < time.monotonic():
+            self._remove(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            self._count(name, 1)
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self._count(name, 0)
+        return entry
+
+    def get(self, key: tuple, name=None) -> Optional[tuple]:
+        """return the (status, headers, body) of the key, or None & count a
+        miss if there is no fresh entry."""
+        entry = self._lookup(key, name)
+        if entry is None:
+            return None
+        return entry[1], entry[2], entry[3]
+
+    def send(self, kore_request, key: tuple, name=None) -> bool:
+        """send the cached response of the key, or 304 if it has an `ETag` that
+        matches the request `If-None-Match`. Returns False if there is no
+        cached response.
+
+        The compressed variants of the body are cached with it, if the cache
+        has a `compressor`.
+        """
+        entry = self._lookup(key, name)
+        if entry is None:
+            return False
+        _, status, headers, body, size, _, _, variants = entry
+        content_type = etag = None
+        for header, value in headers:
+            if header == "ETag":
+                # set with the suffix of the content coding, if any
+                etag = value
+                continue
+            kore_request.response_header(header, value)
+            if header == "Content-Type":
+                content_type = value
+        if (
+            etag is not None
+            and kore_request.method in CACHED_METHODS
+            and etag_matches(kore_request.request_header("If-None-Match"), etag)
+        ):
+            status, body = 304, b""
+        if self.compressor is None:
+            if etag is not None:
+                kore_request.response_header("ETag", etag)
+        elif status == 304:
+            self.compressor.response_encoding(
+                kore_request, content_type, size, etag
+            )
+        else:
+            count = len(variants)
+            body = self.compressor.compress_response(
+                kore_request, body, content_type, variants=variants, etag=etag
+            )
+            if len(variants) != count:
+                self.size += len(body)
+                self._evict()
+        kore_request.response(status, body)
+        return True
+
+    def store(
+        self, key: tuple, policy: CachePolicy, request: "Request", name=None
+    ):
+        """cache the response sent for the request, the responses that set
+        cookies aren't cached."""
+        status = request.response_status
+        if status not in policy.statuses:
+            return
+        headers: Tuple[Tuple[str, Any], ...] = ()
+        if request._response_headers:
+            if "Set-Cookie" in request._response_headers or not cacheable(
+                request._response_headers.get("Cache-Control")
+            ):
+                return
+            headers = tuple(request._response_headers.items())
+        body = request.response_data
+        if body is None:
+            body = b""
+        elif type(body) is not bytes:
+            # the buffers may be reused after sending them
+            body = bytes(body)
+        size = len(body)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires = time.monotonic() + policy.ttl
+        self._entries[key] = (
+            expires,
+            status,
+            headers,
+            body,
+            size,
+            name,
+            policy.tags,
+            {},
+        )
+        self.size += size
+        self._names.setdefault(name, set()).add(key)
+        for tag in policy.tags:
+            self._tags.setdefault(tag, set()).add(key)
+        self._evict()
+
+    def _evict(self):
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: tuple):
+        _, _, _, _, size, name, tags, variants = self._entries.pop(key)
+        self.size -= size
+        for compressed in variants.values():
+            self.size -= len(compressed)
+        self._names[name].discard(key)
+        for tag in tags:
+            self._tags[tag].discard(key)
+
+    def invalidate(self, name=None, tag: Optional[str] = None) -> int:
+        """remove the cached responses of the route name or the tag, or all
+        the responses if none of them is passed. Returns the removed count.
+        """
+        if name is None and tag is None:
+            count = len(self._entries)
+            self.clear()
+            return count
+        keys = set()
+        if name is not None:
+            keys.update(self._names.get(name, ()))
+        if tag is not None:
+            keys.update(self._tags.get(tag, ()))
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self):
+        self._entries.clear()
+        self._names.clear()
+        self._tags.clear()
+        self.size = 0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "routes": {
+                name: {"hits": hits, "misses": misses}
+                for name, (hits, misses) in self.route_counters.items()
+            },
+        }
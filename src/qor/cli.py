@@ -180,5 +180,111 @@ def routes(app):
             o.stop()
 
 
+@qor.command(
+    name="devserver",
+    help=(
+        "serve the `Qor` app by the pure python `qor.devserver`, without the"
+        " `kore` server. `qor devserver <PATH>`, the path defaults like"
+        " `qor run`."
+    ),
+)
+@click.argument("app", default=None, required=False)
+@click.option("-h", "--host", default=None, help="the ip to bind to.")
+@click.option("-p", "--port", default=None, help="the port to bind to.")
+def devserver(app, host, port):
+    from qor.devserver import run as run_devserver
+
+    app = app or find_app()
+    if not os.path.exists(app):
+        click.secho(f"app not found, {app}", err=True, fg="red")
+        return
+    run_devserver(app, host=host, port=port)
+
+
+@qor.command(
+    name="bench",
+    help=(
+        "load test the `Qor` app & print the throughput & the latency"
+        " percentiles of each route. The app is served by `qor devserver`,"
+        " or pass `--url` of a running server. `qor bench <PATH> -r index`,"
+        " the path defaults like `qor run`."
+    ),
+)
+@click.argument("app", default=None, required=False)
+@click.option(
+    "-r",
+    "--route",
+    "routes",
+    multiple=True,
+    help=(
+        "the route name or path to request, repeat it for more routes."
+        " Defaults to all of the static GET routes."
+    ),
+)
+@click.option("-c", "--concurrency", default=16, help="the connections.")
+@click.option("-d", "--duration", default=10.0, help="the seconds to run.")
+@click.option(
+    "-w", "--warmup", default=1.0, help="the seconds to run before measuring."
+)
+@click.option("-u", "--url", default=None, help="the url of a running server.")
+@click.option("--replay", default=None, help="a request log file to replay.")
+@click.option("-o", "--output", default=None, help="write the results JSON.")
+def bench(app, routes, concurrency, duration, warmup, url, replay, output):
+    import asyncio
+    import json
+    from urllib.parse import urlsplit
+
+    from qor.bench import (
+        app_requests,
+        format_results,
+        run_load,
+        start_devserver,
+    )
+    from qor.devserver import DevKore, load_app
+
+    app_path = app or find_app()
+    app = None
+    if os.path.exists(app_path):
+        # the app routes name the requests, the app may `import kore`
+        DevKore().install()
+        app = load_app(app_path)
+        app.router.build_routes()
+    elif not url:
+        click.secho(f"app not found, {app_path}", err=True, fg="red")
+        return
+
+    if url:
+        parts = urlsplit(url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        host = "127.0.0.1"
+    try:
+        requests = app_requests(app, routes, replay, host=host)
+    except Exception as e:
+        click.secho(str(e), err=True, fg="red")
+        return
+
+    process = None
+    if not url:
+        process, port = start_devserver(app_path, host)
+    try:
+        click.secho(
+            f"{len(requests)} requests, {concurrency} connections to"
+            f" {host}:{port} for {duration}s",
+            fg="blue",
+        )
+        results = asyncio.run(
+            run_load(host, port, requests, concurrency, duration, warmup)
+        )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    click.echo(format_results(results))
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
 if __name__ == "__main__":
     qor()
@@ -0,0 +1,265 @@
+import dataclasses
+import datetime
+import decimal
+import json
+import uuid
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Type,
+    Union,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+def _dataclass_dict(value):
+    # not `dataclasses.asdict`, it deep copies the values, the nested values
+    # are converted by the codec itself.
+    return {
+        field.name: getattr(value, field.name)
+        for field in dataclasses.fields(value)
+    }
+
+
+# type: function that converts its values to JSON native values, for the types
+# that the JSON backends can't encode.
+default_converters: Dict[type, Callable[[Any], Any]] = {
+    datetime.datetime: _isoformat,
+    datetime.date: _isoformat,
+    datetime.time: _isoformat,
+    decimal.Decimal: str,
+    uuid.UUID: str,
+    set: list,
+    frozenset: list,
+}
+
+
+class JSONCodec:
+    """JSON codec that uses the stdlib `json`, the values of the
+    `converters` types (& dataclasses) are converted to JSON native values.
+
+    Example
+
+    >> codec = JSONCodec()
+    >> codec.register_type(Money, lambda money: money.amount)
+    >> codec.dumps_bytes({"total": Money(5)})
+    b'{"total": 5}'
+    """
+
+    name = "json"
+
+    def __init__(self, converters: Optional[Dict[type, Callable]] = None):
+        self.converters = dict(default_converters)
+        if converters:
+            self.converters.update(converters)
+        # type: converter, resolved once per type
+        self._type_converters: Dict[type, Callable[[Any], Any]] = {}
+        # `json.dumps` creates new encoder on each call if it has `default`
+        self._encode = json.JSONEncoder(default=self.default).encode
+
+    def register_type(self, value_type: type, converter: Callable[[Any], Any]):
+        """convert the values of this type & its subclasses by `converter`"""
+        self.converters[value_type] = converter
+        self._type_converters = {}
+
+    def resolve(self, value_type: type) -> Optional[Callable[[Any], Any]]:
+        converter = self._type_converters.get(value_type)
+        if converter is not None:
+            return converter
+        for base in value_type.__mro__:
+            if base in self.converters:
+                converter = self.converters[base]
+                break
+        else:
+            if dataclasses.is_dataclass(value_type):
+                converter = _dataclass_dict
+            else:
+                return None
+        self._type_converters[value_type] = converter
+        return converter
+
+    def default(self, value) -> Any:
+        """convert the value that the backend can't encode"""
+        converter = self.resolve(type(value))
+        if converter is None:
+            raise TypeError(
+                f"Object of type {type(value).__name__} is not JSON"
+                " serializable"
+            )
+        return converter(value)
+
+    def dumps(self, value) -> str:
+        return self._encode(value)
+
+    def dumps_bytes(self, value) -> bytes:
+        return self.dumps(value).encode()
+
+    def loads(self, data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name}>"
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec that uses `orjson`, it encodes to bytes directly. orjson
+    encodes the datetimes, UUIDs & dataclasses natively. The values that it
+    can't encode, like the big integers, are encoded by the stdlib `json`.
+
+    N.B: the output is compact, without spaces after the separators.
+    """
+
+    name = "orjson"
+    options = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def __init__(self, converters: Optional[Dict[type, Callable]] = None):
+        if orjson is None:
+            raise ImportError(
+                "orjson is not installed, install it or use the `json` codec"
+            )
+        super().__init__(converters)
+
+    def dumps_bytes(self, value) -> bytes:
+        try:
+            return orjson.dumps(
+                value, default=self.default, option=self.options
+            )
+        except TypeError:
+            return self._encode(value).encode()
+
+    def dumps(self, value) -> str:
+        return self.dumps_bytes(value).decode()
+
+    def loads(self, data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        return orjson.loads(data)
+
+
+# name: codec class, for the `json_codec` config
+json_codecs: Dict[str, Type[JSONCodec]] = {
+    "json": JSONCodec,
+    "orjson": OrjsonCodec,
+}
+
+
+def get_json_codec(name: str = "auto") -> JSONCodec:
+    """return new codec by its name in `json_codecs`, `auto` returns the
+    orjson codec if orjson is installed, else the stdlib codec."""
+    if name == "auto":
+        name = "orjson" if orjson is not None else "json"
+    codec_class = json_codecs.get(name)
+    if codec_class is None:
+        raise Exception(
+            f"unknown json codec: `{name}`, the available codecs are:"
+            f" auto, {', '.join(json_codecs.keys())}"
+        )
+    return codec_class()
+
+
+_default_codec: Optional[JSONCodec] = None
+
+
+def default_json_codec() -> JSONCodec:
+    """the codec used outside the apps, by `to_bytes` & `to_string`"""
+    global _default_codec
+    if _default_codec is None:
+        _default_codec = get_json_codec()
+    return _default_codec
+
+
+class JSONStream:
+    """encode iterable of records incrementally as a JSON array, So the whole
+    list & its encoded string are never built in memory. The records are
+    encoded into a reusable buffer that is emitted once it has `chunk_size`
+    bytes.
+
+    The handlers can return it, it is encoded in one buffer for `kore`. The
+    WSGI apps can return it as their response iterable, to stream the chunks.
+
+    Example
+
+    >> @app.route("/export")
+    >> def export(request):
+    >>     return JSONStream(row._asdict() for row in db.iter_rows())
+    """
+
+    content_type = "application/json"
+    # written before the records, between them, after each one & at the end
+    start = b"["
+    separator = b","
+    terminator = b""
+    end = b"]"
+
+    def __init__(
+        self,
+        records: Iterable,
+        codec: Optional[JSONCodec] = None,
+        chunk_size: int = 64 * 1024,
+    ) -> None:
+        self.records = records
+        self.codec = codec
+        self.chunk_size = chunk_size
+
+    def chunks(self, codec: Optional[JSONCodec] = None) -> Iterator[bytes]:
+        """yield the encoded records in chunks of about `chunk_size` bytes"""
+        dumps = (codec or self.codec or default_json_codec()).dumps_bytes
+        chunk_size = self.chunk_size
+        separator, terminator = self.separator, self.terminator
+        buffer = bytearray(self.start)
+        first = True
+        for record in self.records:
+            if first:
+                first = False
+            else:
+                buffer += separator
+            buffer += dumps(record)
+            buffer += terminator
+            if len(buffer) >= chunk_size:
+                yield bytes(buffer)
+                del buffer[:]
+        buffer += self.end
+        if buffer:
+            yield bytes(buffer)
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self.chunks()
+
+    def encode(self, codec: Optional[JSONCodec] = None) -> bytearray:
+        """encode all the records in one buffer, the buffer is passed to the
+        response without copying."""
+        dumps = (codec or self.codec or default_json_codec()).dumps_bytes
+        separator, terminator = self.separator, self.terminator
+        buffer = bytearray(self.start)
+        first = True
+        for record in self.records:
+            if first:
+                first = False
+            else:
+                buffer += separator
+            buffer += dumps(record)
+            buffer += terminator
+        buffer += self.end
+        return buffer
+
+
+class NDJSONStream(JSONStream):
+    """encode iterable of records incrementally as newline delimited JSON"""
+
+    content_type = "application/x-ndjson"
+    start = b""
+    separator = b""
+    terminator = b"\n"
+    end = b""
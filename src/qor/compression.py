@@ -0,0 +1,213 @@
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from qor.conditional import coded_etag
+
+# the zlib wbits of the content codings
+ENCODINGS_WBITS = {
+    "gzip": 16 + zlib.MAX_WBITS,
+    "deflate": zlib.MAX_WBITS,
+}
+
+# the content types that are already compressed, matched by prefix
+COMPRESSED_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-bzip2",
+    "application/x-xz",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/zstd",
+    "application/pdf",
+    "application/octet-stream",
+)
+# the compressed types prefixes that have uncompressed types
+UNCOMPRESSED_TYPES = ("image/svg+xml",)
+
+
+class Compressor:
+    """the response compression stage, it negotiates the encoding by the
+    request `Accept-Encoding` & compresses the bodies with zlib.
+
+    The bodies smaller than `min_size` & the already compressed content types
+    aren't compressed. The compressed variants of the bodies that have a
+    content hash (the automatic `ETag`) are kept in LRU cache of
+    `cache_max_bytes`, So the same body is compressed once.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 1024,
+        level: int = 6,
+        encodings: Iterable[str] = ("gzip", "deflate"),
+        cache_max_bytes: int = 16 * 1024 * 1024,
+    ) -> None:
+        self.min_size = min_size
+        self.level = level
+        # in the preference order
+        self.encodings = tuple(e for e in encodings if e in ENCODINGS_WBITS)
+        self.cache_max_bytes = cache_max_bytes
+        self.cache_size = 0
+        # (content hash, encoding): compressed body
+        self._variants: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        # Accept-Encoding header: negotiated encoding
+        self._negotiated: Dict[Optional[str], Optional[str]] = {}
+        # content type: compressible
+        self._compressible: Dict[Optional[str], bool] = {}
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Optional[str]:
+        """the preferred encoding that the client accepts, or None"""
+        try:
+            return self._negotiated[accept_encoding]
+        except KeyError:
+            pass
+        encoding = self._negotiate(accept_encoding)
+        if len(self._negotiated) >= 256:
+            self._negotiated.clear()
+        self._negotiated[accept_encoding] = encoding
+        return encoding
+
+    def _negotiate(self, accept_encoding: Optional[str]) -> Optional[str]:
+        if not accept_encoding:
+            return None
+        qualities = {}
+        for item in accept_encoding.split(","):
+            name, _, params = item.partition(";")
+            quality = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            qualities[name.strip().lower()] = quality
+        best, best_quality = None, 0.0
+        for encoding in self.encodings:
+            quality = qualities.get(encoding, qualities.get("*", 0.0))
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def compressible(self, content_type: Optional[str]) -> bool:
+        """False for the already compressed content types"""
+        try:
+            return self._compressible[content_type]
+        except KeyError:
+            pass
+        mimetype = (content_type or "").split(";")[0].strip().lower()
+        compressible = mimetype.startswith(UNCOMPRESSED_TYPES) or (
+            not mimetype.startswith(COMPRESSED_TYPES)
+        )
+        if len(self._compressible) >= 256:
+            self._compressible.clear()
+        self._compressible[content_type] = compressible
+        return compressible
+
+    def compress(self, data, encoding: str) -> bytes:
+        compressor = zlib.compressobj(
+            self.level, zlib.DEFLATED, ENCODINGS_WBITS[encoding]
+        )
+        return compressor.compress(data) + compressor.flush()
+
+    def compress_cached(self, data, encoding: str, content_hash: str) -> bytes:
+        """compress the body once per content hash & encoding"""
+        key = (content_hash, encoding)
+        compressed = self._variants.get(key)
+        if compressed is not None:
+            self._variants.move_to_end(key)
+            return compressed
+        compressed = self.compress(data, encoding)
+        size = len(compressed)
+        if size <= self.cache_max_bytes:
+            self._variants[key] = compressed
+            self.cache_size += size
+            while self.cache_size > self.cache_max_bytes:
+                _, evicted = self._variants.popitem(last=False)
+                self.cache_size -= len(evicted)
+        return compressed
+
+    def encoding_for(
+        self,
+        accept_encoding: Optional[str],
+        content_type: Optional[str],
+        size: Optional[int],
+    ) -> Tuple[bool, Optional[str]]:
+        """return (whether the response varies by `Accept-Encoding`, the
+        encoding to compress it with). The `size` is None if it's unknown,
+        for the 304 responses of the handlers."""
+        if (
+            size is not None and (not size or size < self.min_size)
+        ) or not self.compressible(content_type):
+            return False, None
+        return True, self.negotiate(accept_encoding)
+
+    def response_encoding(
+        self,
+        kore_request,
+        content_type: Optional[str],
+        size: Optional[int],
+        etag: Optional[str] = None,
+    ) -> Optional[str]:
+        """the encoding of the response body, it sets the `Vary` & the coded
+        `ETag` headers, So the 304 responses get the same headers as the
+        responses of the body."""
+        varies, encoding = self.encoding_for(
+            kore_request.request_header("Accept-Encoding"), content_type, size
+        )
+        if varies:
+            kore_request.response_header("Vary", "Accept-Encoding")
+        if etag is not None:
+            kore_request.response_header("ETag", coded_etag(etag, encoding))
+        return encoding
+
+    def compress_response(
+        self,
+        kore_request,
+        data,
+        content_type: Optional[str],
+        content_hash: Optional[str] = None,
+        variants: Optional[dict] = None,
+        etag: Optional[str] = None,
+    ):
+        """compress the response body if the client accepts it & set the
+        `Content-Encoding` & `Vary` headers on the `kore` request.
+
+        The compressed body is cached by the `content_hash` or in the
+        `variants` dict of the caller, if any of them is passed. The `etag`
+        is set with the suffix of the encoding, see `coded_etag`.
+        """
+        encoding = self.response_encoding(
+            kore_request, content_type, len(data), etag
+        )
+        if encoding is None:
+            return data
+        if variants is not None:
+            compressed = variants.get(encoding)
+            if compressed is None:
+                compressed = variants[encoding] = self.compress(data, encoding)
+        elif content_hash is not None:
+            compressed = self.compress_cached(data, encoding, content_hash)
+        else:
+            compressed = self.compress(data, encoding)
+        kore_request.response_header("Content-Encoding", encoding)
+        return compressed
+
+
+def compressor_from_config(config) -> Optional[Compressor]:
+    """the compressor of the `compression` configs, None if it is disabled"""
+    if not config.get("compression", False):
+        return None
+    return Compressor(
+        min_size=config.get("compression_min_size", 1024),
+        level=config.get("compression_level", 6),
+        encodings=config.get("compression_encodings", ("gzip", "deflate")),
+        cache_max_bytes=config.get(
+            "compression_cache_max_bytes", 16 * 1024 * 1024
+        ),
+    )
@@ -0,0 +1,95 @@
+import datetime
+import hashlib
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Union
+
+# the content codings that suffix the strong ETags of the encoded bodies
+ETAG_CODINGS = ("gzip", "deflate", "br")
+
+
+def make_etag(data) -> str:
+    """the strong ETag of the body, a truncated sha256 digest of it. sha256 is
+    hardware accelerated on the most CPUs, faster than md5 & blake2b."""
+    return f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+
+
+def quote_etag(version, weak: bool = False) -> str:
+    """the ETag of a version key, the quoted ETags are kept as they are"""
+    value = str(version)
+    if value.startswith('"') or value.startswith('W/"'):
+        return value
+    return f'W/"{value}"' if weak else f'"{value}"'
+
+
+def coded_etag(etag: str, encoding: Optional[str]) -> str:
+    """the ETag of the body encoded by the content coding, the strong ETags
+    get the coding suffix, as each representation needs its own strong
+    validator (RFC 9110 8.8.3). The weak ETags are kept as they are.
+
+    Example
+    >> coded_etag('"5d41"', "gzip")
+    '"5d41-gzip"'
+    """
+    if encoding is None or etag.startswith("W/") or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _opaque_tag(etag: str) -> str:
+    """the ETag without the weak prefix & the content coding suffix"""
+    if etag.startswith("W/"):
+        etag = etag[2:]
+    for coding in ETAG_CODINGS:
+        if etag.endswith(f'-{coding}"'):
+            return f'{etag[: -len(coding) - 2]}"'
+    return etag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """the weak comparison of the `If-None-Match` header with the ETag, the
+    ETags of the encoded bodies match the ETag of the plain body."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    etag = _opaque_tag(etag)
+    for candidate in if_none_match.split(","):
+        if _opaque_tag(candidate.strip()) == etag:
+            return True
+    return False
+
+
+def http_date(value: Union[datetime.datetime, float, int]) -> str:
+    """format datetime or timestamp as HTTP date, the naive datetimes are
+    considered UTC."""
+    if not isinstance(value, datetime.datetime):
+        value = datetime.datetime.fromtimestamp(value, datetime.timezone.utc)
+    elif value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return format_datetime(
+        value.astimezone(datetime.timezone.utc).replace(microsecond=0),
+        usegmt=True,
+    )
+
+
+def modified_since(
+    if_modified_since: Optional[str],
+    last_modified: Union[datetime.datetime, float, int],
+) -> bool:
+    """return False if the resource is not modified after the
+    `If-Modified-Since` date, the invalid dates are ignored."""
+    if not if_modified_since:
+        return True
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return True
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=datetime.timezone.utc)
+    if not isinstance(last_modified, datetime.datetime):
+        last_modified = datetime.datetime.fromtimestamp(
+            last_modified, datetime.timezone.utc
+        )
+    elif last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=datetime.timezone.utc)
+    return last_modified.replace(microsecond=0) > since
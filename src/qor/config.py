@@ -108,6 +108,54 @@ class BaseConfig(dict):
         # by default, in development mode, qor will auto register routes, this option will prevent this
         # default is `false`
         "disable_auto_run": False,
+        # count the hits of each route & store them in `route_profile_path`,
+        # the stored counts are used in the next startup to register the hot
+        # routes first.
+        "route_profile": False,
+        # the file in which the route hits are stored, relative to the `root_path`
+        "route_profile_path": "route_hits.json",
+        # the interval in milliseconds at which each worker adds its counts
+        # to the file, 0 writes them only on exit
+        "route_profile_flush": 60000,
+        # the size of the LRU cache of the reversed urls (`app.reverse`),
+        # 0 disables it
+        "reverse_cache_size": 0,
+        # the max number of the `Request` objects that are reset & reused by
+        # each worker after sending their responses, 0 disables the pool
+        "request_pool_size": 0,
+        # the JSON codec of the app, one of `qor.codecs.json_codecs` names, or
+        # `auto` to use `orjson` if it is installed
+        "json_codec": "auto",
+        # the max size of the response bodies cached by each worker for the
+        # routes that have `cache`, the least recently used are evicted
+        "response_cache_max_bytes": 64 * 1024 * 1024,
+        # set the `ETag` of the GET & HEAD responses from their body hash, So
+        # the `If-None-Match` requests get 304 without a body
+        "etag": False,
+        # compress the responses with gzip or deflate, negotiated by the
+        # request `Accept-Encoding`, see `qor.compression.Compressor`
+        "compression": False,
+        # the bodies smaller than this size (in bytes) aren't compressed
+        "compression_min_size": 1024,
+        # the zlib compression level, 1 (fastest) to 9 (smallest)
+        "compression_level": 6,
+        # the supported encodings in the preference order
+        "compression_encodings": ["gzip", "deflate"],
+        # the max size of the cached compressed variants of the hashed bodies
+        "compression_cache_max_bytes": 16 * 1024 * 1024,
+        # the processes of the `cpu` offload pool of each worker, see
+        # `Qor.offload`, 0 uses the CPUs count
+        "offload_cpu_workers": 1,
+        # the threads of the `io` offload pool of each worker
+        "offload_io_workers": 8,
+        # the milliseconds the offloaded requests are suspended before the
+        # first check of their results, doubled after each check up to
+        # `offload_max_poll_interval`
+        "offload_poll_interval": 1,
+        "offload_max_poll_interval": 32,
+        # wait for the pending offloaded calls when the worker stops, else
+        # they are cancelled
+        "offload_shutdown_wait": True,
     }
 
     def __init__(self, **kwargs) -> None:
@@ -186,6 +234,10 @@ class BaseConfig(dict):
             self["pidfile"] = os.path.join(root_path, self["pidfile"])
         if self.get("root_path", None) and dict.get(self, "logfile", None):
             self["logfile"] = os.path.join(root_path, self["logfile"])
+        if self.get("root_path", None) and self.get("route_profile_path", None):
+            self["route_profile_path"] = os.path.join(
+                root_path, self["route_profile_path"]
+            )
         if self.get("root_path", None) and self.get("dev_log_dir", None):
             self["dev_log_dir"] = os.path.join(
                 root_path, self.get("dev_log_dir", None)
@@ -32,6 +32,16 @@ METHOD_CODES = {
     64: "options",
 }
 
+METHOD_NAMES = {
+    "get": 1,
+    "post": 2,
+    "put": 4,
+    "patch": 128,
+    "head": 32,
+    "delete": 16,
+    "options": 64,
+}
+
 ALLOWED_METHODS = (
     "head",  # when used, fatal error is raises "duplicate path", may be it is considered internally as get
     # When route accessed from it, without defining `head` in methods, it returns empty response. The route itself not called
@@ -0,0 +1,821 @@
+"""a pure python HTTP/1.1 server that stands in for the `kore` module, it
+runs the `Qor` apps without the `kore` server, for the development & as the
+baseline of the benchmarks.
+
+It provides the subset of the `kore` module & request API used by `qor`:
+`server`, `domain` & `domain.route`, `config`, `log`, `timer`, `tracer`,
+`task_create`, `task_kill`, `suspend`, `gather` & the requests `response`,
+`response_header`, `request_header`, `headers`, `body_read`, `argument`,
+`populate_*`, `cookie` & `file_lookup`.
+
+The connections are kept alive & their buffers are reused, the requests of
+each connection are handled in order & the coroutines returned by the async
+handlers run on the `asyncio` event loop.
+
+N.B:.
+- the request bodies are kept in memory, `body_path` is always `None`.
+- the chunked request bodies & the websockets aren't supported.
+- `kore.worker()` is always 1, the server runs in a single process.
+
+Example
+>> from qor.devserver import run
+>> run(app, port="8000")
+"""
+
+import asyncio
+import fnmatch
+import importlib.util
+import inspect
+import os
+import re
+import sys
+import traceback
+import types
+from email.parser import BytesParser
+from email.policy import HTTP
+from http import HTTPStatus
+from itertools import count
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from qor import constants
+
+# the bodies larger than this size are written without joining them to the
+# response head
+_JOIN_MAX = 64 * 1024
+
+
+def _status_line(status: int) -> bytes:
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = ""
+    return f"HTTP/1.1 {status} {reason}\r\n".encode("latin-1")
+
+
+_STATUS_LINES = {
+    status.value: _status_line(status.value) for status in HTTPStatus
+}
+
+
+class DevTimer:
+    """the handle returned by `kore.timer`"""
+
+    __slots__ = ("callback", "interval", "oneshot", "handle", "closed")
+
+    def __init__(self, callback: Callable, interval: int, oneshot: bool):
+        self.callback = callback
+        self.interval = interval / 1000
+        self.oneshot = oneshot
+        self.handle = None
+        self.closed = False
+
+    def start(self, loop):
+        self.handle = loop.call_later(self.interval, self._fire, loop)
+
+    def _fire(self, loop):
+        if self.closed:
+            return
+        if not self.oneshot:
+            self.start(loop)
+        else:
+            self.closed = True
+        self.callback(self)
+
+    def close(self):
+        self.closed = True
+        if self.handle is not None:
+            self.handle.cancel()
+
+
+class DevQueue:
+    """the object returned by `kore.queue`, `pop` suspends the coroutine
+    till an object is pushed by another coroutine of the worker."""
+
+    __slots__ = ("_queue",)
+
+    def __init__(self) -> None:
+        self._queue = asyncio.Queue()
+
+    def push(self, obj):
+        self._queue.put_nowait(obj)
+
+    async def pop(self):
+        return await self._queue.get()
+
+    def popnow(self):
+        try:
+            return self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+
+
+class DevConnection:
+    """stand-in for `kore.connection`"""
+
+    __slots__ = ("addr", "transport")
+
+    def __init__(self, addr: str, transport) -> None:
+        self.addr = addr
+        self.transport = transport
+
+    def disconnect(self):
+        self.transport.close()
+
+    def websocket_send(self, op: int, data: bytes):
+        raise NotImplementedError("the devserver doesn't support websockets")
+
+
+class DevFile:
+    """stand-in for `kore.http_file`, the uploaded multipart files"""
+
+    __slots__ = ("name", "filename", "data", "offset")
+
+    def __init__(self, name: str, filename: str, data: bytes) -> None:
+        self.name = name
+        self.filename = filename
+        self.data = data
+        self.offset = 0
+
+    def read(self, length: int = 1024) -> Tuple[int, bytes]:
+        chunk = self.data[self.offset : self.offset + length]
+        self.offset += len(chunk)
+        return len(chunk), chunk
+
+
+class DevRoute:
+    """a route registered by `DevDomain.route`"""
+
+    __slots__ = ("callback", "methods", "params", "auth")
+
+    def __init__(self, callback, methods, params, auth) -> None:
+        self.callback = callback
+        self.methods = 0
+        for method in methods:
+            self.methods |= constants.METHOD_NAMES[method.lower()]
+        # `kore` answers the HEAD requests by the GET routes
+        if self.methods & constants.HTTP_METHOD_GET:
+            self.methods |= constants.HTTP_METHOD_HEAD
+        # method code -> {name: validator}
+        self.params: Dict[int, Dict[str, Callable]] = {}
+        for method, validators in params.items():
+            self.params[constants.METHOD_NAMES[method.lower()]] = {
+                name: _validator(validator)
+                for name, validator in validators.items()
+            }
+        if constants.HTTP_METHOD_GET in self.params:
+            self.params.setdefault(
+                constants.HTTP_METHOD_HEAD,
+                self.params[constants.HTTP_METHOD_GET],
+            )
+        self.auth = auth
+
+
+def _validator(validator) -> Callable[[str], bool]:
+    if callable(validator):
+        return validator
+    return re.compile(validator).search
+
+
+class DevDomain:
+    """the domain handle returned by `kore.domain`, the static paths are
+    matched exactly & the regex ones (starting with `^`) in the order of
+    their registration, their groups are passed to the handler.
+    """
+
+    def __init__(self, name: str, attach: str) -> None:
+        self.name = name
+        self.attach = attach
+        self.static: Dict[str, DevRoute] = {}
+        self.dynamic: List[Tuple[re.Pattern, DevRoute]] = []
+
+    def route(
+        self,
+        url: str,
+        callback: Callable,
+        methods: list = ["get"],
+        key: str = None,
+        auth: dict = None,
+        **params,
+    ):
+        route = DevRoute(callback, methods, params, auth)
+        if url.startswith("^"):
+            self.dynamic.append((re.compile(url), route))
+        elif url in self.static:
+            raise RuntimeError(f"duplicate route {url}")
+        else:
+            self.static[url] = route
+
+    def filemaps(self, maps: dict):
+        raise NotImplementedError("the devserver doesn't support filemaps")
+
+    def match(self, path: str) -> Tuple[Optional[DevRoute], tuple]:
+        route = self.static.get(path)
+        if route is not None:
+            return route, ()
+        for regex, route in self.dynamic:
+            match = regex.match(path)
+            if match is not None:
+                return route, match.groups()
+        return None, ()
+
+
+class DevRequest:
+    """stand-in for the `kore` request object"""
+
+    __slots__ = (
+        "path",
+        "query",
+        "method",
+        "host",
+        "agent",
+        "body",
+        "body_path",
+        "connection",
+        "version",
+        "_headers",
+        "_params",
+        "_arguments",
+        "_cookies",
+        "_files",
+        "_body_offset",
+        "status",
+        "response_headers",
+        "response_body",
+        "_request",
+    )
+
+    def __init__(
+        self,
+        method: int,
+        target: str,
+        version: str,
+        headers: Dict[str, str],
+        connection: DevConnection,
+    ) -> None:
+        self.path, _, self.query = target.partition("?")
+        self.method = method
+        self.version = version
+        self._headers = headers
+        self.host = headers.get("host", "")
+        self.agent = headers.get("user-agent", "")
+        self.body = b""
+        self.body_path = None
+        self.connection = connection
+        self._params: Dict[str, Callable] = {}
+        self._arguments: Dict[str, str] = {}
+        self._cookies: Optional[Dict[str, str]] = None
+        self._files: Dict[str, DevFile] = {}
+        self._body_offset = 0
+        self.status = 0
+        self.response_headers: List[Tuple[str, str]] = []
+        self.response_body = b""
+        # set by the `Qor` handlers to the request wrapper
+        self._request = None
+
+    def headers(self) -> Dict[str, str]:
+        return dict(self._headers)
+
+    def request_header(self, name: str) -> Optional[str]:
+        return self._headers.get(name.lower())
+
+    def response_header(self, name: str, value: str) -> None:
+        self.response_headers.append((name, value))
+
+    def response(self, status: int, body: bytes) -> None:
+        self.status = status
+        self.response_body = body
+
+    def argument(self, name: str) -> Optional[str]:
+        return self._arguments.get(name)
+
+    def cookie(self, name: str) -> Optional[str]:
+        if self._cookies is None:
+            return None
+        return self._cookies.get(name)
+
+    def file_lookup(self, name: str) -> Optional[DevFile]:
+        return self._files.get(name)
+
+    def body_read(self, length: int = 1024) -> Tuple[int, bytes]:
+        if length > 1024:
+            raise RuntimeError("can't read more than 1024 bytes")
+        chunk = self.body[self._body_offset : self._body_offset + length]
+        self._body_offset += len(chunk)
+        return len(chunk), chunk
+
+    def _validate(self, name: str, value: str):
+        # like `kore`, only the parameters validated by the route `params`
+        # of the request method are available
+        validator = self._params.get(name)
+        if validator is not None and validator(value):
+            self._arguments[name] = value
+
+    def populate_get(self) -> None:
+        for name, value in parse_qsl(self.query, keep_blank_values=True):
+            self._validate(name, value)
+
+    def populate_post(self) -> None:
+        body = self.body.decode("utf-8", "replace")
+        for name, value in parse_qsl(body, keep_blank_values=True):
+            self._validate(name, value)
+
+    def populate_multi(self) -> None:
+        content_type = self._headers.get("content-type", "")
+        message = BytesParser(policy=HTTP).parsebytes(
+            b"content-type: "
+            + content_type.encode("latin-1")
+            + b"\r\n\r\n"
+            + self.body
+        )
+        if not message.is_multipart():
+            return
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if not name:
+                continue
+            data = part.get_payload(decode=True) or b""
+            filename = part.get_filename()
+            if filename is not None:
+                self._files[name] = DevFile(name, filename, data)
+            else:
+                self._validate(name, data.decode("utf-8", "replace"))
+
+    def populate_cookies(self) -> None:
+        self._cookies = {}
+        for cookie in self._headers.get("cookie", "").split(";"):
+            name, _, value = cookie.strip().partition("=")
+            if name:
+                self._cookies[name] = value
+
+    def websocket_handshake(self, *args):
+        raise NotImplementedError("the devserver doesn't support websockets")
+
+
+class HTTPProtocol(asyncio.Protocol):
+    """one HTTP/1.1 connection, the incoming bytes are parsed from one
+    `bytearray` that is reused for all of the connection requests."""
+
+    def __init__(self, kore: "DevKore", domains: List[DevDomain]) -> None:
+        self.kore = kore
+        self.domains = domains
+        self.buffer = bytearray()
+        self.transport = None
+        self.connection = None
+        # the request whose headers are parsed & is waiting for its body
+        self.pending: Optional[Tuple[DevRequest, int]] = None
+        # handling an async request, the next ones wait in the buffer
+        self.busy = False
+        self.closing = False
+        self.last_active = 0.0
+
+    def connection_made(self, transport):
+        self.transport = transport
+        peer = transport.get_extra_info("peername")
+        addr = peer[0] if isinstance(peer, tuple) else str(peer or "")
+        self.connection = DevConnection(addr, transport)
+        self.last_active = self.kore.loop.time()
+        self.kore.connections.add(self)
+
+    def connection_lost(self, exc):
+        self.closing = True
+        self.kore.connections.discard(self)
+
+    def data_received(self, data: bytes):
+        self.buffer += data
+        self.last_active = self.kore.loop.time()
+        if not self.busy:
+            self.process()
+
+    def process(self):
+        buffer = self.buffer
+        kore = self.kore
+        while not self.busy and not self.closing:
+            if self.pending is None:
+                end = buffer.find(b"\r\n\r\n")
+                if end < 0:
+                    if len(buffer) > kore.header_max:
+                        self.error(431)
+                    return
+                if end > kore.header_max:
+                    self.error(431)
+                    return
+                request = self.parse_head(buffer, end)
+                del buffer[: end + 4]
+                if request is None:
+                    return
+                length = request._headers.get("content-length", "0")
+                if not length.isdigit():
+                    self.error(400)
+                    return
+                length = int(length)
+                if length > kore.body_max:
+                    self.error(413)
+                    return
+                if length and request._headers.get("expect") == "100-continue":
+                    self.transport.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+                self.pending = (request, length)
+            request, length = self.pending
+            if len(buffer) < length:
+                return
+            if length:
+                request.body = bytes(buffer[:length])
+                del buffer[:length]
+            self.pending = None
+            self.handle(request)
+
+    def parse_head(self, buffer: bytearray, end: int) -> Optional[DevRequest]:
+        lines = buffer[:end].decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+            headers = {}
+            for line in lines[1:]:
+                name, value = line.split(":", 1)
+                name = name.strip().lower()
+                value = value.strip()
+                if name in headers:
+                    value = f"{headers[name]}, {value}"
+                headers[name] = value
+        except ValueError:
+            self.error(400)
+            return None
+        method_code = constants.METHOD_NAMES.get(method.lower())
+        if method_code is None:
+            self.error(405)
+            return None
+        if "transfer-encoding" in headers:
+            self.error(411)
+            return None
+        return DevRequest(
+            method_code, target, version, headers, self.connection
+        )
+
+    def handle(self, request: DevRequest):
+        rv = self.kore.dispatch(self.domains, request)
+        if inspect.iscoroutine(rv):
+            self.busy = True
+            task = self.kore.loop.create_task(rv)
+            task.add_done_callback(lambda task: self.handled(request, task))
+        else:
+            self.respond(request)
+
+    def handled(self, request: DevRequest, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            error = task.exception()
+            self.kore.trace(type(error), error, error.__traceback__)
+            request.response(500, b"")
+        self.respond(request)
+        self.busy = False
+        if self.buffer:
+            self.process()
+
+    def keep_alive(self, request: DevRequest) -> bool:
+        connection = request._headers.get("connection", "").lower()
+        if request.version == "HTTP/1.1":
+            return connection != "close"
+        return connection == "keep-alive"
+
+    def respond(self, request: DevRequest):
+        if self.closing:
+            return
+        status = request.status or 500
+        body = request.response_body
+        if body is None:
+            body = b""
+        keep_alive = self.keep_alive(request)
+        head = [_STATUS_LINES.get(status) or _status_line(status)]
+        for name, value in request.response_headers:
+            if name.lower() != "content-length":
+                head.append(f"{name}: {value}\r\n".encode("latin-1"))
+        head.append(self.kore.server_header)
+        head.append(b"content-length: %d\r\n" % len(body))
+        head.append(
+            b"connection: keep-alive\r\n\r\n"
+            if keep_alive
+            else b"connection: close\r\n\r\n"
+        )
+        if request.method == constants.HTTP_METHOD_HEAD or status == 304:
+            body = b""
+        if len(body) <= _JOIN_MAX:
+            head.append(body)
+            self.transport.write(b"".join(head))
+        else:
+            self.transport.write(b"".join(head))
+            self.transport.write(body)
+        if not keep_alive:
+            self.closing = True
+            self.transport.close()
+
+    def error(self, status: int):
+        self.closing = True
+        self.transport.write(
+            (_STATUS_LINES.get(status) or _status_line(status))
+            + b"content-length: 0\r\nconnection: close\r\n\r\n"
+        )
+        self.transport.close()
+
+
+class DevKore(types.ModuleType):
+    """stand-in for the `kore` module, it is set as `sys.modules["kore"]` by
+    `configure`, So the apps that `import kore` get it.
+
+    Example
+    >> kore = DevKore()
+    >> kore.configure(app)
+    >> kore.run()
+    """
+
+    def __init__(self) -> None:
+        super().__init__("kore")
+        for name in dir(constants):
+            if name.isupper():
+                setattr(self, name, getattr(constants, name))
+        self.WEBSOCKET_BROADCAST_LOCAL = 1
+        self.WEBSOCKET_BROADCAST_GLOBAL = 2
+        self.config = types.SimpleNamespace()
+        self.app = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # name -> (ip, port)
+        self.servers: Dict[str, Tuple[str, str]] = {}
+        self.domains: List[DevDomain] = []
+        # the bound (host, port) of each server, set by `start_serving`
+        self.addresses: List[Tuple[str, int]] = []
+        self.connections = set()
+        self.tasks: Dict[int, asyncio.Task] = {}
+        self._task_ids = count(1)
+        # the timers & tasks created before the event loop starts
+        self._timers: List[DevTimer] = []
+        self._coroutines: List[Tuple[int, object]] = []
+        self._tracer: Optional[Callable] = None
+        self._listeners = []
+        self._stopped: Optional[asyncio.Event] = None
+        self._shutdown = False
+        self.server_header = b"server: qor-devserver\r\n"
+
+    # the `kore` module API
+
+    def server(self, name: str, ip: str = None, port: str = None, **kwargs):
+        if kwargs.get("path"):
+            raise RuntimeError("the devserver doesn't support unix sockets")
+        self.servers[name] = (ip or "127.0.0.1", port or "8888")
+
+    def domain(self, host: str, attach: str = None, **kwargs) -> DevDomain:
+        domain = DevDomain(host, attach)
+        self.domains.append(domain)
+        return domain
+
+    def log(self, priority: int, text: str):
+        print(text, file=sys.stderr)
+
+    def timer(self, callback: Callable, after: int, flags: int = 0):
+        timer = DevTimer(callback, after, flags == constants.TIMER_ONESHOT)
+        if self.loop is None:
+            self._timers.append(timer)
+        else:
+            timer.start(self.loop)
+        return timer
+
+    def fatal(self, reason: str):
+        self.log(constants.LOG_ERR, reason)
+        self.shutdown()
+        raise SystemExit(reason)
+
+    def tracer(self, callback: Callable):
+        self._tracer = callback
+
+    def task_create(self, coroutine) -> int:
+        task_id = next(self._task_ids)
+        if self.loop is None:
+            self._coroutines.append((task_id, coroutine))
+        else:
+            self._create_task(task_id, coroutine)
+        return task_id
+
+    def task_kill(self, id: int):
+        task = self.tasks.pop(id, None)
+        if task is not None:
+            task.cancel()
+
+    async def suspend(self, milliseconds: int):
+        await asyncio.sleep(milliseconds / 1000)
+
+    def queue(self) -> DevQueue:
+        return DevQueue()
+
+    async def gather(self, *coroutines, concurrency: int = 0):
+        # like `kore`, the exceptions are returned as the results
+        if concurrency > 0:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def limited(coroutine):
+                async with semaphore:
+                    return await coroutine
+
+            coroutines = [limited(coroutine) for coroutine in coroutines]
+        return await asyncio.gather(*coroutines, return_exceptions=True)
+
+    def worker(self) -> int:
+        return 1
+
+    def setname(self, name: str):
+        pass
+
+    def coroname(self, name: str):
+        pass
+
+    def corotrace(self, enabled: bool):
+        pass
+
+    def privsep(self, *args, **kwargs):
+        pass
+
+    def wrap(self, sock):
+        raise NotImplementedError("the devserver doesn't support `kore.wrap`")
+
+    def websocket_broadcast(self, *args):
+        raise NotImplementedError("the devserver doesn't support websockets")
+
+    def shutdown(self):
+        self._shutdown = True
+        if self._stopped is not None:
+            self._stopped.set()
+
+    # the server
+
+    def install(self):
+        """set as the `kore` module, for the apps that `import kore`"""
+        sys.modules["kore"] = self
+
+    def configure(self, app, args=()):
+        """configure the app like `kore` does, by its `configure` method"""
+        self.app = app
+        self.install()
+        app.configure(list(args))
+
+    @property
+    def header_max(self) -> int:
+        return getattr(self.config, "http_header_max", 4096)
+
+    @property
+    def body_max(self) -> int:
+        return getattr(self.config, "http_body_max", 1024 * 1024)
+
+    def trace(self, etype, value, tb):
+        if self._tracer is not None:
+            self._tracer(etype, value, tb)
+        else:
+            traceback.print_exception(etype, value, tb)
+
+    def _create_task(self, task_id: int, coroutine):
+        task = self.loop.create_task(coroutine)
+        self.tasks[task_id] = task
+        task.add_done_callback(lambda task: self.tasks.pop(task_id, None))
+
+    def find_domain(self, domains: List[DevDomain], host: str):
+        host = host.rsplit(":", 1)[0] if "]" not in host else host
+        for domain in domains:
+            if domain.name == host or fnmatch.fnmatchcase(host, domain.name):
+                return domain
+        return None
+
+    def dispatch(self, domains: List[DevDomain], request: DevRequest):
+        """call the handler of the request route, it returns the coroutine
+        of the async handlers."""
+        domain = self.find_domain(domains, request.host)
+        route, args = domain.match(request.path) if domain else (None, ())
+        if route is None:
+            return request.response(404, b"")
+        if not route.methods & request.method:
+            return request.response(405, b"")
+        request._params = route.params.get(request.method, {})
+        try:
+            if route.auth is not None and not self.authenticate(
+                route.auth, request
+            ):
+                return
+            return route.callback(request, *args)
+        except Exception as e:
+            self.trace(type(e), e, e.__traceback__)
+            request.response(500, b"")
+
+    def authenticate(self, auth: dict, request: DevRequest) -> bool:
+        if auth["type"] == "cookie":
+            request.populate_cookies()
+            value = request.cookie(auth["value"])
+        else:
+            value = request.request_header(auth["value"])
+        if value is not None and auth["verify"](request, value):
+            return True
+        redirect = auth.get("redirect")
+        if redirect:
+            request.response_header("location", redirect)
+            request.response(302, b"")
+        else:
+            request.response(403, b"")
+        return False
+
+    async def start_serving(self) -> List[Tuple[str, int]]:
+        """listen on the configured servers, start the timers & the tasks
+        created while configuring & call the app `workerstart`."""
+        self.loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        if self._shutdown:
+            self._stopped.set()
+        version = getattr(self.config, "http_server_version", "")
+        if version:
+            self.server_header = f"server: {version}\r\n".encode("latin-1")
+        for name, (ip, port) in self.servers.items():
+            domains = [d for d in self.domains if d.attach == name]
+            listener = await self.loop.create_server(
+                lambda domains=domains: HTTPProtocol(self, domains),
+                ip,
+                int(port),
+                backlog=max(getattr(self.config, "socket_backlog", 0), 128),
+                reuse_address=True,
+            )
+            self._listeners.append(listener)
+            self.addresses.extend(
+                sock.getsockname()[:2] for sock in listener.sockets
+            )
+        for timer in self._timers:
+            timer.start(self.loop)
+        self._timers = []
+        for task_id, coroutine in self._coroutines:
+            self._create_task(task_id, coroutine)
+        self._coroutines = []
+        self._sweeper = self.timer(self._close_idle, 1000)
+        if hasattr(self.app, "workerstart"):
+            self.app.workerstart()
+        return self.addresses
+
+    def _close_idle(self, timer):
+        # `kore` closes the connections that are idle for `http_keepalive_time`
+        limit = self.loop.time() - getattr(
+            self.config, "http_keepalive_time", 20
+        )
+        for protocol in list(self.connections):
+            if protocol.last_active < limit and not protocol.busy:
+                protocol.transport.close()
+
+    async def stop_serving(self):
+        self._sweeper.close()
+        for listener in self._listeners:
+            listener.close()
+            await listener.wait_closed()
+        self._listeners = []
+        for protocol in list(self.connections):
+            protocol.transport.close()
+        for task in list(self.tasks.values()):
+            task.cancel()
+        if hasattr(self.app, "workerstop"):
+            self.app.workerstop()
+
+    async def serve_forever(self):
+        await self.start_serving()
+        for host, port in self.addresses:
+            self.log(constants.LOG_NOTICE, f"devserver on http://{host}:{port}")
+        try:
+            await self._stopped.wait()
+        finally:
+            await self.stop_serving()
+
+    def run(self):
+        try:
+            asyncio.run(self.serve_forever())
+        except KeyboardInterrupt:
+            pass
+
+
+def load_app(path: str):
+    """import the app file & return its `koreapp`, like `kore` does"""
+    path = os.path.abspath(path)
+    sys.path.insert(0, os.path.dirname(path))
+    name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    app = getattr(module, "koreapp", None)
+    if app is None:
+        raise Exception(f"the app file {path} has no `koreapp`")
+    return app
+
+
+def run(app, host: str = None, port: str = None, args=()) -> DevKore:
+    """serve the app, or the `koreapp` of the app file path, by the devserver
+    until `kore.shutdown` or Ctrl+C.
+
+    `host` & `port` override the development server of the app, that is
+    added when the app config has no `servers`.
+    """
+    kore = DevKore()
+    if isinstance(app, str):
+        kore.install()
+        app = load_app(app)
+    if host:
+        app.config["default_server_ip"] = host
+    if port:
+        app.config["default_server_port"] = str(port)
+    kore.configure(app, args)
+    kore.run()
+    return kore
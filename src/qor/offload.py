@@ -0,0 +1,201 @@
+import atexit
+import importlib
+import os
+import sys
+import threading
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# pool name: executor class
+POOL_EXECUTORS = {
+    "cpu": ProcessPoolExecutor,
+    "io": ThreadPoolExecutor,
+}
+
+
+def _call_by_name(module: str, qualname: str, args: tuple, kwargs: dict):
+    """call the function in the pool process, it is looked up by its name as
+    its module attribute is the `offload` wrapper."""
+    func: Any = importlib.import_module(module)
+    for name in qualname.split("."):
+        func = getattr(func, name)
+    func = getattr(func, "__wrapped__", func)
+    return func(*args, **kwargs)
+
+
+class PoolMetrics:
+    """the calls counters of one pool, `pending` is the queue depth"""
+
+    __slots__ = ("submitted", "completed", "failed", "max_pending", "_lock")
+
+    def __init__(self) -> None:
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_pending = 0
+        # the done callbacks run in the pools threads
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self.submitted - self.completed - self.failed
+
+    def on_submit(self):
+        with self._lock:
+            self.submitted += 1
+            self.max_pending = max(self.max_pending, self.pending)
+
+    def on_done(self, future: Future):
+        with self._lock:
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+        }
+
+
+class OffloadPools:
+    """the `cpu` (processes) & `io` (threads) executors of the offloaded
+    calls. The executors belong to the process that created them, So each
+    `kore` worker creates its own, on `workerstart` or on the first call.
+    """
+
+    def __init__(
+        self,
+        sizes: Optional[Dict[str, int]] = None,
+        poll_interval: int = 1,
+        shutdown_wait: bool = True,
+        max_poll_interval: int = 32,
+    ) -> None:
+        self.sizes = dict(sizes or {})
+        # the milliseconds before the first check of the pending results, it
+        # is doubled after each check up to `max_poll_interval`
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max(max_poll_interval, poll_interval)
+        self.shutdown_wait = shutdown_wait
+        # the pools used by the offloaded functions, created by `start`
+        self.used = set()
+        self.metrics: Dict[str, PoolMetrics] = {}
+        self._executors: Dict[str, Executor] = {}
+        self._pid: Optional[int] = None
+
+    @classmethod
+    def from_config(cls, config) -> "OffloadPools":
+        return cls(
+            sizes={
+                "cpu": config.get("offload_cpu_workers", 1),
+                "io": config.get("offload_io_workers", 8),
+            },
+            poll_interval=config.get("offload_poll_interval", 1),
+            shutdown_wait=config.get("offload_shutdown_wait", True),
+            max_poll_interval=config.get("offload_max_poll_interval", 32),
+        )
+
+    def executor(self, pool: str) -> Executor:
+        """the executor of the pool in the current process"""
+        if self._pid != os.getpid():
+            # forked, the executors of the parent are unusable
+            self._executors = {}
+            self.metrics = {}
+            if self._pid is None:
+                atexit.register(self.shutdown)
+            self._pid = os.getpid()
+        executor = self._executors.get(pool)
+        if executor is None:
+            executor_class = POOL_EXECUTORS.get(pool)
+            if executor_class is None:
+                raise Exception(
+                    f"unknown offload pool: `{pool}`, the available pools"
+                    f" are: {', '.join(POOL_EXECUTORS.keys())}"
+                )
+            executor = executor_class(max_workers=self.sizes.get(pool) or None)
+            self._executors[pool] = executor
+            self.metrics[pool] = PoolMetrics()
+        return executor
+
+    def start(self):
+        """create the executors of the used pools"""
+        for pool in sorted(self.used):
+            self.executor(pool)
+
+    def submit(self, pool: str, func: Callable, *args, **kwargs) -> Future:
+        executor = self.executor(pool)
+        if isinstance(executor, ProcessPoolExecutor):
+            future = executor.submit(
+                _call_by_name, *_function_name(func), args, kwargs
+            )
+        else:
+            future = executor.submit(func, *args, **kwargs)
+        metrics = self.metrics[pool]
+        metrics.on_submit()
+        future.add_done_callback(metrics.on_done)
+        return future
+
+    async def wait(
+        self, future: Future, suspend: Callable[[int], Awaitable]
+    ) -> Any:
+        """the awaiting shim, the request is suspended till the result
+        arrives, So the worker serves the other requests meanwhile.
+
+        N.B:. the futures are done in the pools threads, & `kore` can't be
+        woken from other threads, So the request checks the result with
+        exponential backoff, the short calls are answered quickly & the long
+        ones don't wake the worker every millisecond.
+        """
+        if future.done():
+            return future.result()
+        poll_interval = self.poll_interval
+        max_poll_interval = self.max_poll_interval
+        while True:
+            await suspend(poll_interval)
+            if future.done():
+                return future.result()
+            poll_interval = min(poll_interval * 2, max_poll_interval)
+
+    def shutdown(self, wait: Optional[bool] = None):
+        """shutdown the executors of the current process, the pending calls
+        are finished if `wait`, else they are cancelled."""
+        if self._pid != os.getpid():
+            return
+        if wait is None:
+            wait = self.shutdown_wait
+        executors, self._executors = self._executors, {}
+        # `cancel_futures` is new in python 3.9
+        kwargs = (
+            {}
+            if wait or sys.version_info < (3, 9)
+            else {"cancel_futures": True}
+        )
+        for executor in executors.values():
+            executor.shutdown(wait=wait, **kwargs)
+
+    def stats(self) -> Dict[str, dict]:
+        """the metrics of each pool of the current process"""
+        if self._pid != os.getpid():
+            return {}
+        return {
+            pool: metrics.to_dict() for pool, metrics in self.metrics.items()
+        }
+
+
+def _function_name(func: Callable) -> Tuple[str, str]:
+    qualname = func.__qualname__
+    if "<locals>" in qualname:
+        raise Exception(
+            f"can't offload {func} to the `cpu` pool, the nested functions"
+            " can't be called in the pool processes."
+        )
+    return func.__module__, qualname
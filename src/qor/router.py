@@ -1,6 +1,11 @@
 import copy
+import functools
+import heapq
 import re
-from typing import Callable, Dict, List, Literal, Optional
+import sys
+import weakref
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
 
 from qor import constants
 
@@ -21,17 +26,22 @@ END = ">"
 # can pass pure rejex by using the filter `re`
 path_converters = {
     # int is any character from 0-9 repeated one or more times
-    "int": ("[0-9]+", lambda v: int(v)),  # "\d+",  # r"\d+"
+    "int": ("[0-9]+", int),  # "\d+",  # r"\d+"
     # float is two integers seperated by `.`
-    "float": ("[0-9]+.[0-9]+", lambda v: float(v)),  # r"\d+\.\d+"
+    "float": ("[0-9]+.[0-9]+", float),  # r"\d+\.\d+"
     # path is a: string that starts with `/` then any character then optional `/`
     # "path": "(\/.*\/?)",  # "[^/].*?",  # r"[^/].*?",  # "[^/].*?"
     # match any thing except `/`
-    "string": ("[^\/]+", lambda v: str(v)),
+    "string": ("[^\/]+", str),
     # placeholder for rejex cinverter, the user should provide his own rejex using this converter
     "re": (None, None),
 }
 
+
+def _identity(v):
+    return v
+
+
 # This matches most of the allowed characters in url
 # [a-zA-Z0-9_\%\&\=+\$\-\.\!\~\*']+
 
@@ -97,14 +107,116 @@ def analyze_part(string, path_converters: dict):
 
     if _filter_name == "re":
         regex = splitted[2]
-        to_python = lambda v: v
+        to_python = _identity
     else:
         regex = converter[0]
-        to_python = lambda v: converter[1](v)
+        to_python = converter[1]
 
     return _string, regex, to_python
 
 
+def _as_parts(parts) -> List["RoutePart"]:
+    """the parsed url parts as `RoutePart`s, the parts dicts are accepted"""
+    return [
+        part if isinstance(part, RoutePart) else RoutePart.intern(**part)
+        for part in parts
+    ]
+
+
+def compile_path_builder(parts: List[dict]) -> Callable[..., str]:
+    """compile the parsed url parts into a function that builds the path from
+    kwargs. The variable parts validators are compiled once & the static paths
+    are built once.
+
+    Example:
+
+    >> builder = compile_path_builder(route.parts)
+    >> builder(id=1)
+    /users/1
+    """
+    parts = _as_parts(parts)
+    variables = []
+    template_parts = []
+    for part in parts:
+        if part.isreg:
+            name = part.name
+            if not name:
+
+                def invalid_builder(**kwargs):
+                    raise Exception("Invalid part, part has no name")
+
+                return invalid_builder
+            regex = part.re
+            variables.append((name, re.compile(regex).fullmatch, regex))
+            template_parts.append("{}")
+        else:
+            value = part.value
+            template_parts.append(value.replace("{", "{{").replace("}", "}}"))
+    template = SLASH.join(template_parts)
+
+    if not variables:
+        static_path = template.format()
+
+        def static_builder(**kwargs):
+            return static_path
+
+        return static_builder
+
+    def builder(**kwargs):
+        values = []
+        for name, fullmatch, regex in variables:
+            if name not in kwargs:
+                raise Exception(f"Can't build path, `{name}` is required.")
+            value = str(kwargs[name])
+            if fullmatch(value) is None:
+                raise Exception(
+                    f"Can't build path as {value} not matching with {regex}"
+                )
+            values.append(value)
+        return template.format(*values)
+
+    return builder
+
+
+def compile_args_converter(parts: List[dict]) -> Optional[Callable]:
+    """compile function that converts the path arguments passed by `kore` to
+    python values, using the `to_python` of the variable parts.
+
+    Returns None if there is nothing to convert, ie: no variable parts or all
+    of them are strings. The builtin converters (`int`, `float`) are called
+    directly in the generated function.
+
+    Example:
+
+    >> converter = compile_args_converter(route.parts)
+    >> converter(("1", "ahmad"))
+    (1, 'ahmad')
+    """
+    variables = [part for part in _as_parts(parts) if part.isreg]
+    namespace = {}
+    items = []
+    needs_conversion = False
+    for index, part in enumerate(variables):
+        to_python = part.to_python or _identity
+        if to_python is _identity or to_python is str:
+            items.append(f"args[{index}]")
+        elif to_python is int or to_python is float:
+            needs_conversion = True
+            items.append(f"{to_python.__name__}(args[{index}])")
+        else:
+            needs_conversion = True
+            namespace[f"to_python_{index}"] = to_python
+            items.append(f"to_python_{index}(args[{index}])")
+    if not needs_conversion:
+        return None
+    # the args are returned as they are, if their count is not the expected
+    source = (
+        f"lambda args: ({', '.join(items)},)"
+        f" if len(args) == {len(variables)} else args"
+    )
+    return eval(source, namespace)
+
+
 def build_path(
     pathPattern: Dict[Literal["parts"], List],
     **kwargs,
@@ -117,48 +229,16 @@ def build_path(
     Returns:
         str: The path if build process success, else None
     """
-    parts = pathPattern.get("parts")
-    variables = []
-    for p in parts:
-        if p.get("isreg", False):
-            name = p.get("name")
-            if not name:
-                raise Exception("Invalid part, part has no name")
-            variables.append(name)
-
-    for v in variables:
-        if v not in kwargs:
-            raise Exception(f"Can't build path, `{v}` is required.")
-    outparts = []
-    for part in parts:
-        if part.get("isreg"):
-            # get the value to replace with
-            value = str(kwargs.get(part.get("name")))
-            # if the given value match the expected pattern, add it. else: return None
-            regex = part.get("re")
-            compiled = re.compile(regex)
-            matched = compiled.match(value)
-
-            if matched and len(matched[0]) == len(value):
-                outparts.append(value)
-            else:
-                raise Exception(
-                    f"Can't build path as {value} not matching with {regex}"
-                )
-        else:
-            # append string as it is
-            outparts.append(part.get("value"))
-    built = "/".join(outparts)
-    return built
+    return compile_path_builder(pathPattern.get("parts"))(**kwargs)
 
 
 def kore_re_string(parts, sep="\/", is_root=True, catch_child=False):
     rv = []
-    for part in parts:
-        if part.get("isreg", True):
-            rv.append(f"({part.get('re')})")
+    for part in _as_parts(parts):
+        if part.isreg:
+            rv.append(f"({part.re})")
         else:
-            rv.append(part.get("value"))
+            rv.append(part.value)
     string = sep.join(rv)
     if is_root:
         string = f"^{string}"
@@ -167,104 +247,249 @@ def kore_re_string(parts, sep="\/", is_root=True, catch_child=False):
     return string
 
 
+def is_static_path(parts) -> bool:
+    """return True if the parsed path parts have no variable (regex) part"""
+    for part in _as_parts(parts):
+        if part.isreg:
+            return False
+    return True
+
+
+def kore_path_string(parts):
+    """return the path that should be registered in `kore` for the parts.
+
+    `kore` treats the paths that start with `^` as regex & checks them one by
+    one on each request, while other paths are resolved by exact match lookup.
+    So, the static paths are registered as plain strings & only the paths with
+    variable parts are converted to regex.
+    """
+    parts = _as_parts(parts)
+    if not any(part.isreg for part in parts):
+        return SLASH.join(part.value for part in parts)
+    return kore_re_string(parts)
+
+
 def python_re_string(parts, sep="\/"):
     rv = []
-    for part in parts:
-        if part.get("isreg", True):
-            rv.append(f"(?P<{part.get('name')}>{part.get('re')})")
+    for part in _as_parts(parts):
+        if part.isreg:
+            rv.append(f"(?P<{part.name}>{part.re})")
         else:
-            rv.append(part.get("value"))
+            rv.append(part.value)
 
     return sep.join(rv)
 
 
-class Route(dict):
-    def __init__(self, **data):
-        self.update(
-            dict(
-                name=None,
-                path=None,
-                handler=None,
-                method=None,
-                domain=None,
-                params={},
-                auth_name=None,
-                key="",
-                auth_type=None,
-                auth_value=None,
-                auth_redirect=None,
-                auth_verify=None,
-                parts=[],
-                raw_path=data.get("raw_path", ""),  # or data.get("path", None),
-                class_args=(),
-                class_kwargs={},
-            )
-        )
-        if data.get("auth", None):
-            data.setdefault("auth_type", data.get("auth", {}).get("auth_type"))
-            data.setdefault(
-                "auth_value", data.get("auth", {}).get("auth_value")
-            )
-            data.setdefault(
-                "auth_redirect", data.get("auth", {}).get("auth_redirect")
-            )
-            data.setdefault(
-                "auth_verify", data.get("auth", {}).get("auth_verify")
-            )
+class _FrozenSlots(Mapping):
+    """base of the immutable routes objects, the fields are stored in
+    `__slots__` & a read only dict view of them is provided, So the old
+    `route.get(...)` & `route["name"]` callers keep working.
+    """
 
-        super().__init__(**data)
+    __slots__ = ()
+    # the keys of the dict view
+    _fields: Tuple[str, ...] = ()
 
-    @property
-    def name(self):
-        return self["name"]
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
 
-    @property
-    def path(self):
-        return self["path"]
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
 
-    @property
-    def raw_path(self):
-        return self["raw_path"]
+    # dict view key: slot name, for the fields that are stored in a different
+    # slot than their key. The dict view returns the attributes, the stored
+    # values are used by `repr` & `replace`
+    _slot_names: Dict[str, str] = {}
 
-    @property
-    def handler(self):
-        return self["handler"]
+    def __getitem__(self, key):
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
 
-    @property
-    def method(self):
-        return self["method"]
+    def _stored_value(self, key):
+        return getattr(self, self._slot_names.get(key, key))
 
-    @property
-    def methods(self):
-        return [self["method"]]
+    def __iter__(self):
+        return iter(self._fields)
 
-    @property
-    def domain(self):
-        return self["domain"]
+    def __len__(self):
+        return len(self._fields)
 
-    @property
-    def params(self):
-        return self["params"]
+    def __repr__(self) -> str:
+        items = ", ".join(
+            f"{key}={self._stored_value(key)!r}" for key in self._fields
+        )
+        return f"{type(self).__name__}({items})"
 
-    @property
-    def auth_name(self):
-        return self["auth_name"]
+    def to_dict(self) -> dict:
+        return {key: self[key] for key in self._fields}
 
-    @property
-    def auth_type(self):
-        return self["auth_type"]
 
-    @property
-    def auth_value(self):
-        return self["auth_value"]
+class RoutePart(_FrozenSlots):
+    """single parsed path segment, a static value or a variable with its
+    regex & `to_python` converter. The equal parts are interned, see
+    `RoutePart.intern`, So the parts are shared across the routes.
+    """
+
+    __slots__ = ("name", "value", "isreg", "re", "to_python", "__weakref__")
+    _fields = ("name", "value", "isreg", "re", "to_python")
+    # the parts are dropped with the last route that uses them
+    _interned: "weakref.WeakValueDictionary[tuple, RoutePart]" = (
+        weakref.WeakValueDictionary()
+    )
+
+    def __init__(
+        self, name=None, value=None, isreg=False, re=None, to_python=None
+    ) -> None:
+        _set = object.__setattr__
+        _set(self, "name", name)
+        _set(self, "value", value)
+        _set(self, "isreg", isreg)
+        _set(self, "re", re)
+        _set(self, "to_python", to_python)
+
+    @classmethod
+    def intern(
+        cls, name=None, value=None, isreg=False, re=None, to_python=None
+    ):
+        """return the shared part for these values"""
+        key = (name, value, isreg, re, to_python)
+        try:
+            part = cls._interned.get(key)
+        except TypeError:
+            # unhashable converter
+            return cls(name, value, isreg, re, to_python)
+        if part is None:
+            part = cls._interned[key] = cls(
+                name and sys.intern(name),
+                value and sys.intern(value),
+                isreg,
+                re and sys.intern(re),
+                to_python,
+            )
+        return part
+
+    @classmethod
+    def from_value(cls, part) -> "RoutePart":
+        if isinstance(part, RoutePart):
+            return part
+        return cls.intern(**part)
+
+
+class Route(_FrozenSlots):
+    """immutable built route, the fields are slots & its dict view is kept for
+    the old dict based callers. Use `route.replace(**changes)` to get a
+    changed copy.
+    """
+
+    __slots__ = (
+        "name",
+        "path",
+        "handler",
+        "method",
+        "domain",
+        "params",
+        "auth_name",
+        "key",
+        "auth_type",
+        "auth_value",
+        "auth_redirect",
+        "auth_verify",
+        "parts",
+        "raw_path",
+        "class_args",
+        "class_kwargs",
+        "cache",
+        "_methods",
+        "_method_routes",
+    )
+    _fields = (
+        "name",
+        "path",
+        "handler",
+        "method",
+        "domain",
+        "params",
+        "auth_name",
+        "key",
+        "auth_type",
+        "auth_value",
+        "auth_redirect",
+        "auth_verify",
+        "parts",
+        "raw_path",
+        "class_args",
+        "class_kwargs",
+        "cache",
+        "methods",
+        "method_routes",
+    )
+    # the stored values, not the `methods` & `method_routes` properties
+    _slot_names = {"methods": "_methods", "method_routes": "_method_routes"}
+
+    def __init__(
+        self,
+        name=None,
+        path=None,
+        handler=None,
+        method=None,
+        domain=None,
+        params={},
+        auth_name=None,
+        key="",
+        auth_type=None,
+        auth_value=None,
+        auth_redirect=None,
+        auth_verify=None,
+        parts=(),
+        raw_path="",
+        class_args=(),
+        class_kwargs={},
+        cache=None,
+        methods=None,
+        method_routes=None,
+        auth=None,
+    ):
+        if auth:
+            auth_type = auth_type or auth.get("auth_type")
+            auth_value = auth_value or auth.get("auth_value")
+            auth_redirect = auth_redirect or auth.get("auth_redirect")
+            auth_verify = auth_verify or auth.get("auth_verify")
+
+        _set = object.__setattr__
+        _set(self, "name", name)
+        _set(self, "path", path)
+        _set(self, "handler", handler)
+        _set(self, "method", method)
+        _set(self, "domain", domain)
+        _set(self, "params", params)
+        _set(self, "auth_name", auth_name)
+        _set(self, "key", key)
+        _set(self, "auth_type", auth_type)
+        _set(self, "auth_value", auth_value)
+        _set(self, "auth_redirect", auth_redirect)
+        _set(self, "auth_verify", auth_verify)
+        _set(self, "parts", tuple(_as_parts(parts)))
+        _set(self, "raw_path", raw_path)
+        _set(self, "class_args", class_args)
+        _set(self, "class_kwargs", class_kwargs)
+        _set(self, "cache", cache)
+        _set(self, "_methods", methods or None)
+        _set(self, "_method_routes", method_routes or None)
+
+    def replace(self, **changes) -> "Route":
+        """return a copy of the route with the changed fields"""
+        fields = {key: self._stored_value(key) for key in self._fields}
+        return type(self)(**dict(fields, **changes))
 
     @property
-    def auth_redirect(self):
-        return self["auth_redirect"]
+    def methods(self):
+        return self._methods or [self.method]
 
     @property
-    def auth_verify(self):
-        return self["auth_verify"]
+    def method_routes(self):
+        """the per-method routes that are merged in this route, see `merge_routes`"""
+        return self._method_routes or {self.method: self}
 
     @property
     def auth(self):
@@ -291,20 +516,294 @@ class Route(dict):
         ) or bool(self.auth_name)
 
     @property
-    def parts(self):
-        return self["parts"]
+    def is_static(self):
+        return is_static_path(self.parts)
 
-    @property
-    def class_args(self):
-        return self["class_args"]
 
-    @property
-    def class_kwargs(self):
-        return self["class_kwargs"]
+def merge_routes(routes: List[Route]) -> List[Route]:
+    """merge the routes that share the same domain, path, auth & key into one
+    route that has combined `methods` list, so each path is registered once in
+    `kore` instead of once per method.
 
-    @property
-    def key(self):
-        return self["key"]
+    The per-method routes are kept in the `method_routes` of the merged route,
+    each of them has its own handler & params.
+
+    The merged routes are returned in the order of their first occurrence.
+    """
+    # group key: (first route, {method: route})
+    groups: Dict[tuple, tuple] = {}
+    for route in routes:
+        group_key = (
+            route.domain,
+            route.path,
+            route.key,
+            route.auth_name,
+            route.auth_type,
+            route.auth_value,
+            route.auth_redirect,
+            route.auth_verify,
+        )
+        group = groups.get(group_key)
+        if group is not None and route.method in group[1]:
+            # same method registered twice (`allow_override`), the route
+            # is registered separately as before.
+            group_key = group_key + (len(groups),)
+            group = None
+        if group is None:
+            groups[group_key] = (route, {route.method: route})
+        else:
+            group[1][route.method] = route
+    return [
+        first.replace(methods=list(method_routes), method_routes=method_routes)
+        for first, method_routes in groups.values()
+    ]
+
+
+# the converters regexes that can't match `/`, so the variable part that uses
+# one of them always matches exactly one path segment.
+SEGMENT_REGEXES = (path_converters["int"][0], path_converters["string"][0])
+
+
+def _part_spans_segments(part) -> bool:
+    return part.isreg and part.re not in SEGMENT_REGEXES
+
+
+def routes_may_overlap(first: Route, second: Route) -> bool:
+    """return False only if it is sure that no path can be matched by both
+    routes. It is conservative, any route with unknown regex (`re` converter)
+    is considered to overlap all the routes of its domain.
+    """
+    if (
+        first.domain is not None
+        and second.domain is not None
+        and first.domain != second.domain
+    ):
+        return False
+    first_parts, second_parts = first.parts, second.parts
+    for part in first_parts + second_parts:
+        if _part_spans_segments(part):
+            return True
+    if len(first_parts) != len(second_parts):
+        return False
+    for first_part, second_part in zip(first_parts, second_parts):
+        first_isreg = first_part.isreg
+        second_isreg = second_part.isreg
+        if first_isreg and second_isreg:
+            continue
+        if not first_isreg and not second_isreg:
+            if first_part.value != second_part.value:
+                return False
+            continue
+        regex, value = (
+            (first_part.re, second_part.value)
+            if first_isreg
+            else (second_part.re, first_part.value)
+        )
+        if not re.fullmatch(regex, value):
+            return False
+    return True
+
+
+def overlap_groups(routes: List[Route]) -> List[int]:
+    """return the overlap group of each route, the routes of different groups
+    never match the same path. It is conservative, the routes of one group may
+    not overlap each other.
+
+    The routes are split by their domain & their number of segments, then by
+    each segment, the static values that a variable of the segment may match
+    stay with the variables. The routes with a part that may match many
+    segments (`re` converter) get the group -1, they may overlap any route.
+    """
+    groups = [-1] * len(routes)
+    # the routes without a domain may overlap the routes of any domain
+    by_domain = all(route.domain is not None for route in routes)
+    buckets: Dict[tuple, List[int]] = {}
+    for index, route in enumerate(routes):
+        if not any(_part_spans_segments(part) for part in route.parts):
+            key = (route.domain if by_domain else None, len(route.parts))
+            buckets.setdefault(key, []).append(index)
+
+    group = 0
+    pending = [(indices, 0) for indices in buckets.values()]
+    while pending:
+        indices, depth = pending.pop()
+        if len(indices) == 1 or depth == len(routes[indices[0]].parts):
+            for index in indices:
+                groups[index] = group
+            group += 1
+            continue
+        static: Dict[str, List[int]] = {}
+        variables = []
+        for index in indices:
+            part = routes[index].parts[depth]
+            if part.isreg:
+                variables.append(index)
+            else:
+                static.setdefault(part.value, []).append(index)
+        if variables:
+            regexes = {routes[index].parts[depth].re for index in variables}
+            for value in list(static):
+                if any(re.fullmatch(regex, value) for regex in regexes):
+                    variables.extend(static.pop(value))
+            pending.append((sorted(variables), depth + 1))
+        pending.extend((values, depth + 1) for values in static.values())
+    return groups
+
+
+def order_routes_by_hits(
+    routes: List[Route], hits: Dict[str, int], key: Callable
+) -> List[Route]:
+    """reorder the routes so the most hit routes come first.
+
+    `kore` checks the routes in their registration order, so the routes of
+    the same overlap group keep their original relative order & the routes
+    that may match many segments stay between the same routes, the reordering
+    never changes which route handles a request.
+
+    N.B:. the overlap groups are computed here, only when the routes are
+    profiled, see `overlap_groups`.
+
+    Args:
+        routes (List[Route]): the routes in their original order.
+        hits (Dict[str, int]): the hit count of each route key.
+        key (Callable): function that returns the key of the route in `hits`.
+    """
+    groups = overlap_groups(routes)
+    ordered: List[Route] = []
+    # the routes between two routes of the group -1
+    chains: Dict[int, List[int]] = {}
+    for index, route in enumerate(routes):
+        if groups[index] == -1:
+            _merge_chains(routes, chains, hits, key, ordered)
+            chains = {}
+            ordered.append(route)
+        else:
+            chains.setdefault(groups[index], []).append(index)
+    _merge_chains(routes, chains, hits, key, ordered)
+    return ordered
+
+
+def _merge_chains(routes, chains, hits, key, ordered):
+    """add the routes of the groups to `ordered`, the hot routes first & the
+    routes of each group in their original order"""
+    priority = {}
+    heap = []
+    for chain in chains.values():
+        # a route that must stay before a hot route is as hot as that route
+        hottest = 0
+        for index in reversed(chain):
+            hottest = max(hottest, hits.get(key(routes[index]), 0))
+            priority[index] = hottest
+        heap.append((-priority[chain[0]], chain[0], chain, 0))
+    heapq.heapify(heap)
+    while heap:
+        _, index, chain, position = heapq.heappop(heap)
+        ordered.append(routes[index])
+        position += 1
+        if position < len(chain):
+            successor = chain[position]
+            heapq.heappush(
+                heap, (-priority[successor], successor, chain, position)
+            )
+
+
+class _MatcherNode:
+    __slots__ = ("static", "dynamic", "leaves")
+
+    def __init__(self) -> None:
+        # segment value: child node
+        self.static: Dict[str, "_MatcherNode"] = {}
+        # (compiled regex, child node) in registration order
+        self.dynamic: List[tuple] = []
+        # method: (route, ((name, to_python), ...))
+        self.leaves: Dict[str, tuple] = {}
+
+
+class RouteMatcher:
+    """radix tree that matches paths to the built routes without `kore`.
+
+    Each path segment is a node, the static segments are dict lookups & the
+    variable segments are regexes that are compiled once, So the lookup cost
+    depends on the path length not on the number of routes.
+
+    N.B:.
+    - Each variable part matches exactly one path segment.
+    - The static segments are checked before the variable ones, then the
+      variable segments are checked in their registration order.
+    - The routes without domain are matched for any domain.
+    """
+
+    def __init__(self, routes: List[Route] = []) -> None:
+        self._roots: Dict[Optional[str], _MatcherNode] = {}
+        self._compiled: Dict[str, re.Pattern] = {}
+        for route in routes:
+            self.add(route)
+
+    def add(self, route: Route):
+        node = self._roots.setdefault(route.domain, _MatcherNode())
+        converters = []
+        for part in route.parts:
+            if part.isreg:
+                regex = part.re
+                compiled = self._compiled.get(regex)
+                if compiled is None:
+                    compiled = self._compiled[regex] = re.compile(regex)
+                for child_regex, child in node.dynamic:
+                    if child_regex is compiled:
+                        break
+                else:
+                    child = _MatcherNode()
+                    node.dynamic.append((compiled, child))
+                converters.append((part.name, part.to_python or _identity))
+            else:
+                value = part.value
+                child = node.static.get(value)
+                if child is None:
+                    child = node.static[value] = _MatcherNode()
+            node = child
+        node.leaves.setdefault(route.method, (route, tuple(converters)))
+
+    def _find(self, node: _MatcherNode, segments, index, values, method):
+        if index == len(segments):
+            return node.leaves.get(method)
+        segment = segments[index]
+        child = node.static.get(segment)
+        if child is not None:
+            found = self._find(child, segments, index + 1, values, method)
+            if found is not None:
+                return found
+        for regex, child in node.dynamic:
+            if regex.fullmatch(segment):
+                values.append(segment)
+                found = self._find(child, segments, index + 1, values, method)
+                if found is not None:
+                    return found
+                values.pop()
+        return None
+
+    def match(
+        self, domain: Optional[str], path: str, method: str = "get"
+    ) -> Optional[Tuple[Route, Dict[str, Any]]]:
+        """return the route & its converted variables, or None if no route
+        matches the path & the method.
+        """
+        segments = path.split(SLASH)
+        method = method.lower()
+        roots = [self._roots.get(domain)]
+        if domain is not None:
+            roots.append(self._roots.get(None))
+        for root in roots:
+            if root is None:
+                continue
+            values = []
+            found = self._find(root, segments, 0, values, method)
+            if found is not None:
+                route, converters = found
+                return route, {
+                    name: to_python(value)
+                    for (name, to_python), value in zip(converters, values)
+                }
+        return None
 
 
 class RouterBase:
@@ -326,48 +825,42 @@ class Router(RouterBase):
     _path_converters = path_converters
 
     def __init__(
-        self, name="", allow_override=False, path_conveters={}
+        self,
+        name="",
+        allow_override=False,
+        path_conveters={},
+        reverse_cache_size=0,
     ) -> None:
         self.name = name
         self._routers: dict[str, "Router"] = {}
         self._raw_routes: list[dict] = []
         self._routes: list[Route] = []
+        # indexes, the first registered route wins like the linear search
+        # (domain, raw_path, method): raw route
+        self._raw_index: Dict[tuple, dict] = {}
+        # (domain, path, method): route
+        self._route_index: Dict[tuple, Route] = {}
+        # name: route
+        self._name_index: Dict[str, Route] = {}
+        self._matcher: Optional[RouteMatcher] = None
+        # name: path builder, for `reverse`
+        self._reversers: Dict[str, Callable[..., str]] = {}
+        # the size of the LRU cache for the reversed urls, 0 to disable it
+        self.reverse_cache_size = reverse_cache_size
+        self._cached_reverse = None
         self.allow_override = allow_override
         if path_conveters:
             self._path_converters = copy.copy(self._path_converters)
             self._path_converters.update(path_conveters)
 
     def find_raw_route(self, domain: str, path: str, method: str):
-        _raw_routes = self._raw_routes
-        for route in _raw_routes:
-            if (
-                "domain" in route
-                and "raw_path" in route
-                and "method" in route
-                and route.get("domain") == domain
-                and route.get("raw_path") == path
-                and route.get("method") == method
-            ):
-                return route
-        return None
+        return self._raw_index.get((domain, path, method))
 
     def find_route(self, domain: str, path: str, method: str):
-        _routes = self._routes
-        for route in _routes:
-            if (
-                route.domain == domain
-                and route.path == path
-                and route.method == method
-            ):
-                return route
-        return None
+        return self._route_index.get((domain, path, method))
 
     def find_route_by_name(self, name):
-        _routes = self._routes
-        for route in _routes:
-            if route.name == name:
-                return route
-        return None
+        return self._name_index.get(name)
 
     def mount_router(self, path: str, router: "Router"):
         """mount child router to this router, this means that the child urls
@@ -395,16 +888,24 @@ class Router(RouterBase):
         return self._routes
 
     def __join_routes(self, routes, base_names=[], base_paths=[]):
+        """return (raw route, joined raw path, joined name) of the routes,
+        the raw routes (& their index) are not altered, So the routes can be
+        built many times."""
         _routes = []
+        # the base path & name are joined once for all the routes
+        base_path = multi_urljoin(*base_paths) if base_paths else None
+        base_name = ":".join(base_names) if base_names else None
         for r in routes:
-            r["raw_path"] = multi_urljoin(*base_paths, r.get("raw_path"))
+            raw_path = r.get("raw_path")
+            if base_path is not None:
+                if raw_path.startswith("/"):
+                    raw_path = raw_path[1:]
+                raw_path = f"{base_path}/{raw_path}"
 
             r_name = r.get("name")
-            if r_name and base_names:
-                _names = copy.copy(base_names)
-                _names.append(r_name)
-                r["name"] = ":".join(_names).replace(":", "", 1)
-            _routes.append(r)
+            if r_name and base_name is not None:
+                r_name = f"{base_name}:{r_name}".replace(":", "", 1)
+            _routes.append((r, raw_path, r_name))
         return _routes
 
     def __join_self_routes(self, base_names=[], base_paths=[]):
@@ -434,50 +935,69 @@ class Router(RouterBase):
 
     def build_routes(self, base_name="", base_path="/"):
         self._routes = []
+        self._route_index = {}
+        self._name_index = {}
+        self._reversers = {}
+        self._matcher = None
+        self._cached_reverse = None
+        if self.reverse_cache_size:
+            self._cached_reverse = functools.lru_cache(
+                maxsize=self.reverse_cache_size
+            )(self.__reverse_from_items)
         _routes = self.__join_all([], [base_path])
-        for route in _routes:
-            if not self.allow_override and self.find_route(
-                route.get("domain", None),
-                route.get("path", ""),
-                route.get("method", []),
-            ):
-                raise Exception(
-                    "Route with the same domain, path & methd is already"
-                    f" specified, {route}."
-                )
+        # segment: part, the parsed segments of this build
+        segment_parts: Dict[str, RoutePart] = {}
+        for route, raw_path, name in _routes:
             handler = route.get("handler")
-            name = route.get("name", None)
 
             router_path_conveters = self._path_converters
-            router_path_conveters.update(route.get("path_conveters", {}))
-            raw_path = route.get("raw_path")
-
-            parts = self.parse_route_path(raw_path, router_path_conveters)
-            path = kore_re_string(parts)
-            self._routes.append(
-                Route(
-                    name=name,
-                    path=path,
-                    raw_path=route.get("raw_path"),
-                    handler=handler,
-                    method=route.get("method"),
-                    domain=route.get("domain"),
-                    params=route.get("params"),
-                    auth_name=route.get("auth_name"),
-                    key=route.get("key"),
-                    auth_type=route.get("auth_type"),  # header or cookie
-                    auth_value=route.get("auth_value"),  # header or cookie name
-                    auth_redirect=route.get("auth_redirect"),
-                    # redirect location upon failure,
-                    # if not set, 403 is returned.
-                    auth_verify=route.get("auth_verify"),
-                    parts=parts,
+            if route.get("path_conveters"):
+                router_path_conveters.update(route.get("path_conveters"))
+                segment_parts.clear()
+
+            parts = self.parse_route_path(
+                raw_path, router_path_conveters, segment_parts
+            )
+            path = kore_path_string(parts)
+            index_key = (route.get("domain", None), path, route.get("method"))
+            if not self.allow_override and index_key in self._route_index:
+                raise Exception(
+                    "Route with the same domain, path & methd is already"
+                    f" specified, {route}."
                 )
+            built = Route(
+                name=name,
+                path=path,
+                raw_path=raw_path,
+                handler=handler,
+                method=route.get("method"),
+                domain=route.get("domain"),
+                params=route.get("params"),
+                auth_name=route.get("auth_name"),
+                key=route.get("key"),
+                auth_type=route.get("auth_type"),  # header or cookie
+                auth_value=route.get("auth_value"),  # header or cookie name
+                auth_redirect=route.get("auth_redirect"),
+                # redirect location upon failure,
+                # if not set, 403 is returned.
+                auth_verify=route.get("auth_verify"),
+                parts=parts,
+                cache=route.get("cache"),
             )
-
-    def parse_route_path(self, path: str = "", path_filters={}) -> list:
+            self._routes.append(built)
+            self._route_index.setdefault(index_key, built)
+            if name not in self._name_index:
+                # its builder is compiled by the first `reverse`
+                self._name_index[name] = built
+
+    def parse_route_path(
+        self, path: str = "", path_filters={}, segment_parts=None
+    ) -> list:
         """parse path and return its rejex parts & variable names
 
+        N.B:. `segment_parts` is a dict of the already parsed segments, it is
+        shared by the paths that are parsed with the same `path_filters`.
+
         Returns:
             None
         """
@@ -485,31 +1005,31 @@ class Router(RouterBase):
             return []
 
         splitted: list[str] = path.split(SLASH)
+        if segment_parts is None:
+            return [
+                self._parse_segment(part, path_filters) for part in splitted
+            ]
         parts = []
 
         for part in splitted:
-            if part.startswith(START) and part.endswith(END):
-                varname, reg, to_python = analyze_part(
-                    find_between(part, START, END), path_filters
-                )
-                parts.append(
-                    {
-                        "re": reg,
-                        "name": varname,
-                        "isreg": True,
-                        "to_python": to_python,
-                    }
-                )
-            else:
-                parts.append(
-                    {
-                        "name": None,
-                        "value": part,
-                        "isreg": False,
-                    }
+            parsed = segment_parts.get(part)
+            if parsed is None:
+                parsed = segment_parts[part] = self._parse_segment(
+                    part, path_filters
                 )
+            parts.append(parsed)
         return parts
 
+    def _parse_segment(self, part: str, path_filters) -> RoutePart:
+        if part.startswith(START) and part.endswith(END):
+            varname, reg, to_python = analyze_part(
+                find_between(part, START, END), path_filters
+            )
+            return RoutePart.intern(
+                name=varname, isreg=True, re=reg, to_python=to_python
+            )
+        return RoutePart.intern(value=part)
+
     def reverse(self, __name: str, **kwargs):
         """reverse url for route using the route name & kwargs
 
@@ -530,10 +1050,52 @@ class Router(RouterBase):
 
         /users/1
         """
-        route = self.find_route_by_name(__name)
-        if not route:
-            raise Exception(f"can't find route for {__name}")
-        return build_path(route, **kwargs)
+        builder = self._reversers.get(__name)
+        if builder is None:
+            route = self._name_index.get(__name)
+            if route is None:
+                raise Exception(f"can't find route for {__name}")
+            builder = self._reversers[__name] = compile_path_builder(
+                route.parts
+            )
+        if kwargs and self._cached_reverse is not None:
+            # the types are part of the key, as `1 == 1.0 == True`, & the
+            # kwargs order is not
+            items = tuple(
+                sorted(
+                    (key, type(value), value) for key, value in kwargs.items()
+                )
+            )
+            try:
+                return self._cached_reverse(__name, items)
+            except TypeError:
+                # unhashable kwargs
+                pass
+        return builder(**kwargs)
+
+    def __reverse_from_items(self, name: str, items: tuple) -> str:
+        return self._reversers[name](**{key: value for key, _, value in items})
+
+    def match(self, domain: Optional[str], path: str, method: str = "get"):
+        """find the route that handles the path & method, without `kore`.
+
+        Returns:
+            Optional[Tuple[Route, dict]]: the route & the converted path
+            variables, or None if no route matched.
+
+        Example:
+
+        >>> router = Router()
+        >>> router.add_route(path="/users/<id:int>", handler=get_user, name="user")
+        >>> router.build_routes()
+        >>> route, kwargs = router.match(None, "/users/1", "get")
+        >>> route.name, kwargs
+
+        ('user', {'id': 1})
+        """
+        if self._matcher is None:
+            self._matcher = RouteMatcher(self._routes)
+        return self._matcher.match(domain, path, method)
 
     def __repr__(self) -> str:
         return f"<Router {self.name}>"
@@ -556,6 +1118,7 @@ class Router(RouterBase):
         auth_value=None,  # header or cookie name
         auth_redirect="/",
         auth_verify=None,
+        cache=None,
     ):
         _methods = []
         for method in methods:
@@ -566,33 +1129,35 @@ class Router(RouterBase):
         methods = _methods
 
         if not self.allow_override:
-            value = self.find_raw_route(domain, path, method)
-            if value:
-                raise Exception(
-                    "There is already registered handeler for the same domain"
-                    f" path, {domain}:{path}"
-                )
+            for method in methods:
+                if self.find_raw_route(domain, path, method):
+                    raise Exception(
+                        "There is already registered handeler for the same"
+                        f" domain path, {domain}:{path}"
+                    )
 
         for method in methods:
-            self._raw_routes.append(
-                dict(
-                    name=name,
-                    path=None,
-                    raw_path=path,
-                    handler=handler,
-                    method=method,
-                    domain=domain,
-                    params=params,
-                    auth_name=auth_name,
-                    key=key,
-                    auth_type=auth_type,  # header or cookie
-                    auth_value=auth_value,  # header or cookie name
-                    auth_redirect=auth_redirect,
-                    # redirect location upon failure,
-                    # if not set, 403 is returned.
-                    auth_verify=auth_verify,
-                ),
+            raw_route = dict(
+                name=name,
+                path=None,
+                raw_path=path,
+                handler=handler,
+                method=method,
+                domain=domain,
+                params=params,
+                auth_name=auth_name,
+                key=key,
+                auth_type=auth_type,  # header or cookie
+                auth_value=auth_value,  # header or cookie name
+                auth_redirect=auth_redirect,
+                # redirect location upon failure,
+                # if not set, 403 is returned.
+                auth_verify=auth_verify,
+                # the response cache policy, see `qor.cache.CachePolicy`
+                cache=cache,
             )
+            self._raw_routes.append(raw_route)
+            self._raw_index.setdefault((domain, path, method), raw_route)
 
     def route(
         self,
@@ -62,6 +62,11 @@ class JinjaAdapter(BaseTemplateAdapter):
             loader=self.loader_cls(searchpath=self.search_paths),
             autoescape=select_autoescape(),
         )
+        # the `tojson` filter uses the app JSON codec
+        self.env.policies["json.dumps_function"] = self.dumps_json
+
+    def dumps_json(self, value, **kwargs) -> str:
+        return self.app.json_codec.dumps(value)
 
     def get_template(
         self, template_name: Union[str, Template, List[Union[str, Template]]]
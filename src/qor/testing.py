@@ -0,0 +1,179 @@
+"""stand-in objects for the `kore` handles, they let the `Qor` apps be
+registered & called without the `kore` server, in tests & benchmarks.
+"""
+
+import asyncio
+import inspect
+from typing import Callable, Dict, List, Optional, Tuple
+
+from qor import constants
+from qor.app import Qor
+from qor.devserver import DevQueue
+
+
+class FakeKoreDomain:
+    """stand-in for the domain handle returned by `kore.domain`.
+    It records the registered routes instead of serving them.
+    """
+
+    def __init__(self, name: str = "*") -> None:
+        self.name = name
+        self.routes: List[Dict] = []
+
+    def route(self, url: str, callback: Callable, methods: list, **kwargs):
+        self.routes.append(
+            dict(url=url, callback=callback, methods=methods, **kwargs)
+        )
+
+
+def attach_fake_domain(app, name: str = "*") -> FakeKoreDomain:
+    """set fake domain as the default domain of the app"""
+    domain = FakeKoreDomain(name)
+    app._domains[name] = domain
+    app._default_domain = domain
+    return domain
+
+
+class FakeConnection:
+    """stand-in for `kore.connection`"""
+
+    def __init__(self, addr: str = "127.0.0.1") -> None:
+        self.addr = addr
+
+    def disconnect(self):
+        pass
+
+
+class FakeKoreRequest:
+    """stand-in for the `kore` request object, the response is recorded in
+    `status`, `response_headers` & `response_body`.
+    """
+
+    def __init__(
+        self,
+        path: str = "/",
+        method: str = "get",
+        headers: Optional[Dict[str, str]] = None,
+        body: bytes = b"",
+        arguments: Optional[Dict[str, str]] = None,
+        cookies: Optional[Dict[str, str]] = None,
+        host: str = "localhost",
+        agent: str = "qor-testing",
+        body_path: Optional[str] = None,
+    ) -> None:
+        self.path = path
+        self.method = constants.METHOD_NAMES[method.lower()]
+        self.host = host
+        self.agent = agent
+        self.body = body
+        self.body_path = body_path
+        self.connection = FakeConnection()
+        self._headers = {
+            name.lower(): value for name, value in (headers or {}).items()
+        }
+        self._arguments = arguments or {}
+        self._cookies = cookies or {}
+        self._body_offset = 0
+        self.status = None
+        self.response_headers: Dict[str, str] = {}
+        self.response_body = None
+
+    def headers(self) -> Dict[str, str]:
+        return dict(self._headers)
+
+    def request_header(self, name: str) -> Optional[str]:
+        return self._headers.get(name.lower())
+
+    def response_header(self, name: str, value: str) -> None:
+        self.response_headers[name] = value
+
+    def response(self, status: int, body: bytes) -> None:
+        self.status = status
+        self.response_body = body
+
+    def argument(self, name: str) -> Optional[str]:
+        return self._arguments.get(name)
+
+    def cookie(self, name: str) -> Optional[str]:
+        return self._cookies.get(name)
+
+    def body_read(self, length: int = 1024) -> Tuple[int, bytes]:
+        if length > 1024:
+            raise RuntimeError("can't read more than 1024 bytes")
+        chunk = self.body[self._body_offset : self._body_offset + length]
+        self._body_offset += len(chunk)
+        return len(chunk), chunk
+
+    def populate_get(self) -> None:
+        pass
+
+    def populate_post(self) -> None:
+        pass
+
+    def populate_multi(self) -> None:
+        pass
+
+    def populate_cookies(self) -> None:
+        pass
+
+
+class FakeKore:
+    """stand-in for the `kore` module coroutine functions, `suspend`,
+    `gather` & the `queue` run on the `asyncio` event loop of `run_handler`.
+    """
+
+    async def suspend(self, milliseconds: int):
+        await asyncio.sleep(milliseconds / 1000)
+
+    def queue(self) -> DevQueue:
+        return DevQueue()
+
+    async def gather(self, *coroutines, concurrency: int = 0):
+        return await asyncio.gather(*coroutines)
+
+
+def attach_fake_kore(app) -> FakeKore:
+    """set fake `kore` module on the app, for `app.suspend`, `app.gather` &
+    `app.queue`"""
+    app.kore = FakeKore()
+    return app.kore
+
+
+def run_handler(handler: Callable, kore_request, *args, **kwargs):
+    """call the registered handler like `kore`, the returned coroutine of
+    the async handlers is run to completion on a new event loop."""
+    rv = handler(kore_request, *args, **kwargs)
+    if inspect.iscoroutine(rv):
+        return asyncio.run(rv)
+    return rv
+
+
+def make_app(
+    config: Optional[dict] = None, fake_kore: bool = False, **kwargs
+) -> Tuple[Qor, FakeKoreDomain]:
+    """create `Qor` app with fake default domain, & fake `kore` module if
+    `fake_kore`, the other keyword arguments are passed to `Qor`.
+
+    Example
+
+    >> app, domain = make_app({"etag": True})
+    >> @app.get("/")
+    >> def index(request, **kwargs):
+    >>     return "hello"
+    >> assert call(domain).response_body == b"hello"
+    """
+    app = Qor(config=config or {}, **kwargs)
+    domain = attach_fake_domain(app)
+    if fake_kore:
+        attach_fake_kore(app)
+    return app, domain
+
+
+def call(
+    domain: FakeKoreDomain, path: str = "/", *args, index: int = 0, **kwargs
+) -> FakeKoreRequest:
+    """call the `index` registered route of the domain with new fake request
+    of the `path` & the `kwargs`, the `args` are the route arguments."""
+    kore_request = FakeKoreRequest(path, **kwargs)
+    run_handler(domain.routes[index]["callback"], kore_request, *args)
+    return kore_request
@@ -1,19 +1,58 @@
+import functools
 import importlib
 import importlib.util
-import json
+import inspect
 import logging
 import os
 import pkgutil
 import sys
+from contextlib import contextmanager
 from importlib.machinery import ModuleSpec
-from typing import TYPE_CHECKING, Any, Tuple, cast
-
+from types import GeneratorType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Optional,
+    Tuple,
+    cast,
+)
+
+from qor.codecs import (
+    JSONCodec,
+    JSONStream,
+    NDJSONStream,
+    default_json_codec,
+)
 from qor.constants import METHOD_CODES
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 if TYPE_CHECKING:
     from qor import Qor
 
 
+@contextmanager
+def file_lock(path: str):
+    """hold an exclusive lock on the `path` file in the context, So the `kore`
+    workers don't interleave their read-modify-write of a shared file.
+
+    N.B:. it locks nothing where `fcntl` isn't available.
+    """
+    with open(path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
 def import_module_by_path(path: str, module_name: str):
     spec: ModuleSpec = cast(
         ModuleSpec, importlib.util.spec_from_file_location(module_name, path)
@@ -45,16 +84,19 @@ def int_to_method_name(id: int):
     return METHOD_CODES[id]
 
 
+def is_async_callable(func) -> bool:
+    """whether calling the object returns a coroutine, `async def` functions,
+    their partials & the objects that have `async def __call__`."""
+    while isinstance(func, functools.partial):
+        func = func.func
+    return inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(
+        getattr(func, "__call__", None)
+    )
+
+
 def to_bytes(value):
-    if isinstance(value, bytes):
-        return value
-    if isinstance(value, str):
-        return str.encode(value)
-    elif isinstance(value, (int, float)):
-        return str.encode(str(value))
-    if isinstance(value, (dict, list, tuple)):
-        return str.encode(json.dumps(value))
-    return value
+    """encode the value using the default encoders of `ReturnValueParser`"""
+    return _default_parser.encode(value)
 
 
 def to_string(value):
@@ -63,7 +105,7 @@ def to_string(value):
     if isinstance(value, str):
         return value
     if isinstance(value, (dict, list, tuple)):
-        return json.dumps(value)
+        return default_json_codec().dumps(value)
     return value
 
 
@@ -89,62 +131,237 @@ class cached_property(object):
         return attr
 
 
-class ReturnValueParser:
-    def __init__(self, app: "Qor") -> None:
-        self.app = app
+class slot_cached_property(object):
+    """
+    `cached_property` for the classes that use `__slots__`, the values are
+    cached in the `_cached` slot of the instance, a dict that is created on the
+    first use. Set `_cached` to None to clear the cached values.
+    """
 
-    def __call__(self, return_value: Any, *args, **kwargs) -> Any:
-        status = None
-        value_bytes = return_value
-        original = None
-        exception = None
+    def __init__(self, factory):
+        self._attr_name = factory.__name__
+        self._factory = factory
+        self.__doc__ = factory.__doc__
 
-        if isinstance(return_value, tuple) and len(return_value) == 2:
-            try:
-                status = int(return_value[0])
-                value_bytes = to_bytes(return_value[1])
-                original = type(return_value[1])
-            except Exception as e:
-                logging.error(e)
-                exception = e
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        cached = instance._cached
+        if cached is None:
+            cached = instance._cached = {}
         else:
             try:
-                status = 200
-                value_bytes = to_bytes(return_value)
-                original = type(return_value)
-            except Exception as e:
-                logging.error(e)
-                exception = e
-        if exception is None:
-            return status, value_bytes, original
-        raise Exception("can't parse value. ") from (exception)
+                return cached[self._attr_name]
+            except KeyError:
+                pass
+        attr = cached[self._attr_name] = self._factory(instance)
+        return attr
 
+    def __set__(self, instance, value):
+        if instance._cached is None:
+            instance._cached = {}
+        instance._cached[self._attr_name] = value
+
+
+def _encode_str(value):
+    return value.encode()
+
+
+def _encode_number(value):
+    return str(value).encode()
+
+
+def _encode_json(value):
+    return default_json_codec().dumps_bytes(value)
 
-def parse_return_value(value) -> Tuple[int, bytes, Any]:
-    status = None
-    value_bytes = value
-    original = None
-    exception = None
 
-    if isinstance(value, tuple) and len(value) == 2:
+def _encode_stream(value):
+    return value.encode(default_json_codec())
+
+
+def _encode_generator(value):
+    return JSONStream(value).encode(default_json_codec())
+
+
+def _encode_response(value):
+    return value.body
+
+
+class Response:
+    """pre-encoded response that carries its own headers, the handlers can
+    return it instead of the status & value.
+
+    Example
+
+    >> @app.route("/robots.txt")
+    >> def robots(request):
+    >>     return Response(ROBOTS, headers={"Cache-Control": "max-age=3600"},
+    >>                     content_type="text/plain")
+    """
+
+    __slots__ = ("body", "status", "headers")
+
+    def __init__(
+        self, body=b"", status=200, headers=None, content_type=None
+    ) -> None:
+        self.body = body
+        self.status = status
+        self.headers = dict(headers) if headers else {}
+        if content_type:
+            self.headers["Content-Type"] = content_type
+
+    def __repr__(self) -> str:
+        return f"<Response {self.status}>"
+
+
+class ReturnValueParser:
+    """convert the handlers return values to (status, bytes, original type)
+    using the `encoders` table of the value type, the encoders of the value
+    type bases are used if it has no encoder.
+
+    Use `register_encoder` to support other types.
+    """
+
+    # type: encoder that converts the value to a bytes-like object, None for
+    # the bytes-like types that are passed through without copying.
+    encoders: Dict[type, Optional[Callable[[Any], Any]]] = {
+        bytes: None,
+        bytearray: None,
+        memoryview: None,
+        str: _encode_str,
+        int: _encode_number,
+        float: _encode_number,
+        dict: _encode_json,
+        list: _encode_json,
+        tuple: _encode_json,
+        # the records are encoded incrementally
+        JSONStream: _encode_stream,
+        GeneratorType: _encode_generator,
+        Response: _encode_response,
+    }
+    # type: the response content type, if the handler didn't set it
+    content_types: Dict[type, str] = {
+        dict: "application/json",
+        list: "application/json",
+        tuple: "application/json",
+        JSONStream: JSONStream.content_type,
+        NDJSONStream: NDJSONStream.content_type,
+        GeneratorType: "application/json",
+    }
+    default_content_type = "text/html"
+
+    def __init__(self, app: "Qor") -> None:
+        self.app = app
+        # the JSON values are encoded by the app codec
+        app_encoders = {
+            _encode_json: self.encode_json,
+            _encode_stream: self.encode_stream,
+            _encode_generator: self.encode_generator,
+        }
+        self.encoders = {
+            value_type: app_encoders.get(encoder, encoder)
+            for value_type, encoder in self.encoders.items()
+        }
+        self.content_types = dict(self.content_types)
+        # the encoder & the content type of each type, resolved once
+        self._type_encoders: Dict[type, Optional[Callable[[Any], Any]]] = {}
+        self._type_content_types: Dict[type, str] = {}
+
+    @property
+    def json_codec(self) -> JSONCodec:
+        if self.app is None:
+            return default_json_codec()
+        return self.app.json_codec
+
+    def encode_json(self, value) -> bytes:
+        return self.json_codec.dumps_bytes(value)
+
+    def encode_stream(self, value: JSONStream) -> bytearray:
+        return value.encode(self.json_codec)
+
+    def encode_generator(self, value) -> bytearray:
+        return JSONStream(value).encode(self.json_codec)
+
+    def register_encoder(
+        self,
+        value_type: type,
+        encoder: Optional[Callable[[Any], Any]],
+        content_type: Optional[str] = None,
+    ):
+        """use the encoder for the return values of this type & its subclasses,
+        the encoder should return a bytes-like object."""
+        self.encoders[value_type] = encoder
+        if content_type:
+            self.content_types[value_type] = content_type
+        self._type_encoders = {}
+        self._type_content_types = {}
+
+    def resolve(self, value_type: type) -> tuple:
+        """return the (encoder, content type) of the type"""
+        if value_type not in self._type_encoders:
+            # the values of unknown types are returned as they are
+            encoder = None
+            for base in value_type.__mro__:
+                if base in self.encoders:
+                    encoder = self.encoders[base]
+                    break
+            content_type = self.default_content_type
+            for base in value_type.__mro__:
+                if base in self.content_types:
+                    content_type = self.content_types[base]
+                    break
+            self._type_encoders[value_type] = encoder
+            self._type_content_types[value_type] = content_type
+        return (
+            self._type_encoders[value_type],
+            self._type_content_types[value_type],
+        )
+
+    def encode(self, value) -> Any:
+        value_type = type(value)
         try:
-            status = int(value[0])
-            value_bytes = to_bytes(value[1])
-            original = type(value[1])
-        except Exception as e:
-            logging.error(e)
-            exception = e
-    else:
+            encoder = self._type_encoders[value_type]
+        except KeyError:
+            encoder = self.resolve(value_type)[0]
+        if encoder is None:
+            return value
+        return encoder(value)
+
+    def content_type(self, value_type: type) -> str:
         try:
-            status = 200
-            value_bytes = to_bytes(value)
-            original = type(value)
+            return self._type_content_types[value_type]
+        except KeyError:
+            return self.resolve(value_type)[1]
+
+    def __call__(self, return_value: Any, *args, **kwargs) -> Any:
+        status = 200
+        value = return_value
+        value_type = type(value)
+        try:
+            if value_type is tuple or isinstance(value, tuple):
+                if len(value) == 2:
+                    status = int(value[0])
+                    value = value[1]
+                    value_type = type(value)
+            elif value_type is Response:
+                return value.status, value.body, Response
+            try:
+                encoder = self._type_encoders[value_type]
+            except KeyError:
+                encoder = self.resolve(value_type)[0]
+            if encoder is None:
+                return status, value, value_type
+            return status, encoder(value), value_type
         except Exception as e:
             logging.error(e)
-            exception = e
-    if exception is None:
-        return status, value_bytes, original
-    raise Exception("can't parse value. ") from (exception)
+            raise Exception("can't parse value. ") from (e)
+
+
+_default_parser = ReturnValueParser(None)
+
+
+def parse_return_value(value) -> Tuple[int, bytes, Any]:
+    return _default_parser(value)
 
 
 def get_path(import_name) -> str:
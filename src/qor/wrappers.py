@@ -1,10 +1,28 @@
-import json
 import traceback
-from inspect import isclass
-from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple, Union
+from inspect import isawaitable, isclass
+from itertools import chain
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import qor.constants as constants
-from qor.utils import cached_property
+from qor.cache import CACHED_METHODS, CachePolicy
+from qor.conditional import (
+    etag_matches,
+    http_date,
+    make_etag,
+    modified_since,
+    quote_etag,
+)
+from qor.router import compile_args_converter
+from qor.utils import Response, is_async_callable, slot_cached_property
 
 if TYPE_CHECKING:
     from qor.app import BaseApp, Qor, Route
@@ -16,7 +34,63 @@ class BaseRequest:
     `get_qor_context` method
     """
 
-    ...
+    __slots__ = ()
+
+
+class ErrorHandlersIndex:
+    """the app error handlers, indexed by the status code & the exception type.
+
+    The callbacks of an exception class are resolved once along its MRO and
+    cached, in the registration order of the error handlers.
+    """
+
+    def __init__(self, error_handlers) -> None:
+        self.by_status: Dict[int, Tuple[Callable, ...]] = {}
+        # exception type -> [(registration order, callback)]
+        self.by_type: Dict[type, list] = {}
+        self._resolved: Dict[type, Tuple[Callable, ...]] = {}
+
+        by_status: Dict[int, list] = {}
+        for order, error_handler in enumerate(error_handlers):
+            if not isinstance(error_handler, dict):
+                continue
+            error = error_handler.get("kwargs", {}).get("error")
+            cb = error_handler.get("func", None)
+            if isinstance(error, int):
+                by_status.setdefault(error, []).append(cb)
+            elif isclass(error):
+                self.by_type.setdefault(error, []).append((order, cb))
+        for status, callbacks in by_status.items():
+            self.by_status[status] = tuple(callbacks)
+
+    def __bool__(self) -> bool:
+        return bool(self.by_status or self.by_type)
+
+    def callbacks(self) -> Iterator[Callable]:
+        """all the indexed callbacks"""
+        for callbacks in self.by_status.values():
+            yield from callbacks
+        for matched in self.by_type.values():
+            for _, cb in matched:
+                yield cb
+
+    def for_status(self, status: int) -> Tuple[Callable, ...]:
+        return self.by_status.get(status, ())
+
+    def for_exception(self, exc: Exception) -> Tuple[Callable, ...]:
+        exc_class = exc.__class__
+        callbacks = self._resolved.get(exc_class)
+        if callbacks is None:
+            callbacks = self.resolve(exc_class)
+            self._resolved[exc_class] = callbacks
+        return callbacks
+
+    def resolve(self, exc_class: type) -> Tuple[Callable, ...]:
+        matched = []
+        for base in exc_class.__mro__:
+            matched.extend(self.by_type.get(base, ()))
+        matched.sort(key=lambda item: item[0])
+        return tuple(cb for _, cb in matched)
 
 
 class BaseWrapper:
@@ -33,6 +107,9 @@ class BaseWrapper:
         # unknown request type
         #
 
+    def build_pipeline(self):
+        """called when the app starts, after freezing its callbacks"""
+
     def get_qor_request(self, request, *args, **kwargs) -> "Request":
         """this method will make sure to return qor `Request` objects
         possibility of request argument:
@@ -48,12 +125,17 @@ class BaseWrapper:
         `kore` handler that are not aware of our `Request` object.
         """
         if isinstance(request, BaseRequest):
-            return request
-        _request = getattr(request, "_request", None)
+            _request = request
+        else:
+            _request = getattr(request, "_request", None)
         if _request:
+            if self.route is not None:
+                _request.set_route(self.route)
             return _request
 
-        qor_request = self.app.wrap_request(request, *args, **kwargs)
+        qor_request = self.app.wrap_request(
+            request, *args, route=self.route, **kwargs
+        )
         setattr(request, "_request", qor_request)
         return qor_request
 
@@ -74,142 +156,458 @@ class DefaultHandlerWrapper(BaseWrapper):
     def __init__(self, func, app, route: "Route", **kwargs) -> None:
         super().__init__(func=func, app=app, route=route, **kwargs)
         self.return_value_parser = app.return_value_parser
-        self.re_parts = []
-        for part in self.route.parts:
-            if part.get("isreg", False):
-                self.re_parts.append(part)
+        self.re_parts = [part for part in self.route.parts if part.isreg]
         self.re_parts_length = len(self.re_parts)
-
-    def __prepare_args(self, *args):
-        rv = []
-        parts = self.re_parts
-        if len(args) == self.re_parts_length:
-            for index, arg in enumerate(args):
-                part = parts[index]
-                rv.append(part.get("to_python", lambda v: v)(arg))
-            return rv
-        return args
-
-    def __run_before_handler(
-        self,
-        request: "Request",
-        *args,
-        **kwargs,
-    ):
-        before_handler_callbacks = self.app._before_handler_callbacks
-        for cb in before_handler_callbacks:
+        # None if the args need no conversion
+        self.convert_args = compile_args_converter(self.re_parts)
+        self.profile = app.config.get("route_profile", False)
+        self.hits = 0
+        # the full pipeline is used till `build_pipeline` is called
+        self._has_before = self._has_after = self._has_error_handlers = True
+        self._release_requests = False
+        # the response cache of GET & HEAD requests, see `qor.cache`
+        self.cache_policy = CachePolicy.from_value(self.route.cache)
+        # hash the GET & HEAD responses bodies to set their `ETag`
+        self._auto_etag = app.config.get("etag", False)
+        # None if the compression is disabled, see `qor.compression`
+        self._compressor = app.compressor
+        # the route auth that has `async` verifier, it is checked by the
+        # pipeline instead of `kore`, set by `Qor` before `build_pipeline`
+        self.async_auth: Optional[dict] = None
+        self._is_async = False
+        self._pipeline = self._full_pipeline
+
+    def _run_callbacks(self, callbacks, request: "Request", *args, **kwargs):
+        """run the callbacks till one of them returns a value"""
+        for cb in callbacks:
             rv = cb(request, *args, **kwargs)
             if rv is not None:
                 return rv
 
-    def __run_after_handler(
-        self,
-        request: "Request",
-        *args,
-        **kwargs,
-    ):
-        after_handler_callbacks = self.app._after_handler_callbacks
-        for cb in after_handler_callbacks:
-            rv = cb(request, *args, **kwargs)
-            if rv is not None:
-                request.return_value = rv
-                return
+    def _error_callbacks(self, status_or_exc: Union[int, Exception]):
+        """the error handlers of the status code or the exception"""
+        index = self.app.error_handlers_index
+        if isinstance(status_or_exc, int):
+            return index.for_status(status_or_exc)
+        if isinstance(status_or_exc, Exception):
+            return index.for_exception(status_or_exc)
+        return ()
+
+    def _run_after(self, request: "Request", *args, **kwargs):
+        rv = self._run_callbacks(
+            self.app._after_handler_callbacks, request, *args, **kwargs
+        )
+        if rv is not None:
+            request.return_value = rv
+        # the callbacks may change the return value in place
+        request._parsed_return_value = None
 
-    def __run_error_callbacks(
+    def _run_error_callbacks(
         self,
         request: "Request",
         status_or_exc: Union[int, Exception],
         *args,
         **kwargs,
     ):
-        _error_handlers = self.app._error_handlers
-        is_int = isinstance(status_or_exc, int)
-        is_exc = isinstance(status_or_exc, Exception)
-
-        if is_int:
-            for error_handler in _error_handlers:
-                error = error_handler.get("kwargs", {}).get("error")
-                cb = error_handler.get("func", None)
-                if isinstance(error, int) and error == status_or_exc:
-                    error_cb_rv = cb(request, *args, **kwargs)
-                    if error_cb_rv is not None:
-                        request.return_value = error_cb_rv
-                        return
-        elif is_exc:
-            for error_handler in _error_handlers:
-                error = error_handler.get("kwargs", {}).get("error")
-                cb = error_handler.get("func", None)
-                if isclass(error) and issubclass(
-                    status_or_exc.__class__, error
-                ):
-                    error_cb_rv = cb(request, *args, **kwargs)
-                    if error_cb_rv is not None:
-                        request.return_value = error_cb_rv
-                        return
+        rv = self._run_callbacks(
+            self._error_callbacks(status_or_exc), request, *args, **kwargs
+        )
+        if rv is not None:
+            request.return_value = rv
+        # the callbacks may change the return value in place
+        request._parsed_return_value = None
+
+    def parse_return_value(self, request: "Request", *args, **kwargs):
+        """parse the request return value, the result is cached on the request
+        So the same return value is parsed once, till the after & error
+        callbacks run."""
+        return_value = request.return_value
+        parsed = request._parsed_return_value
+        if parsed is not None and parsed[0] is return_value:
+            return parsed[1]
+        rv = self.return_value_parser(
+            return_value, self, self.app, request, *args, **kwargs
+        )
+        request._parsed_return_value = (return_value, rv)
+        request.response_status = rv[0]
+        request.response_data = rv[1]
+        return rv
 
     def send_response(self, request: "Request", *args, **kwargs):
-        status, data, original_type = self.return_value_parser(
-            request.return_value, self, self.app, request, *args, **kwargs
+        status, data, original_type = self.parse_return_value(
+            request, *args, **kwargs
         )
+        if original_type is Response:
+            response = request.return_value
+            if type(response) is not Response:
+                # (status, response)
+                response = response[1]
+            for name, value in response.headers.items():
+                request.response_header(name, value)
         if not request.get_response_header("Content-Type"):
-            if original_type in (dict, tuple, list):
-                request.response_header("Content-Type", "application/json")
-            else:
-                request.response_header("Content-Type", "text/html")
+            request.response_header(
+                "Content-Type",
+                self.return_value_parser.content_type(original_type),
+            )
+        etag = request.get_response_header("ETag")
+        # the hashed ETag identifies the body, its compressed variants are cached
+        content_hash = None
+        if (
+            etag is None
+            and self._auto_etag
+            and status == 200
+            and request.request.method in CACHED_METHODS
+        ):
+            etag = content_hash = make_etag(data)
+            request.response_header("ETag", etag)
+        compressor = self._compressor
+        if compressor is not None and request.get_response_header(
+            "Content-Encoding"
+        ):
+            compressor = None
+        size = len(data)
+        # the unsafe methods already ran, they can't be answered by 304
+        if (
+            etag is not None
+            and 200 <= status < 300
+            and request.request.method in CACHED_METHODS
+            and etag_matches(request.request_header("If-None-Match"), etag)
+        ):
+            status, data = 304, b""
+        # the compression headers & the coded `ETag` are set on the `kore`
+        # request only, So the response cache stores the plain body headers
+        kore_request = request.request
+        if compressor is None:
+            if etag is not None:
+                kore_request.response_header("ETag", etag)
+        elif status == 304:
+            # the size of the handlers 304 bodies is unknown
+            compressor.response_encoding(
+                kore_request,
+                request.get_response_header("Content-Type"),
+                size or None,
+                etag,
+            )
+        else:
+            data = compressor.compress_response(
+                kore_request,
+                data,
+                request.get_response_header("Content-Type"),
+                content_hash,
+                etag=etag,
+            )
 
-        request.response(status, data)
+        kore_request.response(status, data)
+
+    def pipeline_request(self, kore_request, *args, **kwargs) -> "Request":
+        """the `Request` of the `kore` request, the created ones are owned by
+        the pipeline & released after the response if the pool is enabled.
+        """
+        created = getattr(kore_request, "_request", None) is None
+        qor_request = self.get_qor_request(kore_request, *args, **kwargs)
+        if (
+            created
+            and self._release_requests
+            and qor_request is not kore_request
+        ):
+            qor_request._owned = True
+        return qor_request
+
+    def build_pipeline(self):
+        """choose the call pipeline of this handler according to the app
+        callbacks. It is called when the app starts, after freezing the
+        callbacks, So the empty stages are skipped on each request.
+        """
+        app = self.app
+        self._has_before = bool(app._before_handler_callbacks)
+        self._has_after = bool(app._after_handler_callbacks)
+        self._has_error_handlers = bool(app.error_handlers_index)
+        self._release_requests = bool(app._request_pool_size)
+        self._is_async = (
+            self.async_auth is not None
+            or is_async_callable(self.func)
+            or any(
+                is_async_callable(cb)
+                for cb in chain(
+                    app._before_handler_callbacks,
+                    app._after_handler_callbacks,
+                    app.error_handlers_index.callbacks(),
+                )
+            )
+        )
+        if self._is_async:
+            # `kore` runs the returned coroutine in its event loop
+            self._pipeline = self._async_pipeline
+        elif (
+            self.profile
+            or self.cache_policy is not None
+            or self._has_before
+            or self._has_after
+            or self._has_error_handlers
+        ):
+            self._pipeline = self._full_pipeline
+        else:
+            self._pipeline = self._plain_pipeline
 
     def __call__(self, kore_request, *args: Any, **kwargs: Any) -> Any:
-        args = self.__prepare_args(*args)
+        return self._pipeline(kore_request, *args, **kwargs)
+
+    def _plain_pipeline(self, kore_request, *args: Any, **kwargs: Any):
+        """the pipeline of the apps that have no callbacks"""
+        if self.convert_args is not None:
+            args = self.convert_args(args)
+        qor_request = self.pipeline_request(kore_request, *args, **kwargs)
+        qor_request.return_value = self.func(qor_request, *args, **kwargs)
+        self.send_response(qor_request, *args, **kwargs)
+        self._release(qor_request)
+
+    # the stages of the full & the async pipelines
+
+    def _begin(self, kore_request, args: tuple, kwargs: dict):
+        """the early cache lookup, the args conversion & the request. Returns
+        None if the response is sent from the cache, else the request, the
+        converted args & the cache key."""
+        cache_key = None
+        policy = self.cache_policy
+        if policy is not None and kore_request.method in CACHED_METHODS:
+            cache_key = policy.key(kore_request)
+            if policy.early and self.app.response_cache.send(
+                kore_request, cache_key, self.route.name
+            ):
+                return None
+        if self.convert_args is not None:
+            args = self.convert_args(args)
+        qor_request = self.pipeline_request(kore_request, *args, **kwargs)
+        return qor_request, args, cache_key
+
+    def _send_cached(self, kore_request, cache_key) -> bool:
+        """the cache lookup after the before handler callbacks"""
+        return (
+            cache_key is not None
+            and not self.cache_policy.early
+            and self.app.response_cache.send(
+                kore_request, cache_key, self.route.name
+            )
+        )
 
-        qor_request = self.get_qor_request(kore_request, *args, **kwargs)
-        qor_request.set_route(self.route)
+    def _finish(self, request: "Request", cache_key, args: tuple, kwargs: dict):
+        """send the response, cache it if it has a cache key"""
+        self.send_response(request, *args, **kwargs)
+        if cache_key is not None:
+            self.app.response_cache.store(
+                cache_key, self.cache_policy, request, self.route.name
+            )
+        self._release(request)
+
+    def _send_error(self, request: "Request", args: tuple, kwargs: dict):
+        """send the response of the error handlers of an exception, False if
+        they returned nothing. The request is released in both cases."""
+        if not request.return_value:
+            self._release(request)
+            return False
+        self.send_response(request, *args, **kwargs)
+        self._release(request)
+        return True
+
+    def _release(self, request: "Request"):
+        if self._release_requests:
+            self.app.release_request(request)
+
+    def _full_pipeline(self, kore_request, *args: Any, **kwargs: Any):
+        if self.profile:
+            self.app.count_route_hit(self)
+        begun = self._begin(kore_request, args, kwargs)
+        if begun is None:
+            return
+        qor_request, args, cache_key = begun
 
         try:
-            rv = self.__run_before_handler(qor_request, *args, **kwargs)
-            if rv is not None:
-                qor_request.return_value = rv
-                self.__run_after_handler(qor_request, *args, **kwargs)
-                self.send_response(qor_request, *args, **kwargs)
+            if self._has_before:
+                rv = self._run_callbacks(
+                    self.app._before_handler_callbacks,
+                    qor_request,
+                    *args,
+                    **kwargs,
+                )
+                if rv is not None:
+                    qor_request.return_value = rv
+                    if self._has_after:
+                        self._run_after(qor_request, *args, **kwargs)
+                    self._finish(qor_request, None, args, kwargs)
+                    return
+            if self._send_cached(kore_request, cache_key):
+                self._release(qor_request)
                 return
             # call the handler function
-            rv = self.func(qor_request, *args, **kwargs)
-            qor_request.return_value = rv
-            # try to parse the return value
-            status, data, original_type = self.return_value_parser(
-                rv, self, self.app, qor_request, *args, **kwargs
-            )
-            qor_request.response_status = status
-            qor_request.response_data = data
-
+            qor_request.return_value = self.func(qor_request, *args, **kwargs)
+            status = self.parse_return_value(qor_request, *args, **kwargs)[0]
             if status >= 400:
-                self.__run_error_callbacks(
+                if self._has_error_handlers:
+                    self._run_error_callbacks(
+                        qor_request, status, *args, **kwargs
+                    )
+            elif self._has_after:
+                # run the after_handler callbacks if there is no error
+                self._run_after(qor_request, *args, **kwargs)
+            self._finish(qor_request, cache_key, args, kwargs)
+
+        except Exception as e:
+            if self._has_error_handlers:
+                self._run_error_callbacks(qor_request, e, *args, **kwargs)
+            if not self._send_error(qor_request, args, kwargs):
+                raise
+
+    async def _run_async_callbacks(
+        self, callbacks, request: "Request", *args, **kwargs
+    ):
+        """run the callbacks till one of them returns a value, the callbacks
+        may be sync or async."""
+        for cb in callbacks:
+            rv = cb(request, *args, **kwargs)
+            if isawaitable(rv):
+                rv = await rv
+            if rv is not None:
+                return rv
+
+    async def _run_async_error_callbacks(
+        self,
+        request: "Request",
+        status_or_exc: Union[int, Exception],
+        *args,
+        **kwargs,
+    ):
+        rv = await self._run_async_callbacks(
+            self._error_callbacks(status_or_exc), request, *args, **kwargs
+        )
+        if rv is not None:
+            request.return_value = rv
+        # the callbacks may change the return value in place
+        request._parsed_return_value = None
+
+    async def _verify_async_auth(self, kore_request) -> bool:
+        """verify the request like `kore` does, the failed requests are
+        redirected to the auth `redirect` or get 403."""
+        auth = self.async_auth
+        if auth["type"] == "cookie":
+            kore_request.populate_cookies()
+            value = kore_request.cookie(auth["value"])
+        else:
+            value = kore_request.request_header(auth["value"])
+        if value is not None:
+            verified = auth["verify"](kore_request, value)
+            if isawaitable(verified):
+                verified = await verified
+            if verified:
+                return True
+        redirect = auth.get("redirect")
+        if redirect:
+            kore_request.response_header("Location", redirect)
+            kore_request.response(302, b"")
+        else:
+            kore_request.response(403, b"")
+        return False
+
+    async def _async_pipeline(self, kore_request, *args: Any, **kwargs: Any):
+        """the pipeline of the async handlers & callbacks, the sync ones are
+        called as they are."""
+        if self.profile:
+            self.app.count_route_hit(self)
+        if self.async_auth is not None and not await self._verify_async_auth(
+            kore_request
+        ):
+            return
+        begun = self._begin(kore_request, args, kwargs)
+        if begun is None:
+            return
+        qor_request, args, cache_key = begun
+
+        try:
+            if self._has_before:
+                rv = await self._run_async_callbacks(
+                    self.app._before_handler_callbacks,
                     qor_request,
-                    status,
                     *args,
                     **kwargs,
                 )
-                self.send_response(qor_request, *args, **kwargs)
-                return
-
-            else:
-                # run th eafter_handler callbacks if there is no error
-                self.__run_after_handler(qor_request, *args, **kwargs)
-                self.send_response(qor_request, *args, **kwargs)
+                if rv is not None:
+                    qor_request.return_value = rv
+                    if self._has_after:
+                        await self._run_async_after(
+                            qor_request, *args, **kwargs
+                        )
+                    self._finish(qor_request, None, args, kwargs)
+                    return
+            if self._send_cached(kore_request, cache_key):
+                self._release(qor_request)
                 return
+            rv = self.func(qor_request, *args, **kwargs)
+            if isawaitable(rv):
+                rv = await rv
+            qor_request.return_value = rv
+            status = self.parse_return_value(qor_request, *args, **kwargs)[0]
+            if status >= 400:
+                if self._has_error_handlers:
+                    await self._run_async_error_callbacks(
+                        qor_request, status, *args, **kwargs
+                    )
+            elif self._has_after:
+                await self._run_async_after(qor_request, *args, **kwargs)
+            self._finish(qor_request, cache_key, args, kwargs)
 
         except Exception as e:
-            self.__run_error_callbacks(
-                qor_request,
-                e,
-                *args,
-                **kwargs,
-            )
-            if qor_request.return_value:
-                self.send_response(qor_request, *args, **kwargs)
-            else:
+            if self._has_error_handlers:
+                await self._run_async_error_callbacks(
+                    qor_request, e, *args, **kwargs
+                )
+            if not self._send_error(qor_request, args, kwargs):
                 raise
 
+    async def _run_async_after(self, request: "Request", *args, **kwargs):
+        rv = await self._run_async_callbacks(
+            self.app._after_handler_callbacks, request, *args, **kwargs
+        )
+        if rv is not None:
+            request.return_value = rv
+        # the callbacks may change the return value in place
+        request._parsed_return_value = None
+
+
+class MethodDispatcher:
+    """dispatch the requests of one `kore` route to the handler of the
+    request method. It is used when the methods of the same path have different
+    handlers, So the path still registered once in `kore`.
+
+    N.B:. `kore` sends the HEAD requests to the GET routes, So they are
+    handled by the GET handler, the other missing methods get 405.
+    """
+
+    def __init__(self, handlers: Dict[str, Callable]) -> None:
+        self.handlers = {
+            constants.METHOD_NAMES[method]: handler
+            for method, handler in handlers.items()
+        }
+        # method code: handler, with HEAD
+        self._dispatch = dict(self.handlers)
+        if constants.HTTP_METHOD_GET in self._dispatch:
+            self._dispatch.setdefault(
+                constants.HTTP_METHOD_HEAD,
+                self._dispatch[constants.HTTP_METHOD_GET],
+            )
+        self._allow = ", ".join(
+            constants.METHOD_CODES[method].upper() for method in self._dispatch
+        )
+
+    def __call__(self, kore_request, *args: Any, **kwargs: Any) -> Any:
+        handler = self._dispatch.get(kore_request.method)
+        if handler is None:
+            kore_request.response_header("Allow", self._allow)
+            kore_request.response(405, b"")
+            return None
+        return handler(kore_request, *args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<Method Dispatcher {self.handlers}>"
+
 
 class simple_wrapper(BaseWrapper):
     def __init__(
@@ -281,11 +679,9 @@ class Connection:
         """return the client remote address (ip)"""
         ...
 
-    def disconnect(self):
-        ...
+    def disconnect(self): ...
 
-    def websocket_send(self, data):
-        ...
+    def websocket_send(self, data): ...
 
 
 class Request(BaseRequest):
@@ -297,94 +693,144 @@ class Request(BaseRequest):
     HTTP_METHOD_OPTIONS = constants.HTTP_METHOD_OPTIONS  # 64
     HTTP_METHOD_PATCH = constants.HTTP_METHOD_PATCH  # 128
 
+    __slots__ = (
+        "request",
+        "app",
+        "route",
+        "args",
+        "kwargs",
+        "response_status",
+        "response_data",
+        "return_value",
+        "_parsed_return_value",
+        "_g",
+        "_response_headers",
+        "_populated",
+        "_json",
+        "_form",
+        "_cached",
+        "_owned",
+        "__weakref__",
+    )
+
     def __init__(
         self, kore_request, app: "Qor", route=None, *args, **kwargs
     ) -> None:
         self.request = kore_request
         self.app = app
         self.route = route
-        self.g = {}
-
+        self.args = args
+        self.kwargs = kwargs
+        # `g` & the response headers dicts are created on the first use
+        self._g = None
+        self._response_headers = None
         #
         self.response_status = None
-        self._response_headers = {}
         self.response_data = None
         self.return_value = None
+        # (return value, parsed return value)
+        self._parsed_return_value = None
         #
         self._populated = False
         self._json = None
         self._form = None
-        self.args = args
-        self.kwargs = kwargs
+        # the values of the `slot_cached_property`s
+        self._cached = None
+        # whether the handler pipeline created it & can reuse it, see
+        # `Qor.release_request`
+        self._owned = False
+
+    def reset(self):
+        """drop the references of the request, So it can be reused for another
+        `kore` request by calling `__init__` again, see `Qor.release_request`.
+        """
+        self.__init__(None, self.app)
+
+    def retain(self):
+        """keep the request after the response, So it is not reused for the
+        next requests. It must be called by the handlers that keep a reference
+        to the request, by a stored closure or a task for example.
+        """
+        self._owned = False
+
+    @property
+    def g(self) -> dict:
+        if self._g is None:
+            self._g = {}
+        return self._g
+
+    @g.setter
+    def g(self, value: dict):
+        self._g = value
 
-    @cached_property
+    @slot_cached_property
     def method(self) -> str:
         return constants.METHOD_CODES[self.request.method]
 
-    @cached_property
+    @slot_cached_property
     def host(self) -> str:
         """The domain as a unicode string."""
         return self.request.host
 
-    @cached_property
+    @slot_cached_property
     def agent(self) -> str:
         """The user agent as a unicode string."""
         return self.request.agent
 
-    @cached_property
+    @slot_cached_property
     def path(self) -> str:
         """The requested path as a unicode string."""
         return self.request.path
 
-    @cached_property
+    @slot_cached_property
     def body(self) -> bytes:  # PyBuffer
         """The entire incoming HTTP body as a PyBuffer."""
         return self.request.body
 
-    @cached_property
+    @slot_cached_property
     def headers(self) -> dict:
         """the request headers as dictionary"""
         return self.request.headers()
 
-    @cached_property
+    @slot_cached_property
     def _method_int(self) -> int:
         """The requested method as a PyLong. (kore.HTTP_METHOD_GET, etc)."""
         return self.request.method
 
-    @cached_property
+    @slot_cached_property
     def body_path(self) -> str:
         """The path to the HTTP body on disk (if enabled)."""
         return self.request.body_path
 
-    @cached_property
+    @slot_cached_property
     def connection(self) -> "Connection":
         """The underlying client connection as a kore.connection object."""
         return self.request.connection
 
-    @cached_property
+    @slot_cached_property
     def client_address(self) -> str:
         return self.connection.addr
 
-    @cached_property
+    @slot_cached_property
     def content_type(self) -> str:
         return self.request_header("Content-Type") or ""
 
-    @cached_property
+    @slot_cached_property
     def mimetype(self):
         return self.content_type.split(";")[0].strip()
 
-    @cached_property
+    @slot_cached_property
     def is_form(self):
         return self.mimetype in (
             "multipart/form-data",
             "application/x-www-form-urlencoded",
         )
 
-    @cached_property
+    @slot_cached_property
     def is_multipart(self):
         return self.mimetype == "multipart/form-data"
 
-    @cached_property
+    @slot_cached_property
     def is_json(self):
         return self.mimetype == "application/json"
 
@@ -408,6 +854,9 @@ class Request(BaseRequest):
         def handler(req):
             req.response(200, b'ok')
         """
+        etag = self.get_response_header("ETag")
+        if etag is not None:
+            self.request.response_header("ETag", etag)
         return self.request.response(status, body)
 
     def argument(self, name: str) -> Optional[str]:
@@ -482,12 +931,12 @@ class Request(BaseRequest):
                     req.response(500, b'')"""
         return self.request.file_lookup(name)
 
-    @cached_property
+    @slot_cached_property
     def json(self):
         self.populate()
         return self._json
 
-    @cached_property
+    @slot_cached_property
     def form(self):
         self.populate()
         return self._form
@@ -504,7 +953,7 @@ class Request(BaseRequest):
             self.populate_post()
             self._form = self.body
         elif self.is_json:
-            self._json = json.loads(self.body)
+            self._json = self.app.json_codec.loads(self.body)
 
     def populate_get(self) -> None:
         """
@@ -588,13 +1037,63 @@ class Request(BaseRequest):
             if xrequest != None:
                 req.response_header("x-response", xrequest)
 
-            req.response(200, b'hello world')"""
+            req.response(200, b'hello world')
+
+        N.B:. the `ETag` is sent by `response`, So the compressed bodies get the
+        ETag of their content coding, see `qor.conditional.coded_etag`."""
+        if self._response_headers is None:
+            self._response_headers = {}
         self._response_headers[name] = value
-        self.request.response_header(name, value)
+        if name != "ETag":
+            self.request.response_header(name, value)
 
     def get_response_header(self, name):
+        if self._response_headers is None:
+            return None
         return self._response_headers.get(name)
 
+    def set_etag(self, version, weak: bool = False) -> str:
+        """set the `ETag` response header from a version key, So the body is
+        not hashed & the `If-None-Match` requests get 304."""
+        etag = quote_etag(version, weak)
+        self.response_header("ETag", etag)
+        return etag
+
+    def is_not_modified(self, etag=None, last_modified=None) -> bool:
+        """the precondition hook, it sets the `ETag` & `Last-Modified` response
+        headers & returns True if the client cached response is still
+        current, So the handler can skip rendering the body.
+
+        N.B:. it is always False for the methods other than GET & HEAD.
+
+        Example
+
+        >> @app.get("/posts/<id:int>")
+        >> def post(request, id):
+        >>     version = db.post_version(id)
+        >>     if request.is_not_modified(etag=version):
+        >>         return 304, b""
+        >>     return render_post(id)
+        """
+        not_modified = False
+        if last_modified is not None:
+            self.response_header("Last-Modified", http_date(last_modified))
+        if etag is not None:
+            etag = self.set_etag(etag)
+        if self.request.method not in CACHED_METHODS:
+            return False
+        if etag is not None:
+            if_none_match = self.request_header("If-None-Match")
+            if if_none_match:
+                # `If-Modified-Since` is ignored if `If-None-Match` is sent
+                return etag_matches(if_none_match, etag)
+        if last_modified is not None:
+            if_modified_since = self.request_header("If-Modified-Since")
+            not_modified = bool(if_modified_since) and not modified_since(
+                if_modified_since, last_modified
+            )
+        return not_modified
+
     def websocket_handshake(self, onconnect, onmsg, ondisconnect) -> None:
         """Synopsis
         req.websocket_handshake(onconnect, onmsg, ondisconnect)
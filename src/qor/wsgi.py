@@ -1,8 +1,13 @@
+import mmap
+import os
+import stat
 import sys
+import tempfile
 import time
-from io import BufferedReader, BytesIO, StringIO
+from http.client import HTTPMessage
+from io import BufferedIOBase, BytesIO, StringIO
 from socketserver import BaseServer
-from typing import Any, Callable, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple, Union
 from wsgiref.handlers import SimpleHandler
 from wsgiref.headers import Headers
 from wsgiref.simple_server import ServerHandler
@@ -11,6 +16,9 @@ from wsgiref.simple_server import WSGIServer
 
 from qor.utils import int_to_method_name
 
+if TYPE_CHECKING:
+    from qor.compression import Compressor
+
 __version__ = "1.0.0"
 
 # class KoreRequestHeaders(Headers):
@@ -25,84 +33,243 @@ __version__ = "1.0.0"
 #         return self.kore_request.request_header(name) or default
 
 
-class KoreWSGIInput(BufferedReader):
-    def __init__(self, request, buffer_size=1024) -> None:
+# the max length of `kore` `body_read`
+BODY_READ_MAX = 1024
+
+
+class KoreWSGIInput(BufferedIOBase):
+    """the `wsgi.input` stream of the request body.
+
+    The body is read by `body_read` chunks into one `bytearray` that is
+    reused for the whole body, the consumed bytes are dropped when it is
+    refilled. The offloaded bodies (`body_path` is set) are mapped by `mmap`
+    instead, So they are read without the 1 KB `body_read` calls.
+
+    N.B:. It is closed after the response, the app shouldn't keep it.
+    """
+
+    def __init__(self, request, buffer_size=BODY_READ_MAX) -> None:
         self.request = request
+        # the bytes that are returned to the app, see `tell`
         self.read_length = 0
         self.buffer_size = buffer_size
         self._closed = False
-        self._buffered_bytes = b""
-
-    def __read(self, __size: int = 1024) -> Tuple[int, bytes]:
-        length, val = self.request.body_read(__size)
-        self.read_length += length
+        # the unread bytes are `_data[_pos:]`
+        self._data = bytearray()
+        self._pos = 0
+        self._eof = False
+        self._file = None
+        self._map = None
+        body_path = getattr(request, "body_path", None)
+        if body_path:
+            self._file = open(body_path, "rb")
+            if os.fstat(self._file.fileno()).st_size:
+                self._map = self._data = mmap.mmap(
+                    self._file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            self._eof = True
+
+    def _fill(self) -> int:
+        """read the next `body_read` chunk into the buffer"""
+        if self._eof:
+            return 0
+        length, chunk = self.request.body_read(BODY_READ_MAX)
         if length == 0:
-            self._closed = True
-        return length, val
-
-    # def _read(self, __size) -> Tuple[int, bytes]:
-    #     buf_length = len(self._buffered_bytes)
-    #     if buf_length > 0:
-    #         if buf_length < __size:
-    #             val = self._buffered_bytes  # got all, as it is smaller already
-    #             self._buffered_bytes = b""
-    #             remain = __size - buf_length
-    #             from_rquest = self.__read(remain)
-    #             return from_rquest[0] + buf_length, val + from_rquest[1]
-
-    #         elif buf_length == __size:
-    #             val = self._buffered_bytes  # got all, as they are eqals
-    #             self._buffered_bytes = b""
-    #             return __size, val
-    #         else:
-    #             val = self._buffered_bytes[:__size]
-    #             self._buffered_bytes = self._buffered_bytes[__size:]
-    #             return __size, val
-
-    #     else:
-    #         return self.__read(__size)
-
-    def read(self, __size: int = 1024) -> bytes:
-        return self.__read(__size)[1]
+            self._eof = True
+            return 0
+        data = self._data
+        if self._pos:
+            # drop the consumed bytes before growing the buffer
+            del data[: self._pos]
+            self._pos = 0
+        data += chunk
+        return length
+
+    def _take(self, size: int) -> bytes:
+        """consume up to `size` buffered bytes"""
+        pos = self._pos
+        with memoryview(self._data) as view:
+            chunk = view[pos : pos + size].tobytes()
+        self._pos = pos + len(chunk)
+        self.read_length += len(chunk)
+        return chunk
+
+    def _available(self) -> int:
+        return len(self._data) - self._pos
+
+    def _check_closed(self):
+        if self._closed:
+            raise ValueError("I/O operation on closed wsgi.input")
+
+    def read(self, __size: int = -1) -> bytes:
+        self._check_closed()
+        if __size is None or __size < 0:
+            return self.readall()
+        if self._available() >= __size or self._eof:
+            return self._take(__size)
+        chunks = [self._take(__size)]
+        needed = __size - len(chunks[0])
+        while needed > 0 and self._fill():
+            chunk = self._take(needed)
+            needed -= len(chunk)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def readall(self) -> bytes:
+        self._check_closed()
+        chunks = [self._take(self._available())]
+        if not self._eof:
+            body_read = self.request.body_read
+            append = chunks.append
+            read_length = 0
+            while True:
+                length, chunk = body_read(BODY_READ_MAX)
+                if length == 0:
+                    break
+                read_length += length
+                append(chunk)
+            self._eof = True
+            self.read_length += read_length
+        # the chunks are joined in a single allocation
+        return b"".join(chunks)
 
     def read1(self, __size: int = -1) -> bytes:
-        return self.read(__size)
+        self._check_closed()
+        if not self._available():
+            self._fill()
+        if __size is None or __size < 0:
+            __size = self._available()
+        return self._take(__size)
+
+    def readinto(self, buffer) -> int:
+        self._check_closed()
+        with memoryview(buffer) as view, view.cast("B") as view:
+            size = len(view)
+            filled = min(self._available(), size)
+            if filled:
+                pos = self._pos
+                with memoryview(self._data) as data:
+                    view[:filled] = data[pos : pos + filled]
+                self._pos = pos + filled
+            # the chunks are copied into the buffer directly
+            while filled < size and not self._eof:
+                length, chunk = self.request.body_read(
+                    min(size - filled, BODY_READ_MAX)
+                )
+                if length == 0:
+                    self._eof = True
+                    break
+                view[filled : filled + length] = chunk
+                filled += length
+        self.read_length += filled
+        return filled
+
+    readinto1 = readinto
+
+    def peek(self, __size: int = 0) -> bytes:
+        self._check_closed()
+        if not self._available():
+            self._fill()
+        with memoryview(self._data) as view:
+            return view[self._pos :].tobytes()
+
+    def readline(self, limit: int = -1) -> bytes:
+        self._check_closed()
+        if limit is None:
+            limit = -1
+        data = self._data
+        pos = self._pos
+        # the fast path, the line is buffered
+        if limit < 0:
+            end = data.find(b"\n", pos)
+        else:
+            end = data.find(b"\n", pos, pos + limit)
+        if end >= 0:
+            end += 1
+            line = bytes(data[pos:end])
+            self._pos = end
+            self.read_length += end - pos
+            return line
+        # the unread bytes that are searched for the line end
+        searched = 0
+        while True:
+            pos = self._pos
+            stop = len(self._data)
+            if limit >= 0:
+                stop = min(stop, pos + limit)
+            end = self._data.find(b"\n", pos + searched, stop)
+            if end >= 0:
+                return self._take(end + 1 - pos)
+            if 0 <= limit <= self._available():
+                return self._take(limit)
+            searched = self._available()
+            if not self._fill():
+                return self._take(self._available())
+
+    def readlines(self, hint: int = -1) -> List[bytes]:
+        if hint is None or hint <= 0:
+            # split the whole body at once
+            lines = self.readall().split(b"\n")
+            last = lines.pop()
+            lines = [line + b"\n" for line in lines]
+            if last:
+                lines.append(last)
+            return lines
+        lines = []
+        total = 0
+        for line in self:
+            lines.append(line)
+            total += len(line)
+            if total >= hint:
+                break
+        return lines
 
-    def peek(self, __size: int = ...) -> bytes:
-        raise NotImplementedError()
+    def __next__(self) -> bytes:
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+    def __iter__(self):
+        return self
 
+    @property
     def mode(self) -> str:
         return "rb"
 
     @property
     def name(self) -> str:
-        pass
+        return getattr(self.request, "body_path", None) or "<wsgi.input>"
 
     def close(self) -> None:
-        pass
+        if self._closed:
+            return
+        self._closed = True
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._data = bytearray()
+        self._pos = 0
 
     @property
     def closed(self) -> bool:
         return self._closed
 
     def fileno(self) -> int:
-        pass
+        raise OSError("wsgi.input has no file descriptor")
 
     def flush(self) -> None:
         pass
 
     def isatty(self) -> bool:
-        pass
+        return False
 
     def readable(self) -> bool:
         return True
 
-    def readline(self, limit: int = -1):
-        raise NotImplementedError()
-
-    def readlines(self, hint: int = -1) -> List:
-        raise NotImplementedError()
-
     def seek(self, offset: int, whence: int = 0) -> int:
         raise Exception("not seekable")
 
@@ -367,11 +534,19 @@ class StandAloneWSGIHandler(ServerHandler):
         return s
 
 
+# the headers `KoreServerHandler.send_headers` holds when compressing
+_HELD_HEADERS = frozenset(("etag", "content-length"))
+
+
 class KoreServerHandler(ServerHandler):
     status = "500 Internal Server Error"
     status_integer = 500
     origin_server = False  # # We are NOT transmitting direct to client
     headers_class = Headers  # response headers
+    # compress the responses, see `qor.compression.Compressor`
+    compressor: Optional["Compressor"] = None
+    # the bodies larger than this are spooled to a temp file, not the memory
+    spool_max_memory = 8 * 1024 * 1024
 
     def __init__(
         self,
@@ -390,6 +565,11 @@ class KoreServerHandler(ServerHandler):
             multithread,
             multiprocess,
         )
+        # `kore` takes the whole body at once, it's kept until `send_to_kore`:
+        # the first chunk as is, the next ones are appended to a `bytearray`
+        # or to a temp file beyond `spool_max_memory`
+        self._body: Optional[Union[bytes, bytearray, mmap.mmap]] = None
+        self._spool = None
 
     def set_kore_request(self, kore_request):
         self.kore_request = kore_request
@@ -430,12 +610,42 @@ class KoreServerHandler(ServerHandler):
                 self.close()
                 raise (e)  # ...and let the actual server figure it out.
 
+    def response_body(self):
+        """the body to send to `kore`, without copying it: the only chunk,
+        the chunks buffer, the mapped spool file or `wsgi.file_wrapper` file.
+        """
+        if self._spool is not None:
+            self._spool.flush()
+            return mmap.mmap(self._spool.fileno(), 0, access=mmap.ACCESS_READ)
+        return b"" if self._body is None else self._body
+
     def send_to_kore(self):
-        self.stdout.seek(0)
-        rv = self.stdout.getvalue()
+        rv = self.response_body()
+        headers = self.headers
+        if self.compressor is not None and headers is not None:
+            # the `ETag` and the `Content-Length` are held by `send_headers`
+            # till the encoding is known, `kore` sets the length of the
+            # compressed body
+            etag = headers.get("ETag")
+            if "Content-Encoding" not in headers:
+                rv = self.compressor.compress_response(
+                    self.kore_request,
+                    rv,
+                    headers.get("Content-Type"),
+                    etag=etag,
+                )
+            else:
+                for name in ("ETag", "Content-Length"):
+                    value = headers.get(name)
+                    if value is not None:
+                        self.kore_request.response_header(name, value)
         self.kore_request.response(self.status_integer, rv)
-        self.stdout.truncate(0)
-        self._flush = self.stdout.flush
+        # N.B:. the maps outlive their closed files, they are unmapped once
+        # `kore` drops the body
+        self._body = None
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
 
     def start_response(
         self,
@@ -490,21 +700,51 @@ class KoreServerHandler(ServerHandler):
         pass
 
     def _write(self, data: bytes) -> None:
-        result = self.stdout.write(data)
-        if result is None or result == len(data):
+        if not data:
             return
-
-        from warnings import warn
-
-        warn(
-            "SimpleHandler.stdout.write() should not do partial writes",
-            DeprecationWarning,
-        )
-        while True:
-            data = data[result:]
-            if not data:
-                break
-            result = self.stdout.write(data)
+        if self._spool is not None:
+            self._spool.write(data)
+            return
+        body = self._body
+        if body is None:
+            # `write` asserts that the data is `bytes`, it's safe to keep it
+            self._body = data
+            return
+        if type(body) is bytes:
+            # N.B:. not a list & a join, that holds the body twice at the end
+            body = self._body = bytearray(body)
+        body += data
+        if len(body) > self.spool_max_memory:
+            self._spool = tempfile.TemporaryFile()
+            self._spool.write(body)
+            self._body = None
+
+    def sendfile(self) -> bool:
+        """map the file of `wsgi.file_wrapper` instead of reading it by
+        blocks, `kore` copies the body straight from the page cache.
+
+        N.B:. the files without a `fileno`, like `BytesIO`, & the ones that
+        are not regular files are iterated by blocks.
+        """
+        filelike = self.result.filelike
+        try:
+            fileno = filelike.fileno()
+            offset = filelike.tell()
+            info = os.fstat(fileno)
+        except (AttributeError, OSError, ValueError):
+            return False
+        if not stat.S_ISREG(info.st_mode) or info.st_size <= offset:
+            return False
+        body = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        if offset:
+            body = memoryview(body)[offset:]
+        if not self.headers_sent:
+            self.bytes_sent = len(body)
+            self.send_headers()
+        else:
+            self.bytes_sent += len(body)
+        self._body = body
+        return True
 
     def _flush(self) -> None:
         pass
@@ -515,7 +755,11 @@ class KoreServerHandler(ServerHandler):
         Transmit headers to the client, via self._write()"""
         self.cleanup_headers()
         self.headers_sent = True
+        compressed = self.compressor is not None
         for header_name, header_value in self.headers.items():
+            if compressed and header_name.lower() in _HELD_HEADERS:
+                # sent by `send_to_kore` once the content coding is known
+                continue
             self.kore_request.response_header(header_name, header_value)
 
     def cleanup_headers(self) -> None:
@@ -547,7 +791,10 @@ class KoreWSGIRequestHandler(_WSGIRequestHandler):
     def __init__(
         self, kore_request, client_address, server: BaseServer
     ) -> None:
-        self.headers = kore_request.headers()
+        # `wsgiref` reads the headers by the `email.message.Message` API
+        self.headers = HTTPMessage()
+        for name, value in kore_request.headers().items():
+            self.headers[name] = value
         self.stderr = StringIO()
         super().__init__(kore_request, client_address, server)
 
@@ -571,18 +818,26 @@ class KoreWSGIRequestHandler(_WSGIRequestHandler):
             return
 
         # stdin, stdout, stderr, environ, muthrea, multi_process
-        stdout = BytesIO()
+        # N.B:. no stdout, the handler keeps the body for `kore`
+        stdin = KoreWSGIInput(self.request)
         handler = KoreServerHandler(
-            KoreWSGIInput(self.request),  # self.rfile,
-            stdout=stdout,  # self.wfile,
+            stdin,  # self.rfile,
+            stdout=None,  # self.wfile,
             stderr=self.get_stderr(),
             environ=self.get_environ(),
             multithread=False,
             multiprocess=False,
         )
         handler.set_kore_request(self.request)
+        handler.compressor = getattr(self.server, "compressor", None)
+        handler.spool_max_memory = getattr(
+            self.server, "spool_max_memory", handler.spool_max_memory
+        )
         handler.request_handler = self  # backpointer for logging
-        handler.run(self.server.get_app())
+        try:
+            handler.run(self.server.get_app())
+        finally:
+            stdin.close()
 
     def address_string(self) -> str:
         return super().address_string()
@@ -614,7 +869,7 @@ class KoreWSGIRequestHandler(_WSGIRequestHandler):
         self.command = int_to_method_name(method).upper()
         self.requestline = f"[{self.command}] {host}{self.path}"
 
-        conntype = self.headers.get("Connection")
+        conntype = self.headers.get("Connection", "")
         if conntype.lower() == "close":
             self.close_connection = True
         elif (
@@ -623,7 +878,7 @@ class KoreWSGIRequestHandler(_WSGIRequestHandler):
         ):
             self.close_connection = False
         # Examine the headers and look for an Expect directive
-        expect = self.headers.get("Expect")
+        expect = self.headers.get("Expect", "")
         if (
             expect.lower() == "100-continue"
             and self.protocol_version >= "HTTP/1.1"
@@ -701,9 +956,20 @@ class KoreWSGIServer(WSGIServer):
     error_message = "Internal Server Error"
     server_name = ""  # fully qualified domain name
     server_port = ""  # port number as string
+    # compress the responses, see `qor.compression.Compressor`
+    compressor: Optional["Compressor"] = None
+    # see `KoreServerHandler.spool_max_memory`
+    spool_max_memory = KoreServerHandler.spool_max_memory
 
-    def __init__(self, server_address, RequestHandlerClass) -> None:
+    def __init__(
+        self,
+        server_address,
+        RequestHandlerClass,
+        compressor: Optional["Compressor"] = None,
+    ) -> None:
         super().__init__(server_address, RequestHandlerClass)
+        if compressor is not None:
+            self.compressor = compressor
         self.setup_environ()
 
     def set_kore_request(self, kore_request):
@@ -800,7 +1066,8 @@ class KoreWSGIServer(WSGIServer):
         pass
 
     def shutdown_request(self, request) -> None:
-        print(" kore wsgi server shutdown request ")
+        """called after each request, `kore` owns the connection"""
+        pass
 
     def verify_request(self, request, client_address) -> bool:
         """Verify the request.  May be overridden.
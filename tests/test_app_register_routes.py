@@ -0,0 +1,95 @@
+from qor import Qor, constants
+from qor.router import Router, merge_routes
+from qor.testing import FakeKoreRequest, attach_fake_domain
+from qor.wrappers import DefaultHandlerWrapper, MethodDispatcher
+
+
+def index(req):
+    pass
+
+
+def create(req):
+    pass
+
+
+def test_merge_routes_same_handler():
+    r = Router()
+    r.add_route(
+        "/", index, "index", methods=["get", "post"], params={"p": ".*"}
+    )
+    r.build_routes()
+    assert len(r.routes) == 2
+
+    merged = merge_routes(r.routes)
+    assert len(merged) == 1
+    assert merged[0].methods == ["get", "post"]
+    assert list(merged[0].method_routes.keys()) == ["get", "post"]
+
+
+def test_merge_routes_keep_order():
+    r = Router()
+    r.add_route("/a", index, "a", methods=["get"])
+    r.add_route("/b", index, "b", methods=["get"])
+    r.add_route("/a", create, "a_create", methods=["post"])
+    r.build_routes()
+
+    merged = merge_routes(r.routes)
+    assert [route.raw_path for route in merged] == ["/a", "/b"]
+    assert merged[0].methods == ["get", "post"]
+
+
+def test_merge_routes_different_auth():
+    r = Router()
+    r.add_route("/a", index, "a", methods=["get"])
+    r.add_route("/a", create, "a_create", methods=["post"], auth_name="user")
+    r.build_routes()
+
+    assert len(merge_routes(r.routes)) == 2
+
+
+def test_register_one_kore_route_per_path():
+    app = Qor()
+    domain = attach_fake_domain(app)
+    app.add_route("/", index, "index", methods=["get", "put"], params={"p": ""})
+    app.add_route("/items", index, "items", methods=["get"])
+    app.add_route("/items", create, "create_item", methods=["post"])
+    app.start()
+
+    assert len(domain.routes) == 2
+    index_route, items_route = domain.routes
+
+    assert index_route["url"] == "/"
+    assert index_route["methods"] == ["get", "put"]
+    assert index_route["get"] == {"p": ""}
+    assert index_route["put"] == {"p": ""}
+    assert isinstance(index_route["callback"], DefaultHandlerWrapper)
+
+    assert items_route["url"] == "/items"
+    assert items_route["methods"] == ["get", "post"]
+    assert isinstance(items_route["callback"], MethodDispatcher)
+    handlers = items_route["callback"].handlers
+    assert handlers[constants.METHOD_NAMES["get"]].func == index
+    assert handlers[constants.METHOD_NAMES["post"]].func == create
+
+
+def test_method_dispatcher_head():
+    app = Qor()
+    domain = attach_fake_domain(app)
+
+    @app.get("/x")
+    def read(request, **kwargs):
+        return "read"
+
+    @app.post("/x")
+    def write(request, **kwargs):
+        return "written"
+
+    app.start()
+    dispatcher = domain.routes[0]["callback"]
+    head = FakeKoreRequest("/x", method="head")
+    dispatcher(head)
+    assert head.status == 200 and head.response_body == b"read"
+    put = FakeKoreRequest("/x", method="put")
+    dispatcher(put)
+    assert put.status == 405
+    assert put.response_headers["Allow"] == "GET, POST, HEAD"
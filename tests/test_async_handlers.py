@@ -0,0 +1,180 @@
+import inspect
+
+import pytest
+
+from qor.testing import (
+    FakeKoreRequest,
+    call,
+    make_app,
+    run_handler,
+)
+
+
+def test_async_handler():
+    app, domain = make_app(fake_kore=True)
+
+    @app.get("/")
+    async def index(request, **kwargs):
+        await app.suspend(1)
+        values = await app.gather(double(1), double(2))
+        return {"values": values}
+
+    async def double(value):
+        await app.suspend(1)
+        return value * 2
+
+    app.start()
+    handler = domain.routes[0]["callback"]
+    kore_request = FakeKoreRequest("/")
+    coroutine = handler(kore_request)
+    assert inspect.iscoroutine(coroutine)
+    assert kore_request.status is None
+    run_handler(lambda request: coroutine, kore_request)
+    assert kore_request.status == 200
+    assert kore_request.response_body in (
+        b'{"values":[2,4]}',
+        b'{"values": [2, 4]}',
+    )
+
+
+def test_sync_handlers_return_no_coroutine():
+    app, domain = make_app(fake_kore=True)
+
+    @app.before_handler
+    def before(request, *args, **kwargs):
+        pass
+
+    @app.get("/")
+    def index(request, **kwargs):
+        return "sync"
+
+    app.start()
+    kore_request = FakeKoreRequest("/")
+    assert domain.routes[0]["callback"](kore_request) is None
+    assert kore_request.response_body == b"sync"
+
+
+def test_async_callbacks():
+    app, domain = make_app(fake_kore=True)
+    calls = []
+
+    @app.before_handler
+    async def before(request, *args, **kwargs):
+        await app.suspend(1)
+        calls.append("before")
+
+    @app.before_handler
+    def sync_before(request, *args, **kwargs):
+        calls.append("sync_before")
+
+    @app.after_handler()
+    async def after(request, *args, **kwargs):
+        calls.append("after")
+        return "changed"
+
+    @app.get("/")
+    def index(request, **kwargs):
+        calls.append("handler")
+        return "original"
+
+    app.start()
+    assert call(domain).response_body == b"changed"
+    assert calls == ["before", "sync_before", "handler", "after"]
+
+
+def test_async_before_handler_response():
+    app, domain = make_app(fake_kore=True)
+
+    @app.before_handler
+    async def deny(request, *args, **kwargs):
+        return 401, "denied"
+
+    @app.get("/")
+    async def index(request, **kwargs):
+        raise AssertionError("not called")
+
+    app.start()
+    response = call(domain)
+    assert response.status == 401 and response.response_body == b"denied"
+
+
+def test_async_error_handlers():
+    app, domain = make_app(fake_kore=True)
+
+    @app.error_handler(ValueError)
+    async def value_error(request, *args, **kwargs):
+        return 400, "bad value"
+
+    @app.error_handler(404)
+    async def not_found(request, *args, **kwargs):
+        return 404, "custom not found"
+
+    @app.get("/error")
+    async def error(request, **kwargs):
+        raise ValueError()
+
+    @app.get("/missing")
+    async def missing(request, **kwargs):
+        return 404, "missing"
+
+    app.start()
+    assert call(domain, "/error", index=0).response_body == b"bad value"
+    assert call(domain, "/missing", index=1).response_body == (
+        b"custom not found"
+    )
+
+
+def test_unhandled_async_error():
+    app, domain = make_app(fake_kore=True)
+
+    @app.get("/")
+    async def index(request, **kwargs):
+        raise KeyError("key")
+
+    app.start()
+    with pytest.raises(KeyError):
+        call(domain)
+
+
+@pytest.mark.parametrize("redirect_url", [None, "/login"])
+def test_async_auth(redirect_url):
+    app, domain = make_app(fake_kore=True)
+
+    @app.header_auth("token", "X-Token", redirect_url=redirect_url)
+    async def verify(request, value):
+        await app.suspend(1)
+        return value == "secret"
+
+    @app.get("/", auth_name="token")
+    def index(request, **kwargs):
+        return "private"
+
+    app.start()
+    route = domain.routes[0]
+    # the async verifiers are awaited by the pipeline, not by kore
+    assert "auth" not in route
+    assert call(domain, headers={"X-Token": "secret"}).response_body == (
+        b"private"
+    )
+    denied = call(domain, headers={"X-Token": "wrong"})
+    if redirect_url:
+        assert denied.status == 302
+        assert denied.response_headers["Location"] == "/login"
+    else:
+        assert denied.status == 403
+    assert call(domain).status == (302 if redirect_url else 403)
+
+
+def test_sync_auth_kept_for_kore():
+    app, domain = make_app(fake_kore=True)
+
+    @app.cookie_auth("session", "session")
+    def verify(request, value):
+        return True
+
+    @app.get("/", auth_name="session")
+    def index(request, **kwargs):
+        return "private"
+
+    app.start()
+    assert domain.routes[0]["auth"]["value"] == "session"
@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+
+from qor.batching import Batcher
+from qor.devserver import DevQueue
+from qor.testing import FakeKoreRequest, make_app
+
+
+def serve(handler, kore_requests):
+    async def serve_all():
+        await asyncio.gather(*(handler(request) for request in kore_requests))
+
+    asyncio.run(serve_all())
+    return kore_requests
+
+
+def test_concurrent_requests_batched():
+    app, domain = make_app(fake_kore=True)
+    batches = []
+
+    @app.batch_route(
+        "/users/<id:int>",
+        name="users",
+        max_batch=4,
+        max_wait_ms=20,
+        input=lambda request, id: id,
+    )
+    def users(ids):
+        batches.append(ids)
+        return [{"id": id} if id != 3 else (404, "missing") for id in ids]
+
+    app.start()
+    handler = domain.routes[0]["callback"]
+    requests = [FakeKoreRequest(f"/users/{id}") for id in range(6)]
+
+    async def serve_all():
+        await asyncio.gather(
+            *(handler(request, str(id)) for id, request in enumerate(requests))
+        )
+
+    asyncio.run(serve_all())
+    assert batches == [[0, 1, 2, 3], [4, 5]]
+    assert [r.status for r in requests] == [200, 200, 200, 404, 200, 200]
+    assert requests[5].response_body in (b'{"id":5}', b'{"id": 5}')
+    assert app.batchers["users"].stats() == {
+        "batches": 2,
+        "inputs": 6,
+        "mean_batch": 3,
+    }
+
+
+def test_async_batch_handler_gets_requests():
+    app, domain = make_app(fake_kore=True)
+
+    @app.batch_route("/echo", max_batch=8, max_wait_ms=5)
+    async def echo(requests):
+        await app.suspend(1)
+        return [request.request_header("X-Value") for request in requests]
+
+    app.start()
+    requests = serve(
+        domain.routes[0]["callback"],
+        [
+            FakeKoreRequest("/echo", headers={"X-Value": str(i)})
+            for i in range(3)
+        ],
+    )
+    assert [r.response_body for r in requests] == [b"0", b"1", b"2"]
+    assert app.batchers["/echo"].batches == 1
+
+
+def test_batch_errors_fan_out():
+    app, domain = make_app(fake_kore=True)
+
+    @app.error_handler(ValueError)
+    def value_error(request, *args, **kwargs):
+        return 500, "batch failed"
+
+    @app.batch_route("/fail", max_batch=2, max_wait_ms=5)
+    def fail(requests):
+        raise ValueError()
+
+    app.start()
+    requests = serve(
+        domain.routes[0]["callback"],
+        [FakeKoreRequest("/fail") for _ in range(2)],
+    )
+    assert [r.response_body for r in requests] == [b"batch failed"] * 2
+
+
+def test_results_count_checked():
+    async def suspend(milliseconds):
+        await asyncio.sleep(0)
+
+    batcher = Batcher(lambda inputs: inputs[:1], suspend, DevQueue, max_batch=2)
+
+    async def submit_two():
+        return await asyncio.gather(
+            batcher.submit(1), batcher.submit(2), return_exceptions=True
+        )
+
+    errors = asyncio.run(submit_two())
+    assert all("returned 1 results for 2 inputs" in str(e) for e in errors)
+
+
+def test_waiters_woken_without_polling():
+    suspended = []
+
+    async def suspend(milliseconds):
+        suspended.append(milliseconds)
+        await asyncio.sleep(milliseconds / 1000)
+
+    batcher = Batcher(
+        lambda inputs: [value * 2 for value in inputs], suspend, DevQueue
+    )
+
+    async def submit_all():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert asyncio.run(submit_all()) == [0, 2, 4, 6, 8]
+    # only the first input waited for the batch to fill
+    assert suspended == [5]
+
+
+def test_interrupted_batch_fails_all():
+    async def suspend(milliseconds):
+        await asyncio.sleep(0)
+
+    async def cancelled(inputs):
+        raise asyncio.CancelledError()
+
+    batcher = Batcher(cancelled, suspend, DevQueue, max_batch=3)
+
+    async def submit_all():
+        tasks = [asyncio.ensure_future(batcher.submit(i)) for i in range(3)]
+        done, _ = await asyncio.wait(tasks, timeout=1)
+        return tasks, done
+
+    tasks, done = asyncio.run(submit_all())
+    assert len(done) == 3
+    # the request running the batch is cancelled, the others fail
+    assert tasks[2].cancelled()
+    for task in tasks[:2]:
+        assert "failed: CancelledError()" in str(task.exception())
+
+
+def test_batch_route_after_start():
+    app, domain = make_app(fake_kore=True)
+    app.start()
+    with pytest.raises(Exception, match="after finishing"):
+        app.batch_route("/late")
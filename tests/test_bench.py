@@ -0,0 +1,125 @@
+import asyncio
+import random
+
+from qor import Qor
+from qor.bench import (
+    BenchRequest,
+    LatencyHistogram,
+    app_requests,
+    load_request_log,
+    run_load,
+)
+from qor.devserver import DevKore
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    values = list(range(1, 100001))
+    random.shuffle(values)
+    for value in values:
+        histogram.record(value)
+    assert histogram.count == 100000
+    assert histogram.min == 1 and histogram.max == 100000
+    for percentile in (50, 90, 99, 99.9):
+        expected = percentile * 1000
+        # the reported value is the bucket highest value
+        assert expected <= histogram.percentile(percentile) <= expected * 1.008
+    assert histogram.percentile(100) == 100000
+    # the small values are exact
+    small = LatencyHistogram()
+    for value in (3, 5, 7, 9):
+        small.record(value)
+    assert small.to_dict()["p50"] == 5
+    assert small.to_dict()["p99.9"] == 9
+
+
+def test_histogram_merge():
+    first, second = LatencyHistogram(), LatencyHistogram()
+    first.record(10, count=3)
+    second.record(50000)
+    first.merge(second)
+    assert first.count == 4
+    assert first.max == 50000 and first.min == 10
+    assert first.percentile(75) == 10
+    assert first.mean == (30 + 50000) / 4
+
+
+def test_load_request_log(tmp_path):
+    log = tmp_path / "requests.log"
+    log.write_text(
+        "# recorded\n"
+        "GET /users/1\n"
+        "\n"
+        '{"method": "post", "path": "/users", "body": "name=qor"}\n'
+    )
+    assert load_request_log(str(log)) == [
+        {"method": "GET", "path": "/users/1"},
+        {"method": "post", "path": "/users", "body": "name=qor"},
+    ]
+    request = BenchRequest("/users", method="post", body=b"name=qor")
+    assert request.raw == (
+        b"POST /users HTTP/1.1\r\nHost: localhost\r\nContent-Length: 8\r\n\r\n"
+        b"name=qor"
+    )
+
+
+def make_app():
+    app = Qor(config={"default_server_port": "0"})
+
+    @app.get("/", name="index")
+    def index(request, **kwargs):
+        return "index"
+
+    @app.get("/users/<id:int>", name="user")
+    async def user(request, id, **kwargs):
+        await app.suspend(1)
+        return {"id": id}
+
+    @app.get("/fail", name="fail")
+    def fail(request, **kwargs):
+        return 500, "fail"
+
+    return app
+
+
+def test_app_requests(tmp_path):
+    app = make_app()
+    app.router.build_routes()
+    assert [r.label for r in app_requests(app)] == ["index", "fail"]
+    requests = app_requests(app, ["index", "/users/7"])
+    assert [(r.path, r.label) for r in requests] == [
+        ("/", "index"),
+        ("/users/7", "user"),
+    ]
+    log = tmp_path / "requests.log"
+    log.write_text("GET /users/3\nGET /missing\n")
+    requests = app_requests(app, replay=str(log))
+    assert [r.label for r in requests] == ["user", "/missing"]
+
+
+def test_run_load():
+    app = make_app()
+    kore = DevKore()
+    kore.configure(app)
+    requests = [
+        BenchRequest("/", label="index"),
+        BenchRequest("/users/1", label="user"),
+        BenchRequest("/fail", label="fail"),
+    ]
+
+    async def main():
+        host, port = (await kore.start_serving())[0]
+        results = await run_load(host, port, requests, 4, 0.3, warmup=0.05)
+        await kore.stop_serving()
+        return results
+
+    results = asyncio.run(main())
+    assert set(results) == {"index", "user", "fail", "total"}
+    for label in ("index", "user", "fail"):
+        assert results[label]["count"] > 0
+        assert results[label]["errors"] == 0
+        assert results[label]["p50"] <= results[label]["p99.9"]
+    assert set(results["fail"]["statuses"]) == {500}
+    assert results["total"]["count"] == sum(
+        results[label]["count"] for label in ("index", "user", "fail")
+    )
@@ -0,0 +1,115 @@
+import dataclasses
+import datetime
+import json
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from qor import Qor, Request
+from qor.codecs import JSONCodec, OrjsonCodec, get_json_codec, orjson
+from qor.testing import FakeKoreRequest, attach_fake_domain
+
+codecs = [JSONCodec]
+if orjson is not None:
+    codecs.append(OrjsonCodec)
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    created: datetime.date
+
+
+class Money:
+    def __init__(self, amount):
+        self.amount = amount
+
+
+class Euro(Money):
+    pass
+
+
+@pytest.fixture(params=codecs)
+def codec(request):
+    return request.param()
+
+
+def test_native_values(codec):
+    value = {"a": [1, 2.5, "x", None, True], "b": {"c": False}}
+    assert json.loads(codec.dumps_bytes(value)) == value
+    assert json.loads(codec.dumps(value)) == value
+    assert codec.loads(codec.dumps_bytes(value)) == value
+
+
+def test_converted_types(codec):
+    value = {
+        "when": datetime.datetime(2023, 1, 2, 3, 4, 5),
+        "day": datetime.date(2023, 1, 2),
+        "price": Decimal("1.50"),
+        "id": uuid.UUID(int=1),
+        "tags": {"a"},
+        "point": Point(1, datetime.date(2023, 1, 2)),
+    }
+    assert json.loads(codec.dumps_bytes(value)) == {
+        "when": "2023-01-02T03:04:05",
+        "day": "2023-01-02",
+        "price": "1.50",
+        "id": str(uuid.UUID(int=1)),
+        "tags": ["a"],
+        "point": {"x": 1, "created": "2023-01-02"},
+    }
+
+
+def test_register_type(codec):
+    with pytest.raises(TypeError):
+        codec.dumps_bytes(Money(1))
+    codec.register_type(Money, lambda money: money.amount)
+    assert json.loads(codec.dumps_bytes([Money(1), Euro(2)])) == [1, 2]
+
+
+def test_loads_buffers(codec):
+    assert codec.loads(b'{"a": 1}') == {"a": 1}
+    assert codec.loads(memoryview(b"[1]")) == [1]
+    assert codec.loads('"x"') == "x"
+
+
+@pytest.mark.skipif(orjson is None, reason="orjson is not installed")
+def test_orjson_fallbacks():
+    codec = OrjsonCodec()
+    assert json.loads(codec.dumps_bytes({1: 2**70})) == {"1": 2**70}
+
+
+def test_get_json_codec():
+    assert type(get_json_codec("json")) is JSONCodec
+    expected = OrjsonCodec if orjson is not None else JSONCodec
+    assert type(get_json_codec()) is expected
+    with pytest.raises(Exception):
+        get_json_codec("unknown")
+
+
+def test_app_codec():
+    app = Qor(config={"json_codec": "json"})
+    assert type(app.json_codec) is JSONCodec
+    app.json_codec.register_type(Money, lambda money: money.amount)
+    domain = attach_fake_domain(app)
+
+    @app.route("/")
+    def index(request, **kwargs):
+        return {"received": request.json, "total": Money(5)}
+
+    app.start()
+    kore_request = FakeKoreRequest(
+        "/",
+        headers={"Content-Type": "application/json"},
+        body=b'{"a": 1}',
+    )
+    domain.routes[0]["callback"](kore_request)
+    assert kore_request.response_body == b'{"received": {"a": 1}, "total": 5}'
+
+
+def test_template_tojson():
+    app = Qor()
+    app.json_codec = JSONCodec({Money: lambda money: money.amount})
+    template = app.template_adapter.env.from_string("{{ value|tojson }}")
+    assert template.render(value={"total": Money(5)}) == '{"total": 5}'
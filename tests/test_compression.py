@@ -0,0 +1,225 @@
+import gzip
+import io
+import types
+import zlib
+
+from qor import Qor
+from qor.compression import Compressor, compressor_from_config
+from qor.testing import FakeKoreRequest, call, make_app
+from qor.wsgi import KoreServerHandler
+
+BODY = "hello world " * 200
+GZIP = {"Accept-Encoding": "gzip, deflate"}
+COMPRESSION = {"compression": True}
+
+
+def test_negotiate():
+    compressor = Compressor()
+    assert compressor.negotiate(None) is None
+    assert compressor.negotiate("gzip, deflate, br") == "gzip"
+    assert compressor.negotiate("deflate") == "deflate"
+    assert compressor.negotiate("gzip;q=0.5, deflate") == "deflate"
+    assert compressor.negotiate("gzip;q=0, identity") is None
+    assert compressor.negotiate("*") == "gzip"
+    assert Compressor(encodings=["deflate"]).negotiate("gzip") is None
+
+
+def test_compressible():
+    compressor = Compressor()
+    assert compressor.compressible("text/html; charset=utf-8")
+    assert compressor.compressible("application/json")
+    assert compressor.compressible("image/svg+xml")
+    assert not compressor.compressible("image/png")
+    assert not compressor.compressible("application/zip")
+
+
+def test_compressed_response():
+    app, domain = make_app(COMPRESSION)
+
+    @app.get("/")
+    def index(request, **kwargs):
+        return BODY
+
+    app.start()
+    response = call(domain, headers=GZIP)
+    assert response.response_headers["Content-Encoding"] == "gzip"
+    assert response.response_headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(response.response_body) == BODY.encode()
+
+    deflated = call(domain, headers={"Accept-Encoding": "deflate"})
+    assert zlib.decompress(deflated.response_body) == BODY.encode()
+
+    plain = call(domain)
+    assert plain.response_body == BODY.encode()
+    assert "Content-Encoding" not in plain.response_headers
+    assert plain.response_headers["Vary"] == "Accept-Encoding"
+
+
+def test_small_and_compressed_types_skipped():
+    app, domain = make_app(dict(COMPRESSION, compression_min_size=100))
+    bodies = {"/small": "hi", "/png": b"\x89PNG" * 100}
+
+    @app.get("/small")
+    def small(request, **kwargs):
+        return bodies["/small"]
+
+    @app.get("/png")
+    def png(request, **kwargs):
+        request.response_header("Content-Type", "image/png")
+        return bodies["/png"]
+
+    app.start()
+    for index, path in enumerate(bodies):
+        kore_request = FakeKoreRequest(path, headers=GZIP)
+        domain.routes[index]["callback"](kore_request)
+        assert "Content-Encoding" not in kore_request.response_headers
+        assert "Vary" not in kore_request.response_headers
+
+
+def test_disabled_by_default():
+    app = Qor()
+    assert app.compressor is None
+    assert compressor_from_config({"compression": True}).min_size == 1024
+
+
+def test_hashed_bodies_compressed_once(monkeypatch):
+    app, domain = make_app(dict(COMPRESSION, etag=True))
+    compressed = []
+    compress = Compressor.compress
+
+    def counting_compress(self, data, encoding):
+        compressed.append(encoding)
+        return compress(self, data, encoding)
+
+    monkeypatch.setattr(Compressor, "compress", counting_compress)
+
+    @app.get("/")
+    def index(request, **kwargs):
+        return BODY
+
+    app.start()
+    first = call(domain, headers=GZIP)
+    second = call(domain, headers=GZIP)
+    assert second.response_body == first.response_body
+    assert compressed == ["gzip"]
+    assert app.compressor.cache_size == len(first.response_body)
+    etag = first.response_headers["ETag"]
+    assert etag.endswith('-gzip"')
+    plain = call(domain)
+    assert plain.response_headers["ETag"] == etag.replace("-gzip", "")
+    not_modified = call(domain, headers=dict(GZIP, **{"If-None-Match": etag}))
+    assert not_modified.status == 304 and not_modified.response_body == b""
+    assert not_modified.response_headers["ETag"] == etag
+    assert not_modified.response_headers["Vary"] == "Accept-Encoding"
+
+
+def test_cached_response_variants(monkeypatch):
+    app, domain = make_app(COMPRESSION)
+    compressed = []
+    compress = Compressor.compress
+
+    def counting_compress(self, data, encoding):
+        compressed.append(encoding)
+        return compress(self, data, encoding)
+
+    monkeypatch.setattr(Compressor, "compress", counting_compress)
+
+    @app.get("/", cache=60)
+    def index(request, **kwargs):
+        request.set_etag("v1")
+        return BODY
+
+    app.start()
+    call(domain, headers=GZIP)
+    for _ in range(3):
+        response = call(domain, headers=GZIP)
+        assert response.response_headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(response.response_body) == BODY.encode()
+    assert compressed == ["gzip", "gzip"]
+    # the plain body is cached, the compression headers aren't
+    assert call(domain).response_body == BODY.encode()
+    etag = response.response_headers["ETag"]
+    assert etag.endswith('-gzip"')
+    not_modified = call(domain, headers=dict(GZIP, **{"If-None-Match": etag}))
+    assert not_modified.status == 304
+    assert not_modified.response_headers["ETag"] == etag
+    assert not_modified.response_headers["Vary"] == "Accept-Encoding"
+    cache = app.response_cache
+    assert cache.size == len(BODY) + len(response.response_body)
+    app.invalidate_cache()
+    assert cache.size == 0
+
+
+def test_wsgi_compression():
+    def wsgi_app(environ, start_response):
+        start_response(
+            "200 OK", [("Content-Type", "text/plain"), ("ETag", '"v1"')]
+        )
+        return [BODY.encode()]
+
+    kore_request = FakeKoreRequest("/", headers=GZIP)
+    handler = KoreServerHandler(
+        io.BytesIO(),
+        io.BytesIO(),
+        io.StringIO(),
+        environ={"REQUEST_METHOD": "GET", "PATH_INFO": "/"},
+        multithread=False,
+    )
+    handler.set_kore_request(kore_request)
+    handler.compressor = Compressor()
+    handler.request_handler = types.SimpleNamespace(
+        log_request=lambda *args: None
+    )
+    handler.run(wsgi_app)
+    assert kore_request.response_headers["Content-Encoding"] == "gzip"
+    assert kore_request.response_headers["ETag"] == '"v1-gzip"'
+    assert gzip.decompress(kore_request.response_body) == BODY.encode()
+
+
+def test_wsgi_server_compression():
+    body = BODY.encode()
+
+    def wsgi_app(environ, start_response):
+        start_response(
+            "200 OK",
+            [
+                ("Content-Type", "text/plain"),
+                ("Content-Length", str(len(body))),
+                ("ETag", '"v1"'),
+            ],
+        )
+        return [body]
+
+    app, domain = make_app(COMPRESSION)
+    server = app.wsgi_server(wsgi_app)
+    assert server.compressor is app.compressor
+    kore_request = FakeKoreRequest("/", headers=GZIP)
+    server.set_kore_request(kore_request)
+    server.handle_request()
+    assert kore_request.status == 200
+    assert kore_request.response_headers["Content-Encoding"] == "gzip"
+    assert kore_request.response_headers["ETag"] == '"v1-gzip"'
+    # `kore` sets the length of the compressed body
+    assert "Content-Length" not in kore_request.response_headers
+    assert gzip.decompress(kore_request.response_body) == body
+
+    # the encoded responses keep their headers
+    def encoded_app(environ, start_response):
+        start_response(
+            "200 OK",
+            [
+                ("Content-Type", "text/plain"),
+                ("Content-Encoding", "gzip"),
+                ("Content-Length", "4"),
+                ("ETag", '"v1"'),
+            ],
+        )
+        return [b"gzip"]
+
+    server = app.wsgi_server(encoded_app)
+    kore_request = FakeKoreRequest("/", headers=GZIP)
+    server.set_kore_request(kore_request)
+    server.handle_request()
+    assert kore_request.response_headers["Content-Length"] == "4"
+    assert kore_request.response_headers["ETag"] == '"v1"'
+    assert kore_request.response_body == b"gzip"
@@ -0,0 +1,146 @@
+import datetime
+
+from qor.conditional import (
+    coded_etag,
+    etag_matches,
+    http_date,
+    make_etag,
+    modified_since,
+    quote_etag,
+)
+from qor.testing import call, make_app
+
+
+def test_etag_helpers():
+    etag = make_etag(b"hello")
+    assert etag == make_etag(memoryview(b"hello")) != make_etag(b"other")
+    assert etag.startswith('"') and etag.endswith('"')
+    assert quote_etag(3) == '"3"'
+    assert quote_etag(3, weak=True) == 'W/"3"'
+    assert quote_etag('"3"') == '"3"'
+    assert etag_matches('"1", W/"3"', '"3"')
+    assert etag_matches("*", '"3"')
+    assert not etag_matches('"1"', '"3"')
+    assert not etag_matches(None, '"3"')
+
+
+def test_coded_etags():
+    assert coded_etag('"3"', "gzip") == '"3-gzip"'
+    assert coded_etag('"3"', None) == '"3"'
+    assert coded_etag('W/"3"', "gzip") == 'W/"3"'
+    # the ETags of the plain & the encoded bodies match each other
+    assert etag_matches('"3-gzip"', '"3"')
+    assert etag_matches('"3"', '"3-deflate"')
+    assert etag_matches('W/"3-gzip"', '"3-gzip"')
+    assert not etag_matches('"4-gzip"', '"3"')
+
+
+def test_dates():
+    modified = datetime.datetime(2024, 1, 2, 3, 4, 5)
+    assert http_date(modified) == "Tue, 02 Jan 2024 03:04:05 GMT"
+    assert not modified_since(http_date(modified), modified)
+    assert modified_since("Tue, 02 Jan 2024 03:04:04 GMT", modified)
+    assert modified_since("invalid", modified)
+    assert modified_since(None, modified.timestamp())
+
+
+def test_auto_etag():
+    app, domain = make_app({"etag": True})
+    calls = []
+
+    @app.route("/", methods=["get", "post"])
+    def index(request, **kwargs):
+        calls.append(1)
+        return "hello"
+
+    app.start()
+    first = call(domain)
+    etag = first.response_headers["ETag"]
+    assert etag == make_etag(b"hello")
+    second = call(domain, headers={"If-None-Match": etag})
+    assert second.status == 304 and second.response_body == b""
+    assert second.response_headers["ETag"] == etag
+    assert call(domain, headers={"If-None-Match": '"old"'}).status == 200
+    assert "ETag" not in call(domain, method="post").response_headers
+
+
+def test_no_etag_by_default():
+    app, domain = make_app()
+
+    @app.get("/")
+    def index(request, **kwargs):
+        return "hello"
+
+    app.start()
+    assert "ETag" not in call(domain).response_headers
+
+
+def test_precondition_hook():
+    app, domain = make_app()
+    rendered = []
+    modified = datetime.datetime(2024, 1, 2, 3, 4, 5)
+
+    @app.get("/")
+    def index(request, **kwargs):
+        if request.is_not_modified(etag="v2", last_modified=modified):
+            return 304, b""
+        rendered.append(1)
+        return "post"
+
+    app.start()
+    first = call(domain)
+    assert first.response_headers["ETag"] == '"v2"'
+    assert first.response_headers["Last-Modified"] == http_date(modified)
+    assert rendered == [1]
+
+    assert call(domain, headers={"If-None-Match": '"v2"'}).status == 304
+    since = {"If-Modified-Since": http_date(modified)}
+    assert call(domain, headers=since).status == 304
+    # `If-None-Match` takes precedence over `If-Modified-Since`
+    headers = dict(since, **{"If-None-Match": '"v1"'})
+    assert call(domain, headers=headers).status == 200
+    assert rendered == [1, 1]
+
+
+def test_version_key_without_hashing():
+    app, domain = make_app({"etag": True})
+
+    @app.get("/")
+    def index(request, **kwargs):
+        request.set_etag("v1")
+        return "hello"
+
+    app.start()
+    assert call(domain).response_headers["ETag"] == '"v1"'
+    assert call(domain, headers={"If-None-Match": '"v1"'}).status == 304
+
+
+def test_cached_response_not_modified():
+    app, domain = make_app({"etag": True})
+
+    @app.get("/", cache=60)
+    def index(request, **kwargs):
+        return "hello"
+
+    app.start()
+    etag = call(domain).response_headers["ETag"]
+    cached = call(domain, headers={"If-None-Match": etag})
+    assert app.response_cache.hits == 1
+    assert cached.status == 304 and cached.response_body == b""
+    assert call(domain).response_body == b"hello"
+
+
+def test_unsafe_methods_not_modified():
+    app, domain = make_app({"etag": True})
+    hooked = []
+
+    @app.put("/")
+    def update(request, **kwargs):
+        hooked.append(request.is_not_modified(etag="v1"))
+        return "updated"
+
+    app.start()
+    updated = call(domain, method="put", headers={"If-None-Match": "*"})
+    assert updated.status == 200 and updated.response_body == b"updated"
+    assert updated.response_headers["ETag"] == '"v1"'
+    assert hooked == [False]
@@ -0,0 +1,222 @@
+import asyncio
+
+from qor import Qor
+from qor.devserver import DevConnection, DevKore, DevRequest
+
+
+def make_app(**config):
+    return Qor(config={"default_server_port": "0", **config})
+
+
+async def read_response(reader, no_body=False):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, value = line.split(":", 1)
+            headers[name.lower()] = value.strip()
+    body = b""
+    if not no_body:
+        body = await reader.readexactly(int(headers["content-length"]))
+    return status, headers, body
+
+
+def serve(app, requests):
+    """send the raw requests over one connection & read their responses"""
+    kore = DevKore()
+    kore.configure(app)
+
+    async def main():
+        host, port = (await kore.start_serving())[0]
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(b"".join(requests))
+        responses = [
+            await read_response(reader, request.startswith(b"HEAD"))
+            for request in requests
+        ]
+        writer.close()
+        await kore.stop_serving()
+        return responses
+
+    return asyncio.run(main())
+
+
+def get(path, headers=b""):
+    return b"GET %s HTTP/1.1\r\nHost: localhost\r\n%s\r\n" % (
+        path.encode(),
+        headers,
+    )
+
+
+def test_keep_alive_pipelined_requests():
+    app = make_app()
+
+    @app.get("/")
+    def index(request, **kwargs):
+        return "index"
+
+    @app.get("/users/<id:int>")
+    async def user(request, id, **kwargs):
+        await app.suspend(5)
+        return {"id": id}
+
+    responses = serve(
+        app, [get("/users/1"), get("/"), get("/users/2"), get("/missing")]
+    )
+    assert [status for status, _, _ in responses] == [200, 200, 200, 404]
+    # the async responses keep the order of their requests
+    assert [body for _, _, body in responses[:3]] == [
+        b'{"id":1}',
+        b"index",
+        b'{"id":2}',
+    ]
+    assert responses[0][1]["connection"] == "keep-alive"
+
+
+def test_arguments_are_validated():
+    app = make_app()
+
+    @app.route("/search", methods=["get", "post"], params={"q": "^[a-z]+$"})
+    def search(request, **kwargs):
+        return f"{request.argument('q')} {request.argument('page')}"
+
+    body = b"q=post"
+    responses = serve(
+        app,
+        [
+            get("/search?q=abc&page=2"),
+            get("/search?q=123"),
+            b"POST /search HTTP/1.1\r\nHost: localhost\r\ncontent-type:"
+            b" application/x-www-form-urlencoded\r\ncontent-length: %d\r\n\r\n%s"
+            % (len(body), body),
+        ],
+    )
+    assert [body for _, _, body in responses] == [
+        b"abc None",
+        b"None None",
+        b"post None",
+    ]
+
+
+def test_headers_cookies_and_body():
+    app = make_app()
+
+    @app.post("/echo")
+    def echo(request, **kwargs):
+        request.populate_cookies()
+        request.response_header("x-agent", request.agent)
+        return f"{request.cookie('session')} {request.body.decode()}"
+
+    body = b"x" * 3000
+    ((status, headers, response),) = serve(
+        app,
+        [
+            b"POST /echo HTTP/1.1\r\nHost: localhost\r\nUser-Agent: test\r\n"
+            b"Cookie: a=1; session=s1\r\ncontent-length: %d\r\n\r\n%s"
+            % (len(body), body)
+        ],
+    )
+    assert status == 200
+    assert headers["x-agent"] == "test"
+    assert response == b"s1 " + body
+
+
+def test_method_not_allowed_and_head():
+    app = make_app()
+
+    @app.get("/")
+    def index(request, **kwargs):
+        return "index"
+
+    responses = serve(
+        app,
+        [
+            b"HEAD / HTTP/1.1\r\nHost: localhost\r\n\r\n",
+            b"DELETE / HTTP/1.1\r\nHost: localhost\r\n\r\n",
+        ],
+    )
+    (status, headers, _), (not_allowed, _, _) = responses
+    assert status == 200 and headers["content-length"] == "5"
+    assert not_allowed == 405
+
+
+def test_auth():
+    app = make_app()
+
+    @app.header_auth("token", "x-token")
+    def verify(request, token):
+        return token == "secret"
+
+    @app.get("/private", auth_name="token")
+    def private(request, **kwargs):
+        return "private"
+
+    responses = serve(
+        app,
+        [
+            get("/private"),
+            get("/private", b"x-token: wrong\r\n"),
+            get("/private", b"x-token: secret\r\n"),
+        ],
+    )
+    assert [status for status, _, _ in responses] == [403, 403, 200]
+
+
+def test_timers_and_tasks():
+    app = make_app()
+    fired = []
+
+    async def task():
+        fired.append("task")
+
+    @app.get("/")
+    async def index(request, **kwargs):
+        await app.suspend(30)
+        return ",".join(sorted(fired))
+
+    @app.callback("post_config")
+    def start_timers(app):
+        app.timer(lambda timer: fired.append("oneshot"), 1, 1)
+        app.task_create(task())
+
+    ((_, _, body),) = serve(app, [get("/")])
+    assert body == b"oneshot,task"
+
+
+def test_close_and_large_body():
+    app = make_app(http_body_max=16)
+
+    @app.post("/")
+    def index(request, **kwargs):
+        return "index"
+
+    ((status, headers, _),) = serve(
+        app,
+        [b"POST / HTTP/1.1\r\nHost: localhost\r\ncontent-length: 17\r\n\r\n"],
+    )
+    assert status == 413 and headers["connection"] == "close"
+
+
+def test_populate_multi():
+    body = (
+        b'--b\r\ncontent-disposition: form-data; name="title"\r\n\r\nhi\r\n'
+        b'--b\r\ncontent-disposition: form-data; name="file";'
+        b' filename="a.txt"\r\n\r\nfile data\r\n--b--\r\n'
+    )
+    request = DevRequest(
+        2,
+        "/upload",
+        "HTTP/1.1",
+        {"content-type": "multipart/form-data; boundary=b"},
+        DevConnection("127.0.0.1", None),
+    )
+    request.body = body
+    request._params = {"title": lambda value: True}
+    request.populate_multi()
+    assert request.argument("title") == "hi"
+    file = request.file_lookup("file")
+    assert file.filename == "a.txt"
+    assert file.read(1024) == (9, b"file data")
+    assert file.read(1024) == (0, b"")
@@ -0,0 +1,86 @@
+from qor import Qor
+from qor.testing import FakeKoreRequest, attach_fake_domain
+from qor.wrappers import ErrorHandlersIndex
+
+
+class ParentError(Exception):
+    pass
+
+
+class ChildError(ParentError):
+    pass
+
+
+def handlers(*pairs):
+    return [{"func": func, "kwargs": {"error": error}} for error, func in pairs]
+
+
+def named(name):
+    def callback(request, *args, **kwargs):
+        return name
+
+    callback.__name__ = name
+    return callback
+
+
+def test_status_codes():
+    first, second, other = named("first"), named("second"), named("other")
+    index = ErrorHandlersIndex(
+        handlers((404, first), (500, other), (404, second))
+    )
+    assert index.for_status(404) == (first, second)
+    assert index.for_status(500) == (other,)
+    assert index.for_status(400) == ()
+
+
+def test_exceptions_registration_order():
+    parent, child, base = named("parent"), named("child"), named("base")
+    index = ErrorHandlersIndex(
+        handlers(
+            (ParentError, parent),
+            (ChildError, child),
+            (Exception, base),
+            (404, named("not_found")),
+        )
+    )
+    # registration order wins over the MRO order
+    assert index.for_exception(ChildError()) == (parent, child, base)
+    assert index.for_exception(ParentError()) == (parent, base)
+    assert index.for_exception(KeyError()) == (base,)
+
+
+def test_exceptions_resolved_once():
+    index = ErrorHandlersIndex(handlers((ParentError, named("parent"))))
+    assert ChildError not in index._resolved
+    callbacks = index.for_exception(ChildError())
+    assert index._resolved[ChildError] is callbacks
+    assert index.for_exception(ChildError()) is callbacks
+    assert not ErrorHandlersIndex([])
+
+
+def test_app_first_non_none_result():
+    app = Qor()
+    domain = attach_fake_domain(app)
+
+    @app.error_handler(Exception)
+    def skipped(request, *args, **kwargs):
+        return None
+
+    @app.error_handler(ChildError)
+    def child(request, *args, **kwargs):
+        return 400, "child"
+
+    @app.error_handler(ParentError)
+    def parent(request, *args, **kwargs):
+        return 400, "parent"
+
+    @app.route("/")
+    def index(request, **kwargs):
+        raise ChildError()
+
+    app.start()
+    assert app.error_handlers_index is app._error_handlers_index
+    request = FakeKoreRequest("/")
+    domain.routes[0]["callback"](request)
+    assert request.status == 400
+    assert request.response_body == b"child"
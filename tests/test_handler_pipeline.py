@@ -0,0 +1,193 @@
+import json
+
+import pytest
+
+from qor.testing import call, make_app
+from qor.utils import ReturnValueParser
+
+
+class CountingParser(ReturnValueParser):
+    calls = 0
+
+    def __call__(self, return_value, *args, **kwargs):
+        CountingParser.calls += 1
+        return super().__call__(return_value, *args, **kwargs)
+
+
+def test_plain_pipeline():
+    app, domain = make_app(return_value_parser=CountingParser)
+
+    @app.route("/")
+    def index(request, **kwargs):
+        assert request.route.name == "index_name"
+        return {"ok": True}
+
+    app.router.find_raw_route(None, "/", "get")["name"] = "index_name"
+    app.start()
+    wrapper = domain.routes[0]["callback"]
+    assert wrapper._pipeline == wrapper._plain_pipeline
+
+    CountingParser.calls = 0
+    request = call(domain)
+    assert request.status == 200
+    assert json.loads(request.response_body) == {"ok": True}
+    assert request.response_headers["Content-Type"] == "application/json"
+    assert CountingParser.calls == 1
+
+
+def test_plain_pipeline_error_status():
+    app, domain = make_app(return_value_parser=CountingParser)
+
+    @app.route("/")
+    def index(request, **kwargs):
+        return 404, "not found"
+
+    app.start()
+    CountingParser.calls = 0
+    request = call(domain)
+    assert request.status == 404
+    assert CountingParser.calls == 1
+
+
+def test_plain_pipeline_raises():
+    app, domain = make_app()
+
+    @app.route("/")
+    def index(request, **kwargs):
+        raise ValueError()
+
+    app.start()
+    with pytest.raises(ValueError):
+        call(domain)
+
+
+def test_full_pipeline_callbacks():
+    app, domain = make_app(return_value_parser=CountingParser)
+    calls = []
+
+    @app.before_handler
+    def before(request, *args, **kwargs):
+        calls.append("before")
+
+    @app.after_handler()
+    def after(request, *args, **kwargs):
+        calls.append("after")
+        return "changed"
+
+    @app.route("/")
+    def index(request, **kwargs):
+        calls.append("handler")
+        return "original"
+
+    app.start()
+    wrapper = domain.routes[0]["callback"]
+    assert wrapper._pipeline == wrapper._full_pipeline
+
+    CountingParser.calls = 0
+    request = call(domain)
+    assert calls == ["before", "handler", "after"]
+    assert request.response_body == b"changed"
+    # the original & the changed return values
+    assert CountingParser.calls == 2
+
+
+def test_full_pipeline_before_handler_response():
+    app, domain = make_app()
+
+    @app.before_handler
+    def before(request, *args, **kwargs):
+        return 403, "forbidden"
+
+    @app.route("/")
+    def index(request, **kwargs):
+        raise AssertionError("not called")
+
+    app.start()
+    request = call(domain)
+    assert request.status == 403
+    assert request.response_body == b"forbidden"
+
+
+def test_full_pipeline_error_handlers():
+    app, domain = make_app()
+
+    @app.error_handler(ZeroDivisionError)
+    def zero_division(request, *args, **kwargs):
+        return 400, "zero division"
+
+    @app.error_handler(404)
+    def not_found(request, *args, **kwargs):
+        return 404, "custom not found"
+
+    @app.route("/divide")
+    def divide(request, **kwargs):
+        return 1 / 0
+
+    @app.route("/missing")
+    def missing(request, **kwargs):
+        return 404, "not found"
+
+    app.start()
+    request = call(domain)
+    assert request.status == 400
+    assert request.response_body == b"zero division"
+
+    request = call(domain, index=1)
+    assert request.status == 404
+    assert request.response_body == b"custom not found"
+
+
+def test_callbacks_frozen_after_start():
+    app, domain = make_app()
+    app.start()
+    with pytest.raises(Exception):
+        app.before_handler(lambda request: None)
+    with pytest.raises(Exception):
+        app.error_handler(500)(lambda request: None)
+
+
+def test_request_args():
+    app, domain = make_app()
+
+    @app.route("/<a:int>/<b>")
+    def handler(request, a, b, **kwargs):
+        return [request.args, request.route.raw_path]
+
+    app.start()
+    request = call(domain, "/1/x", "1", "x")
+    assert json.loads(request.response_body) == [[1, "x"], "/<a:int>/<b>"]
+
+
+def test_after_handler_changes_return_value_in_place():
+    app, domain = make_app()
+
+    @app.after_handler()
+    def extra(request, *args, **kwargs):
+        request.return_value["extra"] = 1
+
+    @app.route("/")
+    def index(request, **kwargs):
+        return {"a": 1}
+
+    app.start()
+    assert json.loads(call(domain).response_body) == {"a": 1, "extra": 1}
+
+
+def test_error_handler_changes_return_value_in_place():
+    app, domain = make_app(fake_kore=True)
+
+    @app.error_handler(400)
+    async def detail(request, *args, **kwargs):
+        request.return_value[1]["detail"] = "checked"
+
+    @app.route("/")
+    async def index(request, **kwargs):
+        return 400, {"error": "bad"}
+
+    app.start()
+    request = call(domain)
+    assert request.status == 400
+    assert json.loads(request.response_body) == {
+        "error": "bad",
+        "detail": "checked",
+    }
@@ -0,0 +1,37 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from harness import compare_results, run_suite  # noqa: E402
+
+
+def results(**metrics):
+    return {"metrics": {name: {"us": us} for name, us in metrics.items()}}
+
+
+def test_compare_results():
+    baseline = results(same=10, slower=10, faster=10, close=10, removed=1)
+    comparison = compare_results(
+        baseline, results(same=10, slower=12, faster=8, close=10.5), 0.1
+    )
+    assert comparison["regressions"] == ["slower"]
+    assert comparison["improvements"] == ["faster"]
+    assert comparison["missing"] == ["removed"]
+    assert comparison["ratios"]["slower"] == 1.2
+    assert comparison["ratios"]["close"] == 1.05
+
+
+def test_compare_results_threshold():
+    baseline = results(slower=10, faster=10)
+    comparison = compare_results(baseline, results(slower=12, faster=8), 0.25)
+    assert comparison["regressions"] == comparison["improvements"] == []
+
+
+def test_run_suite_prefixes():
+    metrics = run_suite(("router.reverse_static", "handler.raw"), repeat=1)
+    assert sorted(metrics["metrics"]) == [
+        "handler.raw_kore",
+        "router.reverse_static",
+    ]
+    assert metrics["metrics"]["handler.raw_kore"]["us"] > 0
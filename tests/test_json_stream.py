@@ -0,0 +1,91 @@
+import io
+import json
+import types
+
+from qor import JSONStream, NDJSONStream, Qor
+from qor.codecs import JSONCodec
+from qor.testing import FakeKoreRequest, attach_fake_domain
+from qor.wsgi import KoreServerHandler
+
+
+def records(count):
+    for i in range(count):
+        yield {"id": i, "name": f"record {i}"}
+
+
+def test_json_array_chunks():
+    stream = JSONStream(records(100), chunk_size=256)
+    chunks = list(stream)
+    assert len(chunks) > 1
+    # the chunks are bounded by the chunk size & one record
+    assert max(len(chunk) for chunk in chunks) < 256 + 64
+    assert json.loads(b"".join(chunks)) == list(records(100))
+
+
+def test_json_array_encode():
+    codec = JSONCodec()
+    assert JSONStream([]).encode(codec) == b"[]"
+    assert list(JSONStream([])) == [b"[]"]
+    encoded = JSONStream(records(3)).encode(codec)
+    assert isinstance(encoded, bytearray)
+    assert json.loads(encoded) == list(records(3))
+
+
+def test_ndjson():
+    stream = NDJSONStream(records(3), codec=JSONCodec())
+    lines = b"".join(stream).split(b"\n")
+    assert lines[-1] == b""
+    assert [json.loads(line) for line in lines[:-1]] == list(records(3))
+    assert list(NDJSONStream([])) == []
+    assert NDJSONStream([]).encode() == b""
+
+
+def test_handler_returns_streams():
+    app = Qor()
+    domain = attach_fake_domain(app)
+
+    @app.route("/generator")
+    def generator(request, **kwargs):
+        return records(3)
+
+    @app.route("/ndjson")
+    def ndjson(request, **kwargs):
+        return 201, NDJSONStream(records(2))
+
+    app.start()
+    request = FakeKoreRequest("/generator")
+    domain.routes[0]["callback"](request)
+    assert request.status == 200
+    assert isinstance(request.response_body, bytearray)
+    assert json.loads(request.response_body) == list(records(3))
+    assert request.response_headers["Content-Type"] == "application/json"
+
+    request = FakeKoreRequest("/ndjson")
+    domain.routes[1]["callback"](request)
+    assert request.status == 201
+    assert request.response_body.count(b"\n") == 2
+    assert request.response_headers["Content-Type"] == "application/x-ndjson"
+
+
+def test_wsgi_app_returns_stream():
+    def wsgi_app(environ, start_response):
+        stream = JSONStream(records(50), chunk_size=128)
+        start_response("200 OK", [("Content-Type", stream.content_type)])
+        return stream
+
+    kore_request = FakeKoreRequest("/")
+    handler = KoreServerHandler(
+        io.BytesIO(),
+        io.BytesIO(),
+        io.StringIO(),
+        environ={"REQUEST_METHOD": "GET", "PATH_INFO": "/"},
+        multithread=False,
+    )
+    handler.set_kore_request(kore_request)
+    handler.request_handler = types.SimpleNamespace(
+        log_request=lambda *args: None
+    )
+    handler.run(wsgi_app)
+    assert kore_request.status == 200
+    assert json.loads(kore_request.response_body) == list(records(50))
+    assert kore_request.response_headers["Content-Type"] == "application/json"
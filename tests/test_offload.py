@@ -0,0 +1,133 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from qor import Qor
+from qor.offload import OffloadPools
+from qor.testing import (
+    FakeKoreRequest,
+    attach_fake_domain,
+    attach_fake_kore,
+    run_handler,
+)
+
+app = Qor(config={"offload_cpu_workers": 1, "offload_io_workers": 2})
+attach_fake_kore(app)
+
+
+@app.offload(pool="cpu")
+def process_pid(value):
+    return os.getpid(), value * 2
+
+
+@app.offload(pool="io")
+def thread_name(value):
+    return threading.current_thread().name, value
+
+
+@pytest.fixture(autouse=True)
+def shutdown_pools():
+    yield
+    app.offload_pools.shutdown()
+
+
+def run(coroutine):
+    return run_handler(lambda request: coroutine, None)
+
+
+def test_cpu_pool():
+    pid, value = run(process_pid(21))
+    assert value == 42 and pid != os.getpid()
+    stats = app.offload_pools.stats()["cpu"]
+    assert stats["submitted"] == stats["completed"] == 1
+    assert stats["pending"] == 0 and stats["max_pending"] == 1
+
+
+def test_io_pool():
+    name, value = run(thread_name("x"))
+    assert value == "x" and name != threading.current_thread().name
+    assert app.offload_pools.stats()["io"]["completed"] == 1
+
+
+def test_offloaded_handler():
+    local_app = Qor()
+    domain = attach_fake_domain(local_app)
+    attach_fake_kore(local_app)
+    suspended = []
+    suspend = local_app.kore.suspend
+
+    async def counting_suspend(milliseconds):
+        suspended.append(milliseconds)
+        await suspend(milliseconds)
+
+    local_app.kore.suspend = counting_suspend
+    release = threading.Event()
+
+    @local_app.get("/")
+    @local_app.offload(pool="io")
+    def blocking(request, **kwargs):
+        release.wait(5)
+        return f"blocked {request.path}"
+
+    local_app.start()
+    kore_request = FakeKoreRequest("/")
+    threading.Timer(0.05, release.set).start()
+    run_handler(domain.routes[0]["callback"], kore_request)
+    assert kore_request.response_body == b"blocked /"
+    # the request was suspended while the thread was blocked, the checks
+    # backed off
+    assert suspended[:3] == [1, 2, 4]
+    assert max(suspended) <= 32
+    local_app.offload_pools.shutdown()
+
+
+def test_errors_counted():
+    @app.offload(pool="io")
+    def fail():
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        run(fail())
+    assert app.offload_pools.stats()["io"]["failed"] == 1
+
+
+def test_nested_function_not_offloaded_to_processes():
+    @app.offload(pool="cpu")
+    def nested():
+        pass
+
+    with pytest.raises(Exception, match="nested functions"):
+        run(nested())
+
+
+def test_unknown_pool():
+    with pytest.raises(Exception, match="unknown offload pool"):
+        OffloadPools().executor("gpu")
+
+
+def test_worker_lifecycle():
+    pools = app.offload_pools
+    assert pools.used == {"cpu", "io"}
+    app.workerstart()
+    assert set(pools._executors) == {"cpu", "io"}
+    app.workerstop()
+    assert pools._executors == {}
+
+
+def test_wait_backs_off():
+    pools = OffloadPools(poll_interval=1, max_poll_interval=8)
+    release = threading.Event()
+    suspended = []
+
+    async def suspend(milliseconds):
+        suspended.append(milliseconds)
+        if len(suspended) == 6:
+            release.set()
+        await asyncio.sleep(0.001)
+
+    future = pools.submit("io", release.wait, 5)
+    assert run(pools.wait(future, suspend)) is True
+    assert suspended[:6] == [1, 2, 4, 8, 8, 8]
+    pools.shutdown()
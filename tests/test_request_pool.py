@@ -0,0 +1,132 @@
+import pytest
+
+from qor import Qor, Request
+from qor.testing import FakeKoreRequest, call, make_app
+
+POOL = {"request_pool_size": 2}
+
+
+def test_request_slots():
+    request = Request(FakeKoreRequest("/"), Qor())
+    assert not hasattr(request, "__dict__")
+    assert request._g is None and request._response_headers is None
+    assert request.get_response_header("Content-Type") is None
+    request.g["user"] = 1
+    assert request.g == {"user": 1}
+    assert request.path == "/"
+    assert request._cached == {"path": "/"}
+    request.path = "/other"
+    assert request.path == "/other"
+    with pytest.raises(AttributeError):
+        request.unknown = 1
+
+
+def test_requests_reused():
+    app, domain = make_app(POOL)
+    seen = []
+
+    @app.route("/")
+    def index(request, **kwargs):
+        assert request.g == {}
+        assert request.path == "/"
+        request.g["seen"] = True
+        seen.append(id(request))
+        return "ok"
+
+    app.start()
+    first = call(domain)
+    assert first._request is None
+    assert len(app._request_pool) == 1
+    pooled = app._request_pool[0]
+    assert pooled.request is None and pooled._g is None
+    assert pooled._cached is None and pooled.return_value is None
+
+    second = call(domain)
+    assert second.response_body == b"ok"
+    assert seen[0] == seen[1]
+
+
+def test_retained_request_not_reused():
+    app, domain = make_app(POOL)
+    kept = []
+
+    @app.route("/")
+    def index(request, **kwargs):
+        request.retain()
+        kept.append(request)
+        return "ok"
+
+    app.start()
+    call(domain)
+    assert app._request_pool == []
+    assert kept[0].request is not None
+
+
+def test_escaped_request_not_reused():
+    app, domain = make_app(POOL)
+
+    @app.route("/")
+    def index(request, **kwargs):
+        def records():
+            yield {"path": request.path}
+
+        return records()
+
+    app.start()
+    kore_request = call(domain)
+    assert kore_request.response_body == b'[{"path":"/"}]'
+    assert app._request_pool == []
+
+
+def test_failed_requests_reused():
+    app, domain = make_app(POOL)
+
+    @app.error_handler(ValueError)
+    def on_error(request, **kwargs):
+        return 400, "bad"
+
+    @app.route("/")
+    def index(request, **kwargs):
+        raise ValueError()
+
+    @app.route("/raise")
+    def fail(request, **kwargs):
+        raise KeyError()
+
+    app.start()
+    assert call(domain).response_body == b"bad"
+    assert len(app._request_pool) == 1
+    with pytest.raises(KeyError):
+        domain.routes[1]["callback"](FakeKoreRequest("/raise"))
+    # the pooled request is reused & released again
+    assert len(app._request_pool) == 1
+    assert app._request_pool[0].request is None
+
+
+def test_pool_disabled():
+    app, domain = make_app({"request_pool_size": 0})
+
+    @app.route("/")
+    def index(request, **kwargs):
+        return "ok"
+
+    app.start()
+    kore_request = call(domain)
+    assert isinstance(kore_request._request, Request)
+    assert app._request_pool == []
+
+
+def test_request_with_dict_not_pooled():
+    class DictRequest(Request):
+        pass
+
+    app, domain = make_app(POOL, request_class=DictRequest)
+
+    @app.route("/")
+    def index(request, **kwargs):
+        return "ok"
+
+    app.start()
+    call(domain)
+    assert app._request_pool_size == 0
+    assert app._request_pool == []
@@ -0,0 +1,233 @@
+import time
+
+import pytest
+
+from qor import CachePolicy
+from qor.cache import ResponseCache
+from qor.testing import call, make_app
+
+
+def test_policy_from_value():
+    assert CachePolicy.from_value(None) is None
+    assert CachePolicy.from_value(30).ttl == 30
+    policy = CachePolicy.from_value({"ttl": 5, "vary": ["Accept"]})
+    assert policy.ttl == 5 and policy.vary == ("Accept",)
+    assert CachePolicy.from_value(policy) is policy
+
+
+def test_cached_response():
+    app, domain = make_app()
+    calls = []
+
+    @app.get("/", name="index", cache=60)
+    def index(request, **kwargs):
+        calls.append(1)
+        request.response_header("X-Count", str(len(calls)))
+        return {"count": len(calls)}
+
+    app.start()
+    first = call(domain)
+    second = call(domain)
+    assert len(calls) == 1
+    assert second.status == first.status == 200
+    assert second.response_body == first.response_body
+    assert second.response_headers == first.response_headers
+    assert second.response_headers["X-Count"] == "1"
+    stats = app.response_cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["routes"]["index"] == {"hits": 1, "misses": 1}
+
+
+def test_key_query_args_and_vary():
+    app, domain = make_app()
+    calls = []
+
+    @app.get("/", cache={"query_args": ["page"], "vary": ["Accept-Language"]})
+    def index(request, **kwargs):
+        calls.append(1)
+        return f"{request.argument('page')}:{len(calls)}"
+
+    app.start()
+    assert call(domain, arguments={"page": "1"}).response_body == b"1:1"
+    assert call(domain, arguments={"page": "2"}).response_body == b"2:2"
+    assert call(domain, arguments={"page": "1"}).response_body == b"1:1"
+    other = call(
+        domain, arguments={"page": "1"}, headers={"Accept-Language": "fr"}
+    )
+    assert other.response_body == b"1:3"
+
+
+def test_uncached_methods_and_statuses():
+    app, domain = make_app()
+    calls = []
+
+    @app.route("/", methods=["get", "post"], cache=60)
+    def index(request, **kwargs):
+        calls.append(1)
+        if request.method == "get" and len(calls) == 1:
+            return 404, "missing"
+        return "ok"
+
+    app.start()
+    assert call(domain).status == 404
+    call(domain, method="post")
+    call(domain, method="post")
+    assert call(domain).response_body == b"ok"
+    assert call(domain).response_body == b"ok"
+    assert len(calls) == 4
+
+
+def test_set_cookie_not_cached():
+    app, domain = make_app()
+    calls = []
+
+    @app.get("/", cache=60)
+    def index(request, **kwargs):
+        calls.append(1)
+        request.set_cookie("session", "1")
+        return "ok"
+
+    app.start()
+    call(domain)
+    call(domain)
+    assert len(calls) == 2
+
+
+def test_private_and_no_store_not_cached():
+    app, domain = make_app()
+    calls = []
+
+    @app.get("/", cache=60)
+    def index(request, **kwargs):
+        calls.append(1)
+        request.response_header("Cache-Control", "max-age=0, Private")
+        return "ok"
+
+    @app.get("/no-store", cache=60)
+    def no_store(request, **kwargs):
+        calls.append(1)
+        request.response_header("Cache-Control", "no-store")
+        return "ok"
+
+    app.start()
+    for index in (0, 0, 1, 1):
+        call(domain, index=index)
+    assert len(calls) == 4
+
+
+def test_key_has_host():
+    app, domain = make_app()
+
+    @app.get("/", cache=60)
+    def index(request, **kwargs):
+        return request.host
+
+    app.start()
+    assert call(domain, host="a.example").response_body == b"a.example"
+    assert call(domain, host="b.example").response_body == b"b.example"
+
+
+def test_auth_routes_vary_by_auth_header():
+    app, domain = make_app()
+
+    @app.header_auth("token", "x-token")
+    def verify(request, token):
+        return True
+
+    @app.get("/private", auth_name="token", cache=60)
+    def private(request, **kwargs):
+        return "private"
+
+    with pytest.raises(Exception, match="x-token"):
+        app.start()
+
+    app, domain = make_app()
+    app.header_auth("token", "x-token")(verify)
+
+    @app.get("/private", auth_name="token", cache={"vary": ["X-Token"]})
+    def private_varied(request, **kwargs):
+        return request.request_header("x-token")
+
+    app.start()
+    first = call(domain, "/private", headers={"x-token": "a"})
+    second = call(domain, "/private", headers={"x-token": "b"})
+    assert (first.response_body, second.response_body) == (b"a", b"b")
+
+
+def test_before_handler_and_early():
+    app, domain = make_app()
+    before = []
+
+    @app.before_handler
+    def count(request, *args, **kwargs):
+        before.append(request.path)
+
+    @app.get("/late", cache=60)
+    def late(request, **kwargs):
+        return "late"
+
+    @app.get("/early", cache={"ttl": 60, "early": True})
+    def early(request, **kwargs):
+        return "early"
+
+    app.start()
+    call(domain, "/late", index=0)
+    call(domain, "/late", index=0)
+    assert before == ["/late", "/late"]
+    call(domain, "/early", index=1)
+    assert call(domain, "/early", index=1).response_body == b"early"
+    assert before.count("/early") == 1
+
+
+def test_invalidate_by_name_and_tag():
+    app, domain = make_app()
+    calls = []
+
+    @app.get("/posts", name="posts", cache={"tags": ["posts"]})
+    def posts(request, **kwargs):
+        calls.append(1)
+        return str(len(calls))
+
+    app.start()
+    call(domain, "/posts")
+    assert app.invalidate_cache(name="posts") == 1
+    assert call(domain, "/posts").response_body == b"2"
+    assert app.invalidate_cache(tag="posts") == 1
+    assert call(domain, "/posts").response_body == b"3"
+    assert app.invalidate_cache(tag="other") == 0
+    assert call(domain, "/posts").response_body == b"3"
+
+
+class _Sent:
+    def __init__(self, body, status=200):
+        self.response_status = status
+        self.response_data = body
+        self._response_headers = None
+
+
+def test_ttl_and_lru_eviction():
+    cache = ResponseCache(max_bytes=10)
+    policy = CachePolicy(ttl=60)
+    cache.store(("a",), policy, _Sent(b"aaaa"))
+    cache.store(("b",), policy, _Sent(b"bbbb"))
+    assert cache.get(("a",)) is not None
+    cache.store(("c",), policy, _Sent(bytearray(b"cccc")))
+    # `b` is the least recently used
+    assert cache.get(("b",)) is None
+    assert cache.get(("c",))[2] == b"cccc"
+    assert cache.size == 8 and cache.evictions == 1
+    cache.store(("big",), policy, _Sent(b"x" * 11))
+    assert len(cache) == 2
+
+    cache.store(("old",), CachePolicy(ttl=-1), _Sent(b""))
+    assert cache.get(("old",)) is None
+    assert ("old",) not in cache._entries
+
+
+def test_entry_expires(monkeypatch):
+    cache = ResponseCache()
+    cache.store(("a",), CachePolicy(ttl=1), _Sent(b"a"))
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 2)
+    assert cache.get(("a",)) is None
+    assert cache.size == 0
@@ -0,0 +1,96 @@
+import json
+from collections import OrderedDict
+from decimal import Decimal
+
+import pytest
+
+from qor import Qor, Response
+from qor.testing import FakeKoreRequest, attach_fake_domain
+from qor.utils import ReturnValueParser, parse_return_value, to_bytes
+
+
+def test_bytes_like_not_copied():
+    parser = ReturnValueParser(None)
+    for value in (b"data", bytearray(b"data"), memoryview(b"data")):
+        status, data, original = parser(value)
+        assert status == 200
+        assert data is value
+        assert original is type(value)
+
+
+def test_builtin_encoders():
+    parser = ReturnValueParser(None)
+    assert parser("hello") == (200, b"hello", str)
+    assert parser((404, 5)) == (404, b"5", int)
+    assert parser(("201", 2.5)) == (201, b"2.5", float)
+    status, data, original = parser([1, "a"])
+    assert (status, json.loads(data), original) == (200, [1, "a"], list)
+    status, data, original = parser((1, 2, 3))
+    assert (status, json.loads(data), original) == (200, [1, 2, 3], tuple)
+    # unknown types are returned as they are
+    assert parser(None) == (200, None, type(None))
+
+
+def test_subclasses_use_base_encoders():
+    parser = ReturnValueParser(None)
+    assert parser(True) == (200, b"True", bool)
+    assert json.loads(parser(OrderedDict(a=1))[1]) == {"a": 1}
+    assert parser.content_type(OrderedDict) == "application/json"
+    assert parser.content_type(str) == "text/html"
+
+
+def test_register_encoder():
+    parser = ReturnValueParser(None)
+    assert parser.content_type(Decimal) == "text/html"
+    parser.register_encoder(
+        Decimal, lambda value: str(value).encode(), "text/plain"
+    )
+    assert parser(Decimal("1.5")) == (200, b"1.5", Decimal)
+    assert parser.content_type(Decimal) == "text/plain"
+    # the class table is not changed
+    assert Decimal not in ReturnValueParser.encoders
+
+
+def test_parse_error():
+    with pytest.raises(Exception, match="can't parse value"):
+        parse_return_value(("not a status", "value"))
+
+
+def test_to_bytes():
+    assert to_bytes("a") == b"a"
+    assert json.loads(to_bytes({"a": 1})) == {"a": 1}
+    value = bytearray(b"a")
+    assert to_bytes(value) is value
+
+
+def test_response_object():
+    app = Qor()
+    domain = attach_fake_domain(app)
+    body = memoryview(b"User-agent: *")
+
+    @app.route("/robots.txt")
+    def robots(request, **kwargs):
+        return Response(
+            body,
+            headers={"Cache-Control": "max-age=60"},
+            content_type="text/plain",
+        )
+
+    @app.route("/gone")
+    def gone(request, **kwargs):
+        return 410, Response(b"gone", headers={"X-Reason": "removed"})
+
+    app.start()
+    request = FakeKoreRequest("/robots.txt")
+    domain.routes[0]["callback"](request)
+    assert request.status == 200
+    assert request.response_body is body
+    assert request.response_headers["Cache-Control"] == "max-age=60"
+    assert request.response_headers["Content-Type"] == "text/plain"
+
+    request = FakeKoreRequest("/gone")
+    domain.routes[1]["callback"](request)
+    assert request.status == 410
+    assert request.response_body == b"gone"
+    assert request.response_headers["X-Reason"] == "removed"
+    assert request.response_headers["Content-Type"] == "text/html"
@@ -0,0 +1,183 @@
+import json
+import multiprocessing
+import os
+import types
+
+from qor import Qor
+from qor.app import route_profile_key
+from qor.router import (
+    Router,
+    order_routes_by_hits,
+    overlap_groups,
+    routes_may_overlap,
+)
+from qor.testing import FakeKoreRequest, attach_fake_domain
+
+
+def handle(request, *args, **kwargs):
+    return "ok"
+
+
+def build(*paths):
+    router = Router()
+    for path in paths:
+        router.add_route(path, handle, path)
+    router.build_routes()
+    return router.routes
+
+
+def by_path(route):
+    return route.raw_path
+
+
+def test_routes_may_overlap():
+    posts, post, new, user = build(
+        "/posts", "/posts/<id:int>", "/posts/new", "/users/<name>"
+    )
+    assert not routes_may_overlap(posts, post)
+    assert not routes_may_overlap(post, new)
+    assert not routes_may_overlap(post, user)
+
+    name, regex = build("/posts/<name>", "/files/<path:re:.*>")
+    assert routes_may_overlap(new, name)
+    assert routes_may_overlap(post, name)
+    assert routes_may_overlap(regex, posts)
+
+
+def test_order_routes_by_hits():
+    routes = build("/admin", "/posts/<name>", "/posts/new", "/api")
+    hits = {"/api": 100, "/posts/new": 50, "/admin": 1}
+
+    ordered = order_routes_by_hits(routes, hits, by_path)
+    paths = [route.raw_path for route in ordered]
+    assert paths[0] == "/api"
+    # `/posts/new` is hotter, but it overlaps `/posts/<name>`
+    assert paths[1:3] == ["/posts/<name>", "/posts/new"]
+    assert paths[-1] == "/admin"
+
+
+def test_overlap_groups():
+    routes = build(
+        "/posts/<name>",
+        "/posts/new",
+        "/users/new",
+        "/posts",
+        "/files/<p:re:.*>",
+    )
+    name, new, user, posts, files = overlap_groups(routes)
+    assert name == new
+    assert len({name, user, posts}) == 3
+    assert files == -1
+
+
+def test_overlap_groups_domains():
+    router = Router()
+    router.add_route("/<name>", handle, "a", domain="a.example")
+    router.add_route("/new", handle, "b", domain="b.example")
+    router.build_routes()
+    first, second = overlap_groups(router.routes)
+    assert first != second
+    # the routes without a domain may overlap any domain
+    router.add_route("/new", handle, "c")
+    router.build_routes()
+    assert len(set(overlap_groups(router.routes))) == 1
+
+
+def test_order_routes_spanning():
+    routes = build("/cold", "/files/<p:re:.*>", "/hot", "/warm")
+    hits = {"/hot": 10, "/warm": 5, "/cold": 20}
+    ordered = order_routes_by_hits(routes, hits, by_path)
+    # the hot routes don't pass the route that may match any path
+    assert [route.raw_path for route in ordered] == [
+        "/cold",
+        "/files/<p:re:.*>",
+        "/hot",
+        "/warm",
+    ]
+
+
+def test_order_routes_no_hits():
+    routes = build("/a", "/b", "/c/<id:int>")
+    assert order_routes_by_hits(routes, {}, by_path) == routes
+
+
+def test_profile_mode(tmp_path):
+    hits_path = str(tmp_path / "hits.json")
+    config = {"route_profile": True, "route_profile_path": hits_path}
+
+    app = Qor(config=config)
+    domain = attach_fake_domain(app)
+    app.add_route("/cold", handle, "cold")
+    app.add_route("/hot", handle, "hot")
+    app.start()
+    assert [route["url"] for route in domain.routes] == ["/cold", "/hot"]
+
+    hot = domain.routes[1]["callback"]
+    for _ in range(3):
+        hot(FakeKoreRequest("/hot"))
+    app.dump_route_hits()
+
+    with open(hits_path) as f:
+        hits = json.load(f)
+    hot_key = route_profile_key(app.router.find_route_by_name("hot"))
+    assert hits == {hot_key: 3}
+
+    app = Qor(config=config)
+    domain = attach_fake_domain(app)
+    app.add_route("/cold", handle, "cold")
+    app.add_route("/hot", handle, "hot")
+    app.start()
+    assert [route["url"] for route in domain.routes] == ["/hot", "/cold"]
+
+
+def test_profile_flush_timer(tmp_path):
+    hits_path = str(tmp_path / "hits.json")
+    config = {
+        "route_profile": True,
+        "route_profile_path": hits_path,
+        "route_profile_flush": 1000,
+    }
+    app = Qor(config=config)
+    domain = attach_fake_domain(app)
+    app.add_route("/hot", handle, "hot")
+    app.start()
+    timers = []
+    app.kore = types.SimpleNamespace(timer=lambda *args: timers.append(args))
+    app.workerstart()
+    ((callback, after, flags),) = timers
+    assert (after, flags) == (1000, 0)
+
+    # the requests only count the hits
+    for _ in range(3):
+        domain.routes[0]["callback"](FakeKoreRequest("/hot"))
+    assert not os.path.exists(hits_path)
+    callback(None)
+    with open(hits_path) as f:
+        assert json.load(f) == {
+            route_profile_key(app.router.find_route_by_name("hot")): 3
+        }
+
+
+def dump_hits(config, hits):
+    app = Qor(config=config)
+    domain = attach_fake_domain(app)
+    app.add_route("/hot", handle, "hot")
+    app.start()
+    for _ in range(hits):
+        domain.routes[0]["callback"](FakeKoreRequest("/hot"))
+        app.dump_route_hits()
+
+
+def test_workers_dump_hits(tmp_path):
+    hits_path = str(tmp_path / "hits.json")
+    config = {"route_profile": True, "route_profile_path": hits_path}
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=dump_hits, args=(config, 50)) for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    with open(hits_path) as f:
+        assert sum(json.load(f).values()) == 200
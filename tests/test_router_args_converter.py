@@ -0,0 +1,51 @@
+from qor import Qor
+from qor.router import Router, compile_args_converter
+from qor.testing import FakeKoreRequest, attach_fake_domain
+
+
+def parts_of(path):
+    router = Router()
+    router.add_route(path, None)
+    router.build_routes()
+    return router.routes[0].parts
+
+
+def test_no_variables():
+    assert compile_args_converter(parts_of("/about")) is None
+
+
+def test_string_variables():
+    assert compile_args_converter(parts_of("/user/<name>/<code:re:.*>")) is None
+
+
+def test_builtin_converters():
+    converter = compile_args_converter(parts_of("/a/<x:int>/<name>/<y:float>"))
+    assert converter(("1", "ahmad", "2.5")) == (1, "ahmad", 2.5)
+    # unexpected args count, returned as they are
+    assert converter(("1",)) == ("1",)
+
+
+def test_custom_converter():
+    router = Router(path_conveters={"upper": ("[a-z]+", str.upper)})
+    router.add_route("/code/<code:upper>", None)
+    router.build_routes()
+    converter = compile_args_converter(router.routes[0].parts)
+    assert converter(("abc",)) == ("ABC",)
+
+
+def test_wrapper_converts_args():
+    app = Qor()
+    domain = attach_fake_domain(app)
+    received = []
+
+    @app.route("/add/<first:int>/<second:int>")
+    def add(request, first, second, **kwargs):
+        received.append((first, second))
+        return first + second
+
+    app.start()
+    request = FakeKoreRequest("/add/1/2")
+    domain.routes[0]["callback"](request, "1", "2")
+    assert received == [(1, 2)]
+    assert request.status == 200
+    assert request.response_body == b"3"
@@ -1,6 +1,12 @@
 import pytest
 
-from qor.router import Route, Router, build_path, path_converters
+from qor.router import (
+    Route,
+    Router,
+    build_path,
+    compile_path_builder,
+    path_converters,
+)
 
 
 def test_valid_empty():
@@ -181,3 +187,69 @@ def test_router_build():
 
     with pytest.raises(Exception) as e:
         router.reverse("user_delete")
+
+
+def test_compile_path_builder():
+    builder = compile_path_builder(
+        [
+            {"isreg": False, "value": ""},
+            {"isreg": False, "value": "user"},
+            {"isreg": True, "name": "id", "re": path_converters["int"][0]},
+        ]
+    )
+    assert builder(id=5) == "/user/5"
+    assert builder(id="7") == "/user/7"
+    with pytest.raises(Exception) as e:
+        builder(id="p")
+    with pytest.raises(Exception) as e:
+        builder()
+
+
+def test_compile_path_builder_static():
+    builder = compile_path_builder(
+        [
+            {"isreg": False, "value": ""},
+            {"isreg": False, "value": "{user}"},
+        ]
+    )
+    assert builder() == "/{user}"
+    assert builder(id=5) == "/{user}"
+
+
+def test_router_reverse_static():
+    router = Router()
+    router.add_route("/about", None, "about")
+    router.build_routes()
+    assert router.reverse("about") == "/about"
+
+
+def test_router_reverse_cache():
+    router = Router(reverse_cache_size=8)
+    router.add_route("user/<id:int>", None, "user_page")
+    router.build_routes()
+
+    assert router.reverse("user_page", id=5) == "/user/5"
+    assert router.reverse("user_page", id=5) == "/user/5"
+    with pytest.raises(Exception) as e:
+        router.reverse("user_page", id="p")
+    # unhashable kwargs skip the cache
+    with pytest.raises(Exception) as e:
+        router.reverse("user_page", id=[5])
+
+    # the equal values of other types aren't answered from the cache
+    for value in (True, 5.0):
+        with pytest.raises(Exception):
+            router.reverse("user_page", id=value)
+
+    router.add_route("post/<id:int>", None, "post")
+    router.build_routes()
+    assert router.reverse("post", id=1) == "/post/1"
+
+
+def test_router_reverse_cache_kwargs_order():
+    router = Router(reverse_cache_size=8)
+    router.add_route("posts/<year:int>/<slug>", None, "post")
+    router.build_routes()
+    assert router.reverse("post", year=2024, slug="a") == "/posts/2024/a"
+    assert router.reverse("post", slug="a", year=2024) == "/posts/2024/a"
+    assert router._cached_reverse.cache_info().currsize == 1
@@ -0,0 +1,78 @@
+import pytest
+
+from qor.router import Router
+
+
+def index(req):
+    pass
+
+
+def other(req):
+    pass
+
+
+def test_find_route():
+    r = Router()
+    r.add_route("/", index, "index", methods=["get", "post"])
+    r.add_route("/user/<id:int>", index, "user")
+    r.build_routes()
+
+    route = r.find_route(None, "/", "post")
+    assert route.name == "index"
+    assert route.method == "post"
+
+    user = r.find_route_by_name("user")
+    assert r.find_route(None, user.path, "get") is user
+    assert r.find_route(None, "/", "delete") is None
+    assert r.find_route_by_name("missing") is None
+
+
+def test_find_raw_route():
+    r = Router()
+    r.add_route("/", index, "index", methods=["get", "post"])
+    assert r.find_raw_route(None, "/", "post")["handler"] == index
+    assert r.find_raw_route(None, "/", "put") is None
+
+
+def test_add_route_duplicate_method():
+    r = Router()
+    r.add_route("/", index, "index", methods=["get"])
+    with pytest.raises(Exception):
+        r.add_route("/", other, "other", methods=["post", "get"])
+
+
+def test_build_routes_duplicate_nested():
+    child = Router(name="child")
+    child.add_route("/", index, "index")
+    main = Router()
+    main.add_route("/child/", other, "other")
+    main.mount_router("/child", child)
+    with pytest.raises(Exception):
+        main.build_routes()
+
+
+def test_override_first_name_wins():
+    r = Router(allow_override=True)
+    r.add_route("/", index, "index")
+    r.add_route("/", other, "index")
+    r.build_routes()
+    assert len(r.routes) == 2
+    assert r.find_route_by_name("index").handler == index
+    assert r.find_route(None, "/", "get").handler == index
+
+
+def test_build_routes_twice_nested():
+    second = Router(name="second")
+    second.add_route("/second_index", index, "second_index")
+    first = Router(name="first")
+    first.mount_router("second", second)
+    main = Router()
+    main.mount_router("first", first)
+
+    main.build_routes()
+    main.build_routes()
+
+    route = main.find_route_by_name("first:second:second_index")
+    assert route
+    assert route.raw_path == "/first/second/second_index"
+    assert len(main.routes) == 1
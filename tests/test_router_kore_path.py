@@ -0,0 +1,63 @@
+import re
+
+from qor.router import Router, is_static_path, kore_path_string
+
+
+def handle(req):
+    pass
+
+
+def test_static_path_is_plain():
+    router = Router()
+    router.add_route("/posts", handle, "posts")
+    router.add_route("/", handle, "index")
+    router.add_route("/static/style.css", handle, "style")
+    router.build_routes()
+
+    posts = router.find_route_by_name("posts")
+    assert posts.is_static
+    assert posts.path == "/posts"
+
+    index = router.find_route_by_name("index")
+    assert index.is_static
+    assert index.path == "/"
+
+    style = router.find_route_by_name("style")
+    assert style.path == "/static/style.css"
+
+
+def test_dynamic_path_is_regex():
+    router = Router()
+    router.add_route("/posts/<id:int>", handle, "post")
+    router.build_routes()
+
+    post = router.find_route_by_name("post")
+    assert not post.is_static
+    assert post.path.startswith("^")
+    assert post.path.endswith("$")
+    assert re.compile(post.path).match("/posts/5")
+    assert not re.compile(post.path).match("/posts/five")
+
+
+def test_nested_static_path():
+    child = Router(name="child")
+    child.add_route("/about", handle, "about")
+    main = Router()
+    main.mount_router("/child", child)
+    main.build_routes()
+
+    about = main.find_route_by_name("child:about")
+    assert about.path == "/child/about"
+
+
+def test_kore_path_string():
+    parts = [
+        {"isreg": False, "value": ""},
+        {"isreg": False, "value": "user"},
+    ]
+    assert is_static_path(parts)
+    assert kore_path_string(parts) == "/user"
+
+    parts.append({"isreg": True, "name": "id", "re": "[0-9]+"})
+    assert not is_static_path(parts)
+    assert kore_path_string(parts) == "^\\/user\\/([0-9]+)$"
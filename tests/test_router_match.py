@@ -0,0 +1,115 @@
+from qor.router import Router
+
+
+def handle(req):
+    pass
+
+
+def test_match_static():
+    router = Router()
+    router.add_route("/", handle, "index")
+    router.add_route("/about", handle, "about")
+    router.add_route("/about/", handle, "about_slash")
+    router.build_routes()
+
+    route, kwargs = router.match(None, "/")
+    assert route.name == "index"
+    assert kwargs == {}
+
+    assert router.match(None, "/about")[0].name == "about"
+    assert router.match(None, "/about/")[0].name == "about_slash"
+    assert router.match(None, "/contact") is None
+
+
+def test_match_converters():
+    router = Router()
+    router.add_route("/user/<id:int>", handle, "user_id")
+    router.add_route("/user/<age:float>", handle, "user_age")
+    router.add_route("/user/<name>", handle, "user_name")
+    router.add_route("/code/<code:re:[a-z]{3}>", handle, "code")
+    router.build_routes()
+
+    route, kwargs = router.match(None, "/user/5")
+    assert route.name == "user_id"
+    assert kwargs == {"id": 5}
+
+    route, kwargs = router.match(None, "/user/10.5")
+    assert route.name == "user_age"
+    assert kwargs == {"age": 10.5}
+
+    route, kwargs = router.match(None, "/user/ahmad")
+    assert route.name == "user_name"
+    assert kwargs == {"name": "ahmad"}
+
+    route, kwargs = router.match(None, "/code/abc")
+    assert route.name == "code"
+    assert kwargs == {"code": "abc"}
+    assert router.match(None, "/code/abcd") is None
+
+
+def test_match_static_before_variable():
+    router = Router()
+    router.add_route("/posts/<name>", handle, "post")
+    router.add_route("/posts/new", handle, "new_post")
+    router.build_routes()
+
+    assert router.match(None, "/posts/new")[0].name == "new_post"
+    assert router.match(None, "/posts/old")[0].name == "post"
+
+
+def test_match_backtracking():
+    router = Router()
+    router.add_route("/posts/new/edit", handle, "edit_new")
+    router.add_route("/posts/<name>/delete", handle, "delete")
+    router.build_routes()
+
+    route, kwargs = router.match(None, "/posts/new/delete")
+    assert route.name == "delete"
+    assert kwargs == {"name": "new"}
+
+
+def test_match_method():
+    router = Router()
+    router.add_route("/items", handle, "items", methods=["get"])
+    router.add_route("/items", handle, "create_item", methods=["post"])
+    router.build_routes()
+
+    assert router.match(None, "/items", "GET")[0].name == "items"
+    assert router.match(None, "/items", "post")[0].name == "create_item"
+    assert router.match(None, "/items", "delete") is None
+
+
+def test_match_domain():
+    router = Router()
+    router.add_route("/", handle, "api_index", domain="api.example.com")
+    router.add_route("/", handle, "index")
+    router.add_route("/docs", handle, "docs")
+    router.build_routes()
+
+    assert router.match("api.example.com", "/")[0].name == "api_index"
+    assert router.match("api.example.com", "/docs")[0].name == "docs"
+    assert router.match("example.com", "/")[0].name == "index"
+    assert router.match(None, "/")[0].name == "index"
+
+
+def test_match_nested():
+    child = Router(name="child")
+    child.add_route("/item/<id:int>", handle, "item")
+    main = Router()
+    main.mount_router("/child", child)
+    main.build_routes()
+
+    route, kwargs = main.match(None, "/child/item/3")
+    assert route.name == "child:item"
+    assert kwargs == {"id": 3}
+
+
+def test_match_rebuild():
+    router = Router()
+    router.add_route("/a", handle, "a")
+    router.build_routes()
+    assert router.match(None, "/b") is None
+
+    router.add_route("/b", handle, "b")
+    router.build_routes()
+    assert router.match(None, "/b")[0].name == "b"
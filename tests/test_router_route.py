@@ -1,4 +1,9 @@
+import gc
+
+import pytest
+
 from qor import Route
+from qor.router import Router, RoutePart
 
 
 def verify(req):
@@ -80,10 +85,12 @@ def test_route_get_auth():
     _type = "header"
     _value = "x-header"
 
-    r["auth_type"] = _type
-    r["auth_value"] = _value
-    r["auth_verify"] = verify
-    r["auth_redirect"] = "/"
+    r = r.replace(
+        auth_type=_type,
+        auth_value=_value,
+        auth_verify=verify,
+        auth_redirect="/",
+    )
 
     assert r.has_auth
     assert r.auth["type"] == _type
@@ -97,12 +104,53 @@ def test_route_get_auth_no_redirect():
     _type = "header"
     _value = "x-header"
 
-    r["auth_type"] = _type
-    r["auth_value"] = _value
-    r["auth_verify"] = verify
+    r = r.replace(auth_type=_type, auth_value=_value, auth_verify=verify)
 
     assert r.has_auth
     assert r.auth["type"] == _type
     assert r.auth["value"] == _value
     assert r.auth["verify"] == verify
     assert not "redirect" in r.auth
+
+
+def test_route_immutable():
+    r = Route(name="index")
+    with pytest.raises(AttributeError):
+        r.name = "other"
+    with pytest.raises(TypeError):
+        r["name"] = "other"
+    assert r.replace(name="other").name == "other"
+    assert r.name == "index"
+
+
+def test_route_dict_view():
+    r = Route(name="index", method="get", parts=[{"isreg": False, "value": ""}])
+    assert r["name"] == r.get("name") == "index"
+    assert r.get("missing", 1) == 1
+    assert "auth_type" in r
+    assert r["methods"] == r.methods == ["get"]
+    assert r["method_routes"] == r.method_routes == {"get": r}
+    assert r.replace(name="other").method_routes["get"].name == "other"
+    assert dict(r)["name"] == "index"
+    assert isinstance(r.parts[0], RoutePart)
+    assert r.parts[0]["value"] == r.parts[0].get("value") == ""
+
+
+def test_route_parts_interned():
+    router = Router()
+    router.add_route("/users/<id:int>", None, "first")
+    router.add_route("/users/<id:int>/info", None, "second")
+    router.build_routes()
+    first, second = router.routes
+    assert all(a is b for a, b in zip(first.parts, second.parts))
+
+
+def test_route_parts_released():
+    router = Router()
+    router.add_route("/released/<released_id:int>", None, "released")
+    router.build_routes()
+    key = (None, "released", False, None, None)
+    assert key in RoutePart._interned
+    del router
+    gc.collect()
+    assert key not in RoutePart._interned
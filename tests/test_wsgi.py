@@ -0,0 +1,155 @@
+import io
+import mmap
+
+import pytest
+
+from qor.testing import FakeKoreRequest
+from qor.wsgi import KoreWSGIInput, KoreWSGIRequestHandler, KoreWSGIServer
+
+
+def make_server(wsgi_app):
+    server = KoreWSGIServer(("", 0), KoreWSGIRequestHandler)
+    server.set_app(wsgi_app)
+    return server
+
+
+def test_bridge_passes_request_to_wsgi_app():
+    def wsgi_app(environ, start_response):
+        start_response("201 Created", [("Content-Type", "text/plain")])
+        return [
+            environ["REQUEST_METHOD"].encode(),
+            b" ",
+            environ["PATH_INFO"].encode(),
+            b" ",
+            environ["HTTP_X_VALUE"].encode(),
+        ]
+
+    kore_request = FakeKoreRequest(
+        "/items", method="post", headers={"X-Value": "1"}
+    )
+    server = make_server(wsgi_app)
+    server.set_kore_request(kore_request)
+    server.handle_request()
+    assert kore_request.status == 201
+    assert kore_request.response_headers["Content-Type"] == "text/plain"
+    assert kore_request.response_body == b"POST /items 1"
+
+
+BODY = b"".join(b"line %d %s\n" % (i, b"x" * (i % 700)) for i in range(200))
+
+
+def test_input_readline_across_chunks():
+    stream = KoreWSGIInput(FakeKoreRequest("/", body=BODY))
+    lines = stream.readlines()
+    assert lines == BODY.splitlines(keepends=True)
+    assert stream.readline() == b""
+    assert stream.tell() == len(BODY)
+
+
+def test_input_readline_limit_and_peek():
+    stream = KoreWSGIInput(FakeKoreRequest("/", body=b"abcdef\nghi"))
+    assert stream.peek()[:3] == b"abc"
+    assert stream.readline(4) == b"abcd"
+    assert stream.readline() == b"ef\n"
+    assert list(stream) == [b"ghi"]
+
+
+def test_input_read_and_readinto():
+    stream = KoreWSGIInput(FakeKoreRequest("/", body=BODY))
+    assert stream.read(10) == BODY[:10]
+    buffer = bytearray(3000)
+    assert stream.readinto(buffer) == 3000
+    assert buffer == BODY[10:3010]
+    assert stream.read(-1) == BODY[3010:]
+    assert stream.read(10) == b""
+
+
+def test_input_maps_offloaded_body(tmp_path):
+    path = tmp_path / "body"
+    path.write_bytes(BODY)
+    kore_request = FakeKoreRequest("/", body_path=str(path))
+
+    def no_body_read(length):
+        raise AssertionError("the offloaded body is read by body_read")
+
+    kore_request.body_read = no_body_read
+    stream = KoreWSGIInput(kore_request)
+    first = stream.readline()
+    assert first == BODY.splitlines(keepends=True)[0]
+    assert stream.read() == BODY[len(first) :]
+    stream.close()
+    assert stream.closed
+    with pytest.raises(ValueError):
+        stream.read()
+
+
+def test_bridge_app_reads_lines():
+    def wsgi_app(environ, start_response):
+        lines = environ["wsgi.input"].readlines()
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return [b"%d" % len(lines)]
+
+    kore_request = FakeKoreRequest("/", method="post", body=BODY)
+    server = make_server(wsgi_app)
+    server.set_kore_request(kore_request)
+    server.handle_request()
+    assert kore_request.response_body == b"200"
+
+
+def respond(wsgi_app, spool_max_memory=None):
+    kore_request = FakeKoreRequest("/")
+    server = make_server(wsgi_app)
+    if spool_max_memory is not None:
+        server.spool_max_memory = spool_max_memory
+    server.set_kore_request(kore_request)
+    server.handle_request()
+    return kore_request
+
+
+def test_response_chunks_are_not_copied():
+    chunk = b"x" * 1000
+
+    def single(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return [chunk]
+
+    def many(environ, start_response):
+        write = start_response("200 OK", [("Content-Type", "text/plain")])
+        write(b"a")
+        return [b"", b"b", chunk]
+
+    assert respond(single).response_body is chunk
+    assert respond(many).response_body == b"ab" + chunk
+
+
+def test_large_response_is_spooled():
+    def wsgi_app(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return (b"%05d" % i for i in range(1000))
+
+    kore_request = respond(wsgi_app, spool_max_memory=1024)
+    assert isinstance(kore_request.response_body, mmap.mmap)
+    assert kore_request.response_body[:] == b"".join(
+        b"%05d" % i for i in range(1000)
+    )
+
+
+def test_file_wrapper_is_mapped(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_bytes(BODY)
+
+    def wsgi_app(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/csv")])
+        f = open(path, "rb")
+        f.seek(5)
+        return environ["wsgi.file_wrapper"](f)
+
+    def memory_file(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/csv")])
+        return environ["wsgi.file_wrapper"](io.BytesIO(BODY), 1024)
+
+    kore_request = respond(wsgi_app)
+    assert kore_request.response_headers["Content-Type"] == "text/csv"
+    assert bytes(kore_request.response_body) == BODY[5:]
+    assert not isinstance(kore_request.response_body, bytes)
+    assert respond(memory_file).response_body == BODY